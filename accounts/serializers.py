@@ -9,10 +9,11 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
+from monitoring.timing import TimedSerializerMixin
 
 User = get_user_model()
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour l'inscription d'un nouvel utilisateur.
     Valide les données, crée l'utilisateur, et retourne les données de
@@ -60,7 +61,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer simple pour afficher les informations publiques d'un utilisateur.
     Utilisé pour ne pas exposer d'informations sensibles comme le mot de passe.
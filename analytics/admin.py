@@ -0,0 +1,64 @@
+"""
+Fichier : admin.py (application 'analytics')
+Description : Tableau de bord des ventes dans l'admin : agrégats en lecture
+              seule, avec les totaux de la sélection (filtres, dates) au-dessus
+              de la liste. Seules les tables d'agrégats sont interrogées, sur
+              `ANALYTICS_DATABASE` (réplique en lecture si configurée), comme
+              l'API des ventes.
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.db.models import Sum
+
+from .models import RollupWatermark, SalesRollup
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    """Ventes par offre et par heure (UTC)."""
+    list_display = ("hour", "offre_id", "titre", "reservations", "places", "paid", "revenue")
+    list_filter = ("offre_id",)
+    date_hierarchy = "hour"
+    search_fields = ("=offre_id",)
+    ordering = ("-hour", "offre_id")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).using(settings.ANALYTICS_DATABASE)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, "context_data", {}).get("cl")
+        if changelist is not None:
+            response.context_data["sales_totals"] = changelist.queryset.aggregate(
+                reservations=Sum("reservations"), places=Sum("places"), paid=Sum("paid"), revenue=Sum("revenue"),
+            )
+            response.context_data["watermarks"] = RollupWatermark.objects.using(settings.ANALYTICS_DATABASE)
+        return response
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    """Avancement de l'intégration de chaque flux (`rollup_sales`)."""
+    list_display = ("name", "last_id", "updated_at")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).using(settings.ANALYTICS_DATABASE)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        # Lecture seule (éventuellement sur la réplique) : la remise à zéro passe par `rollup_sales --rebuild`.
+        return False
@@ -0,0 +1,12 @@
+"""
+Fichier : apps.py (application 'analytics')
+Description : Fichier de configuration pour l'application Django 'analytics'.
+              Elle tient les tables d'agrégats des ventes (par offre et par
+              heure) et les expose au staff (API et admin).
+"""
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
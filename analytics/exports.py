@@ -0,0 +1,162 @@
+"""
+Fichier : exports.py (application 'analytics')
+Description : Exports complets des réservations, des lignes de réservation et
+              des billets, en CSV ou JSON Lines, générés en flux.
+
+              Les lignes sont lues par lots de clés primaires (keyset :
+              `id > dernier id ORDER BY id LIMIT n`) : chaque lot est un
+              parcours d'index borné, la mémoire reste constante quel que soit
+              le volume et aucun curseur n'est tenu ouvert entre deux lots.
+              La compression gzip est faite à la volée, lot par lot.
+
+              En CSV, les textes qui commencent par `=`, `+`, `-`, `@`, une
+              tabulation ou un retour chariot sont préfixés d'une apostrophe :
+              un tableur les interpréterait sinon comme des formules (saisies
+              du client : nom, e-mail, téléphone…).
+
+              Utilisé par l'API (`/api/analytics/exports/…`) et par la commande
+              `export_orders`.
+"""
+import csv
+import json
+import zlib
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from orders.models import Reservation, ReservationItem, Ticket
+
+FORMATS = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+# Colonnes exportées (la clé des billets, secrète, n'est jamais exportée).
+DATASETS = {
+    "reservations": {
+        "model": Reservation,
+        "columns": ("id", "created_at", "user_id", "client_nom", "client_prenom", "client_email",
+                    "client_telephone", "total", "places", "paid"),
+        "date": "created_at",
+        "offer_link": "pk",
+    },
+    "items": {
+        "model": ReservationItem,
+        "columns": ("id", "reservation_id", "reservation__created_at", "offre_id", "titre", "prix", "qty"),
+        "date": "reservation__created_at",
+        "offer_link": None,
+    },
+    "tickets": {
+        "model": Ticket,
+        "columns": ("id", "created_at", "reservation_id", "user_id", "reservation__total", "reservation__places"),
+        "date": "created_at",
+        "offer_link": "reservation_id",
+    },
+}
+
+
+def parse_bound(raw: str):
+    """Date (AAAA-MM-JJ, minuit UTC) ou date-heure ISO ; ValueError si illisible."""
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValueError(raw)
+        value = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def export_queryset(dataset: str, date_from=None, date_to=None, offer: str | None = None):
+    """Queryset filtré (période [from, to[, offre) d'un jeu de données."""
+    spec = DATASETS[dataset]
+    qs = spec["model"].objects.all()
+    if dataset == "reservations":
+        qs = qs.annotate(paid=Exists(Ticket.objects.filter(reservation_id=OuterRef("pk"))))
+    if date_from:
+        qs = qs.filter(**{f"{spec['date']}__gte": date_from})
+    if date_to:
+        qs = qs.filter(**{f"{spec['date']}__lt": date_to})
+    if offer:
+        if spec["offer_link"] is None:
+            qs = qs.filter(offre_id=offer)
+        else:
+            qs = qs.filter(Exists(ReservationItem.objects.filter(
+                reservation_id=OuterRef(spec["offer_link"]), offre_id=offer,
+            )))
+    return qs
+
+
+def iter_batches(queryset, columns, batch_size: int):
+    """Lots de tuples, par clé primaire croissante (keyset)."""
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_id).order_by("pk").values_list(*columns)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+        if len(batch) < batch_size:
+            return
+
+
+class _Buffer:
+    """Tampon minimal pour csv.writer : les lignes d'un lot sont jointes puis encodées."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def take(self) -> str:
+        text, self.parts = "".join(self.parts), []
+        return text
+
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    """Neutralise une cellule texte qu'un tableur évaluerait comme une formule."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_export(dataset: str, fmt: str, queryset=None, compress: bool = False, batch_size: int | None = None):
+    """Contenu de l'export (octets), morceau par morceau : un morceau par lot."""
+    columns = DATASETS[dataset]["columns"]
+    queryset = export_queryset(dataset) if queryset is None else queryset
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31 : en-tête gzip
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return gzip.compress(data) + gzip.flush(zlib.Z_SYNC_FLUSH) if gzip else data
+
+    buffer = _Buffer()
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield emit(buffer.take())
+    for batch in iter_batches(queryset, columns, batch_size):
+        if fmt == "csv":
+            writer.writerows([_csv_cell(v) for v in row] for row in batch)
+        else:
+            for row in batch:
+                buffer.write(json.dumps(dict(zip(columns, row)), default=_json_value, ensure_ascii=False) + "\n")
+        yield emit(buffer.take())
+    if gzip:
+        yield gzip.flush()
+
+
+def export_filename(dataset: str, fmt: str, compress: bool) -> str:
+    return f"{dataset}.{fmt}" + (".gz" if compress else "")
@@ -0,0 +1,59 @@
+"""
+Fichier : export_orders.py (application 'analytics')
+Description : Export complet des réservations, des lignes de réservation ou
+              des billets en CSV ou JSON Lines, écrit en flux (mémoire
+              constante) vers un fichier ou la sortie standard.
+
+Exemple :
+    python manage.py export_orders reservations --format csv \\
+        --from 2024-07-01 --to 2024-08-12 --gzip --output reservations.csv.gz
+    python manage.py export_orders items --format jsonl --offer 3 > items.jsonl
+"""
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.exports import DATASETS, FORMATS, export_queryset, iter_export, parse_bound
+
+
+class Command(BaseCommand):
+    help = "Exporte réservations, lignes ou billets en CSV / JSON Lines, en flux (keyset, gzip facultatif)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(DATASETS))
+        parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="csv")
+        parser.add_argument("--from", dest="date_from", default="", help="Début (date ou date-heure ISO, inclus).")
+        parser.add_argument("--to", dest="date_to", default="", help="Fin (date ou date-heure ISO, exclue).")
+        parser.add_argument("--offer", default="", help="Identifiant d'offre des lignes de réservation.")
+        parser.add_argument("--gzip", action="store_true", help="Compresse la sortie à la volée.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--output", default="-", help="Fichier de sortie (défaut : sortie standard).")
+
+    def handle(self, *args, **opts):
+        try:
+            date_from = parse_bound(opts["date_from"]) if opts["date_from"] else None
+            date_to = parse_bound(opts["date_to"]) if opts["date_to"] else None
+        except ValueError as e:
+            raise CommandError(f"Date illisible : {e}")
+        if opts["batch_size"] is not None and opts["batch_size"] < 1:
+            raise CommandError("--batch-size ≥ 1 est requis.")
+
+        queryset = export_queryset(opts["dataset"], date_from, date_to, opts["offer"] or None)
+        chunks = iter_export(opts["dataset"], opts["fmt"], queryset,
+                             compress=opts["gzip"], batch_size=opts["batch_size"])
+        started = time.perf_counter()
+        written = 0
+        out = sys.stdout.buffer if opts["output"] == "-" else open(opts["output"], "wb")
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        # Le résumé part sur stderr : stdout peut porter l'export lui-même.
+        self.stderr.write(
+            f"export {opts['dataset']} octets={written} ms={(time.perf_counter() - started) * 1000:.0f}",
+            style_func=self.style.SUCCESS,
+        )
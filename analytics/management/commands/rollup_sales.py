@@ -0,0 +1,44 @@
+"""
+Fichier : rollup_sales.py (application 'analytics')
+Description : Intègre les nouvelles réservations et les nouveaux billets aux
+              agrégats de ventes (analytics/rollup.py). À lancer
+              périodiquement (cron, processus dédié avec --loop) ; chaque
+              exécution reprend au watermark de la précédente.
+
+Exemple :
+    python manage.py rollup_sales --loop 60
+    python manage.py rollup_sales --rebuild
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from analytics.rollup import catch_up, reset
+
+
+class Command(BaseCommand):
+    help = "Met à jour les agrégats de ventes par offre et par heure (incrémental, par watermark)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Lignes source par transaction.")
+        parser.add_argument("--loop", type=float, default=0,
+                            help="Relance toutes les N secondes (0 = une seule passe).")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Vide les agrégats et les recalcule depuis le début.")
+
+    def handle(self, *args, **opts):
+        if opts["loop"] < 0 or (opts["batch_size"] is not None and opts["batch_size"] < 1):
+            raise CommandError("--loop ≥ 0 et --batch-size ≥ 1 sont requis.")
+        if opts["rebuild"]:
+            reset()
+            self.stdout.write("Agrégats vidés, recalcul complet.")
+        while True:
+            started = time.perf_counter()
+            done = catch_up(opts["batch_size"])
+            detail = " ".join(f"{name}={count}" for name, count in done.items())
+            self.stdout.write(f"rollup {detail} ms={(time.perf_counter() - started) * 1000:.0f}")
+            if not opts["loop"]:
+                return
+            close_old_connections()
+            time.sleep(opts["loop"])
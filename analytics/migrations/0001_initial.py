@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offre_id', models.CharField(max_length=64)),
+                ('titre', models.CharField(blank=True, default='', max_length=255)),
+                ('hour', models.DateTimeField()),
+                ('reservations', models.PositiveIntegerField(default=0)),
+                ('places', models.PositiveIntegerField(default=0)),
+                ('paid', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'ordering': ['-hour', 'offre_id'],
+                'indexes': [models.Index(fields=['hour'], name='analytics_s_hour_4f8226_idx')],
+                'constraints': [models.UniqueConstraint(fields=('offre_id', 'hour'), name='analytics_rollup_offer_hour')],
+            },
+        ),
+    ]
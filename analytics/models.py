@@ -0,0 +1,44 @@
+"""
+Fichier : models.py (application 'analytics')
+Description : Tables d'agrégats des ventes, tenues à jour de façon
+              incrémentale par `rollup_sales` (voir rollup.py).
+"""
+from django.db import models
+
+
+class SalesRollup(models.Model):
+    """
+    Ventes d'une offre sur une heure (UTC) :
+      - `reservations` et `places` : lignes de réservation créées et places demandées ;
+      - `paid` et `revenue` : places payées et chiffre d'affaires, à l'heure du paiement.
+    """
+    offre_id = models.CharField(max_length=64)
+    titre = models.CharField(max_length=255, blank=True, default="")
+    hour = models.DateTimeField()
+
+    reservations = models.PositiveIntegerField(default=0)
+    places = models.PositiveIntegerField(default=0)
+    paid = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-hour", "offre_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["offre_id", "hour"], name="analytics_rollup_offer_hour"),
+        ]
+        indexes = [
+            models.Index(fields=["hour"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Ventes {self.offre_id} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+class RollupWatermark(models.Model):
+    """Dernier identifiant source intégré aux agrégats, par flux (lignes de réservation, billets)."""
+    name = models.CharField(max_length=32, primary_key=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} ≤ {self.last_id}"
@@ -0,0 +1,135 @@
+"""
+Fichier : rollup.py (application 'analytics')
+Description : Mise à jour incrémentale des agrégats de ventes (SalesRollup).
+
+              Deux flux sont intégrés par lots de clés primaires, chacun avec
+              son watermark (dernier identifiant traité) :
+                - "items"   : lignes de réservation → `reservations`, `places`,
+                  à l'heure de création de la réservation ;
+                - "tickets" : billets émis → `paid`, `revenue`, à l'heure du
+                  paiement, d'après les lignes de la réservation payée.
+              Agrégats et watermark sont écrits dans la même transaction : un
+              lot est compté une fois et une seule, même après une interruption.
+
+              Les lignes plus récentes que `LAG_S` secondes ne sont pas encore
+              intégrées : une transaction plus ancienne encore en cours peut
+              valider un identifiant inférieur, qui serait sinon sauté.
+
+              Le paiement n'écrit rien ici : mettre à jour la même ligne
+              (offre, heure) à chaque commande créerait un point de contention
+              en pleine ouverture des ventes.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from orders.models import ReservationItem, Ticket
+
+from .models import RollupWatermark, SalesRollup
+
+COUNTERS = ("reservations", "places", "paid", "revenue")
+
+
+def truncate_hour(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _empty():
+    return {"titre": "", "reservations": 0, "places": 0, "paid": 0, "revenue": Decimal("0.00")}
+
+
+def _add(offre_id, hour, delta) -> bool:
+    return bool(SalesRollup.objects.filter(offre_id=offre_id, hour=hour).update(
+        titre=delta["titre"], **{c: F(c) + delta[c] for c in COUNTERS}
+    ))
+
+
+def _apply(deltas: dict):
+    """Ajoute les compteurs aux lignes (offre, heure), créées au besoin."""
+    for (offre_id, hour), delta in deltas.items():
+        if _add(offre_id, hour, delta):
+            continue
+        try:
+            with transaction.atomic():  # point de sauvegarde : la transaction du lot reste utilisable
+                SalesRollup.objects.create(offre_id=offre_id, hour=hour, **delta)
+        except IntegrityError:
+            # Ligne créée entre-temps par l'autre flux (verrous de watermark distincts).
+            _add(offre_id, hour, delta)
+
+
+def _item_batch(last_id: int, cutoff, size: int):
+    rows = list(
+        ReservationItem.objects.filter(id__gt=last_id).order_by("id")
+        .values("id", "offre_id", "titre", "qty", "reservation__created_at")[:size]
+    )
+    # Arrêt au premier enregistrement trop récent : le watermark ne le dépasse pas.
+    fresh = next((i for i, r in enumerate(rows) if r["reservation__created_at"] >= cutoff), None)
+    rows = rows if fresh is None else rows[:fresh]
+    deltas = defaultdict(_empty)
+    for r in rows:
+        delta = deltas[(r["offre_id"], truncate_hour(r["reservation__created_at"]))]
+        delta["titre"] = r["titre"]
+        delta["reservations"] += 1
+        delta["places"] += r["qty"]
+    return rows, deltas
+
+
+def _ticket_batch(last_id: int, cutoff, size: int):
+    rows = list(
+        Ticket.objects.filter(id__gt=last_id).order_by("id")
+        .values("id", "reservation_id", "created_at")[:size]
+    )
+    fresh = next((i for i, r in enumerate(rows) if r["created_at"] >= cutoff), None)
+    rows = rows if fresh is None else rows[:fresh]
+    paid_at = {r["reservation_id"]: truncate_hour(r["created_at"]) for r in rows}
+    deltas = defaultdict(_empty)
+    items = ReservationItem.objects.filter(reservation_id__in=list(paid_at)).values(
+        "reservation_id", "offre_id", "titre", "qty", "prix",
+    )
+    for item in items.iterator():
+        delta = deltas[(item["offre_id"], paid_at[item["reservation_id"]])]
+        delta["titre"] = item["titre"]
+        delta["paid"] += item["qty"]
+        delta["revenue"] += item["prix"] * item["qty"]
+    return rows, deltas
+
+
+STREAMS = {"items": _item_batch, "tickets": _ticket_batch}
+
+
+def _catch_up_stream(name: str, cutoff, batch_size: int) -> int:
+    RollupWatermark.objects.get_or_create(name=name)
+    done = 0
+    while True:
+        with transaction.atomic():
+            # Verrou du watermark : deux exécutions simultanées se suivent au lieu de compter deux fois.
+            mark = RollupWatermark.objects.select_for_update().get(name=name)
+            rows, deltas = STREAMS[name](mark.last_id, cutoff, batch_size)
+            if not rows:
+                return done
+            _apply(deltas)
+            mark.last_id = rows[-1]["id"]
+            mark.save(update_fields=["last_id", "updated_at"])
+        done += len(rows)
+        if len(rows) < batch_size:
+            return done
+
+
+def catch_up(batch_size: int | None = None, now=None) -> dict[str, int]:
+    """Intègre les nouvelles lignes de chaque flux ; retourne le nombre de lignes traitées par flux."""
+    cfg = settings.ANALYTICS_ROLLUP
+    cutoff = (now or timezone.now()) - timedelta(seconds=cfg["LAG_S"])
+    batch_size = batch_size or cfg["BATCH_SIZE"]
+    return {name: _catch_up_stream(name, cutoff, batch_size) for name in STREAMS}
+
+
+def reset():
+    """Vide les agrégats et les watermarks (reconstruction complète au prochain `catch_up`)."""
+    with transaction.atomic():
+        SalesRollup.objects.all().delete()
+        RollupWatermark.objects.all().delete()
@@ -0,0 +1,101 @@
+"""
+Fichier : test_exports.py (application 'analytics')
+Description : Teste les exports en flux : lots par clé primaire, filtres de
+              période et d'offre, CSV / JSON Lines, gzip, API et commande.
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from analytics.exports import export_queryset, iter_export
+from orders.models import Reservation, ReservationItem, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+DAY = datetime(2024, 7, 26, 10, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def orders():
+    user = User.objects.create_user(username="ada", password="x")
+    made = []
+    for i in range(5):
+        res = Reservation.objects.create(user=user, client_nom="Doe", client_prenom="Jane", client_email=f"{i}@x.fr",
+                                         total=Decimal("25.00"), places=1)
+        Reservation.objects.filter(pk=res.pk).update(created_at=DAY + timedelta(days=i))
+        ReservationItem.objects.create(reservation=res, offre_id=str(i % 2), titre="Solo", prix=Decimal("25.00"), qty=1)
+        if i % 2 == 0:
+            Ticket.objects.create(user=user, reservation=res, ticket_key=f"secret{i}", qr_image="tickets/x.png")
+        made.append(res)
+    return made
+
+
+def test_keyset_batches_and_filters(orders):
+    """Teste la lecture par lots (une requête par lot) et les filtres de période et d'offre."""
+    with CaptureQueriesContext(connection) as ctx:
+        body = b"".join(iter_export("reservations", "csv", batch_size=2)).decode()
+    assert len(ctx) == 3
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [int(r["id"]) for r in rows] == [r.id for r in orders]
+    assert [r["paid"] for r in rows] == ["True", "False", "True", "False", "True"]
+
+    qs = export_queryset("reservations", DAY + timedelta(days=1), DAY + timedelta(days=4), offer="1")
+    assert list(qs.values_list("id", flat=True).order_by("id")) == [orders[1].id, orders[3].id]
+    qs = export_queryset("tickets", offer="0")
+    assert qs.count() == 3
+
+
+def test_jsonl_gzip_and_no_secret_keys(orders):
+    """Teste le JSON Lines compressé à la volée, sans la clé secrète des billets."""
+    data = gzip.decompress(b"".join(iter_export("tickets", "jsonl", compress=True, batch_size=2)))
+    lines = [json.loads(line) for line in data.decode().splitlines()]
+    assert len(lines) == 3 and "ticket_key" not in lines[0]
+    assert lines[0]["reservation__total"] == "25.00"
+
+
+def test_csv_neutralizes_formulas(orders):
+    """Teste que les textes interprétables comme formules sont préfixés en CSV, pas en JSON Lines."""
+    Reservation.objects.filter(pk=orders[0].pk).update(client_nom='=HYPERLINK("http://x")', client_prenom="@SUM(A1)",
+                                                       client_telephone="+33 6 00 00 00 00")
+    Reservation.objects.filter(pk=orders[1].pk).update(client_nom="-1+1", client_prenom="\tJane")
+    rows = list(csv.DictReader(io.StringIO(b"".join(iter_export("reservations", "csv")).decode())))
+    assert [rows[0]["client_nom"], rows[0]["client_prenom"], rows[0]["client_telephone"]] == [
+        "'=HYPERLINK(\"http://x\")", "'@SUM(A1)", "'+33 6 00 00 00 00",
+    ]
+    assert [rows[1]["client_nom"], rows[1]["client_prenom"]] == ["'-1+1", "'\tJane"]
+    assert rows[2]["client_nom"] == "Doe" and rows[2]["total"] == "25.00"
+    line = json.loads(b"".join(iter_export("reservations", "jsonl")).decode().splitlines()[0])
+    assert line["client_nom"] == '=HYPERLINK("http://x")'
+
+
+def test_api_streams_for_staff_only(api_client, orders):
+    """Teste l'API : réservée au staff, réponse en flux, jeu ou format inconnu refusé."""
+    url = reverse("analytics:export", kwargs={"dataset": "items", "fmt": "csv"})
+    api_client.force_authenticate(user=orders[0].user)
+    assert api_client.get(url).status_code == 403
+
+    api_client.force_authenticate(user=User.objects.create_user(username="ops", password="x", is_staff=True))
+    r = api_client.get(url, {"offer": "0", "from": "2024-07-27"})
+    assert r.streaming and r["Content-Disposition"] == 'attachment; filename="items.csv"'
+    rows = list(csv.DictReader(io.StringIO(b"".join(r.streaming_content).decode())))
+    assert [row["reservation_id"] for row in rows] == [str(orders[2].id), str(orders[4].id)]
+    assert api_client.get(reverse("analytics:export", kwargs={"dataset": "users", "fmt": "csv"})).status_code == 404
+
+
+def test_command_writes_file(orders, tmp_path):
+    """Teste la commande : fichier gzip lisible, résumé sur la sortie d'erreur."""
+    target = tmp_path / "reservations.csv.gz"
+    err = io.StringIO()
+    call_command("export_orders", "reservations", "--gzip", "--output", str(target), "--batch-size", "2", stderr=err)
+    assert gzip.decompress(target.read_bytes()).decode().count("\n") == 6
+    assert "export reservations" in err.getvalue()
@@ -0,0 +1,141 @@
+"""
+Fichier : test_rollup.py (application 'analytics')
+Description : Teste l'intégration incrémentale des ventes (watermarks, délai
+              de sécurité, reprise sans double comptage) et l'API des ventes.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Sum
+from django.db.utils import ConnectionDoesNotExist
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from analytics.models import RollupWatermark, SalesRollup
+from analytics import rollup
+from analytics.rollup import catch_up
+from orders.models import Reservation, ReservationItem, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+H10 = datetime(2024, 7, 26, 10, 15, tzinfo=dt_timezone.utc)
+
+
+def _reservation(user, at, lines, paid_at=None):
+    res = Reservation.objects.create(user=user, client_nom="Doe", client_prenom="Jane", client_email="j@x.fr",
+                                     total=sum(Decimal(p) * q for _, p, q in lines), places=sum(q for *_, q in lines))
+    Reservation.objects.filter(pk=res.pk).update(created_at=at)
+    for offre_id, prix, qty in lines:
+        ReservationItem.objects.create(reservation=res, offre_id=offre_id, titre=f"Offre {offre_id}",
+                                       prix=Decimal(prix), qty=qty)
+    if paid_at:
+        ticket = Ticket.objects.create(user=user, reservation=res, ticket_key=f"k{res.pk}", qr_image="tickets/x.png")
+        Ticket.objects.filter(pk=ticket.pk).update(created_at=paid_at)
+    return res
+
+
+def _rollup(offre_id, hour):
+    return SalesRollup.objects.get(offre_id=offre_id, hour=hour.replace(minute=0))
+
+
+def test_catch_up_is_incremental_and_counts_once():
+    """Teste les compteurs par offre et par heure, puis une reprise qui n'intègre que les nouveautés."""
+    user = User.objects.create_user(username="ada", password="x")
+    _reservation(user, H10, [("1", "25.00", 2), ("2", "40.00", 1)], paid_at=H10 + timedelta(hours=1))
+    _reservation(user, H10 + timedelta(minutes=20), [("1", "25.00", 1)])
+
+    assert catch_up(batch_size=2, now=H10 + timedelta(days=1)) == {"items": 3, "tickets": 1}
+    r = _rollup("1", H10)
+    assert (r.reservations, r.places, r.paid, r.revenue) == (2, 3, 0, 0)
+    paid = _rollup("1", H10 + timedelta(hours=1))
+    assert (paid.reservations, paid.paid, paid.revenue) == (0, 2, Decimal("50.00"))
+
+    assert catch_up(now=H10 + timedelta(days=1)) == {"items": 0, "tickets": 0}
+    _reservation(user, H10, [("1", "25.00", 4)], paid_at=H10)
+    catch_up(now=H10 + timedelta(days=1))
+    r.refresh_from_db()
+    assert (r.reservations, r.places, r.paid, r.revenue) == (3, 7, 4, Decimal("100.00"))
+
+
+def test_recent_rows_wait_for_the_safety_lag(settings):
+    """Teste que les lignes plus récentes que LAG_S attendent le passage suivant, sans être sautées."""
+    settings.ANALYTICS_ROLLUP = {**settings.ANALYTICS_ROLLUP, "LAG_S": 60}
+    user = User.objects.create_user(username="ada", password="x")
+    now = timezone.now()
+    _reservation(user, now - timedelta(minutes=5), [("1", "25.00", 1)])
+    _reservation(user, now, [("1", "25.00", 1)])
+    assert catch_up(now=now)["items"] == 1
+    assert catch_up(now=now + timedelta(minutes=2))["items"] == 1
+    assert SalesRollup.objects.aggregate(n=Sum("reservations"))["n"] == 2
+
+
+def test_command_and_staff_api():
+    """Teste la commande (avec reconstruction) et l'API qui ne lit que les agrégats."""
+    user = User.objects.create_user(username="ada", password="x")
+    _reservation(user, H10, [("1", "25.00", 2)], paid_at=H10)
+    _reservation(user, H10 + timedelta(days=1), [("2", "40.00", 1)], paid_at=H10 + timedelta(days=1))
+    out = StringIO()
+    call_command("rollup_sales", "--rebuild", stdout=out)
+    assert "items=2 tickets=2" in out.getvalue()
+    assert set(RollupWatermark.objects.values_list("name", flat=True)) == {"items", "tickets"}
+
+    client = APIClient()
+    url = reverse("analytics:sales")
+    client.force_authenticate(user=user)
+    assert client.get(url).status_code == 403
+
+    client.force_authenticate(user=User.objects.create_user(username="ops", password="x", is_staff=True))
+    body = client.get(url, {"group": "day"}).json()
+    assert [r["day"] for r in body["results"]] == ["2024-07-26", "2024-07-27"]
+    assert body["totals"]["revenue"] == "90.00" and body["totals"]["paid"] == 3
+    body = client.get(url, {"group": "offer", "from": "2024-07-27"}).json()
+    assert [(r["offre_id"], r["titre"], r["revenue"]) for r in body["results"]] == [("2", "Offre 2", "40.00")]
+    assert client.get(url, {"from": "hier"}).status_code == 400
+
+
+def test_admin_dashboard_shows_selection_totals(admin_client):
+    """Teste le tableau de bord de l'admin : totaux de la sélection et avancement des flux."""
+    user = User.objects.create_user(username="ada", password="x")
+    _reservation(user, H10, [("1", "25.00", 2)], paid_at=H10)
+    catch_up(now=H10 + timedelta(days=1))
+    r = admin_client.get(reverse("admin:analytics_salesrollup_changelist"))
+    assert r.status_code == 200
+    assert r.context["sales_totals"]["revenue"] == Decimal("50.00")
+    assert "intégré jusqu'à" in r.content.decode()
+
+
+def test_admin_reads_the_analytics_database(admin_client, settings):
+    """Teste que l'admin des agrégats (totaux et watermarks compris) lit ANALYTICS_DATABASE."""
+    settings.ANALYTICS_DATABASE = "absente"
+    for name in ("salesrollup", "rollupwatermark"):
+        with pytest.raises(ConnectionDoesNotExist):
+            admin_client.get(reverse(f"admin:analytics_{name}_changelist"))
+
+
+def test_concurrent_row_creation_is_added_not_lost(monkeypatch):
+    """Teste la création concurrente d'une ligne (offre, heure) : le lot s'y ajoute au lieu d'échouer."""
+    hour = H10.replace(minute=0)
+    add = rollup._add
+    calls = []
+
+    def add_racing_other_stream(offre_id, hour, delta):
+        calls.append(offre_id)
+        if len(calls) == 1:
+            # Notre UPDATE ne trouve rien ; l'autre flux insère la ligne juste après.
+            SalesRollup.objects.create(offre_id=offre_id, hour=hour, titre="Offre 1", paid=1, revenue=Decimal("25.00"))
+            return False
+        return add(offre_id, hour, delta)
+
+    monkeypatch.setattr(rollup, "_add", add_racing_other_stream)
+    delta = {"titre": "Offre 1", "reservations": 1, "places": 2, "paid": 0, "revenue": Decimal("0.00")}
+    with transaction.atomic():
+        rollup._apply({("1", hour): delta})
+    row = _rollup("1", hour)
+    assert len(calls) == 2
+    assert (row.reservations, row.places, row.paid, row.revenue) == (1, 2, 1, Decimal("25.00"))
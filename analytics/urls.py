@@ -0,0 +1,14 @@
+"""
+Fichier : urls.py (application 'analytics')
+Description : Routes de l'API des ventes réservée au staff.
+"""
+app_name = "analytics"
+from django.urls import path
+from .views import ExportAPIView, SalesAPIView
+
+urlpatterns = [
+    # Ventes agrégées par heure, par jour ou par offre.
+    path("sales", SalesAPIView.as_view(), name="sales"),
+    # Exports complets en flux (CSV / JSON Lines, gzip facultatif).
+    path("exports/<slug:dataset>.<slug:fmt>", ExportAPIView.as_view(), name="export"),
+]
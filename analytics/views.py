@@ -0,0 +1,103 @@
+"""
+Fichier : views.py (application 'analytics')
+Description : API des ventes réservée au staff. Elle ne lit que les tables
+              d'agrégats (jamais les réservations ni les billets), sur la base
+              `ANALYTICS_DATABASE` (réplique en lecture si configurée).
+              Les exports complets sont générés en flux (exports.py).
+"""
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .exports import DATASETS, FORMATS, export_filename, export_queryset, iter_export, parse_bound
+from .models import RollupWatermark, SalesRollup
+
+COUNTERS = ("reservations", "places", "paid", "revenue")
+GROUPS = ("hour", "day", "offer")
+
+
+def _row(values: dict) -> dict:
+    row = {k: v for k, v in values.items() if k not in COUNTERS}
+    row.update({c: values[c] or 0 for c in COUNTERS if c != "revenue"})
+    row["revenue"] = f"{Decimal(values['revenue'] or 0):.2f}"
+    return row
+
+
+class SalesAPIView(APIView):
+    """
+    Ventes agrégées : `?group=hour|day|offer`, `from`/`to` (date ou date-heure,
+    borne haute exclue), `offer` (identifiant d'offre des lignes de réservation).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        group = params.get("group", "hour")
+        if group not in GROUPS:
+            return Response({"detail": f"group doit valoir {', '.join(GROUPS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = SalesRollup.objects.using(settings.ANALYTICS_DATABASE)
+        try:
+            if params.get("from"):
+                qs = qs.filter(hour__gte=parse_bound(params["from"]))
+            if params.get("to"):
+                qs = qs.filter(hour__lt=parse_bound(params["to"]))
+        except ValueError:
+            return Response({"detail": "from/to : date ou date-heure ISO attendue."}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get("offer"):
+            qs = qs.filter(offre_id=params["offer"])
+
+        sums = {c: Sum(c) for c in COUNTERS}
+        if group == "hour":
+            rows = qs.values("hour").annotate(**sums).order_by("hour")
+        elif group == "day":
+            rows = (qs.annotate(day=TruncDate("hour", tzinfo=dt_timezone.utc))
+                    .values("day").annotate(**sums).order_by("day"))
+        else:
+            rows = qs.values("offre_id").annotate(titre=Max("titre"), **sums).order_by("-revenue", "offre_id")
+
+        marks = RollupWatermark.objects.using(settings.ANALYTICS_DATABASE).values("name", "last_id", "updated_at")
+        return Response({
+            "group": group,
+            "results": [_row(r) for r in rows],
+            "totals": _row(qs.aggregate(**sums)),
+            # Fraîcheur des agrégats : dernière intégration de chaque flux.
+            "watermarks": {m["name"]: {"last_id": m["last_id"], "updated_at": m["updated_at"]} for m in marks},
+        })
+
+
+class ExportAPIView(APIView):
+    """
+    Export complet en flux : `/exports/<reservations|items|tickets>.<csv|jsonl>`,
+    avec `from`/`to` (borne haute exclue), `offer` et `gzip=1`.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, dataset, fmt):
+        if dataset not in DATASETS or fmt not in FORMATS:
+            return Response(
+                {"detail": f"Jeux : {', '.join(DATASETS)} ; formats : {', '.join(FORMATS)}."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        params = request.query_params
+        try:
+            bounds = {k: parse_bound(params[k]) if params.get(k) else None for k in ("from", "to")}
+        except ValueError:
+            return Response({"detail": "from/to : date ou date-heure ISO attendue."}, status=status.HTTP_400_BAD_REQUEST)
+        compress = params.get("gzip", "").lower() in ("1", "true", "yes")
+        queryset = export_queryset(dataset, bounds["from"], bounds["to"], params.get("offer") or None)
+        queryset = queryset.using(settings.ANALYTICS_DATABASE)
+
+        response = StreamingHttpResponse(
+            iter_export(dataset, fmt, queryset, compress=compress),
+            content_type="application/gzip" if compress else FORMATS[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{export_filename(dataset, fmt, compress)}"'
+        return response
@@ -0,0 +1,12 @@
+"""
+Fichier : apps.py (application 'benchmarks')
+Description : Fichier de configuration pour l'application Django 'benchmarks'.
+              Elle regroupe les commandes de mesure de performance
+              (bancs d'essai de bout en bout et micro-benchmarks).
+"""
+from django.apps import AppConfig
+
+
+class BenchmarksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'benchmarks'
@@ -0,0 +1,279 @@
+"""
+Fichier : bench_onsale.py (application 'benchmarks')
+Description : Banc d'essai de bout en bout d'une ouverture de billetterie.
+              Chaque utilisateur virtuel enchaîne les vraies routes de l'API
+              (inscription → connexion → offres → réservation → paiement →
+              contrôle du billet) à travers toute la pile Django (middlewares,
+              URLconf, vues DRF). Pour chaque étape, la commande mesure les
+              latences p50/p95/p99, le débit et le nombre de requêtes SQL par
+              appel, puis enregistre le résultat en JSON pour comparer les
+              exécutions entre elles.
+
+              Tous les utilisateurs virtuels passent par un même gestionnaire
+              de requêtes (une seule instance de chaque middleware, comme
+              dans un worker) : le délestage est donc partagé. Ses 503
+              comptent comme des erreurs de l'étape et sont aussi décomptés
+              à part (`shed`).
+
+              La commande migre et écrit dans la base configurée : elle refuse
+              de tourner hors de `settings_bench`, d'une base SQLite ou d'une
+              base dont le nom contient « bench », sauf avec --allow-database.
+
+Exemple :
+    python manage.py bench_onsale --settings=jo_backend.settings_bench \\
+        --users 200 --concurrency 16 --output bench/onsale.json \\
+        --compare bench/onsale_previous.json
+"""
+import json
+import platform
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.client import ClientHandler
+from django.urls import reverse
+
+from benchmarks.stats import summarize
+from offers.models import Offer
+from orders.models import Ticket
+from orders.utils import ticket_qr_payload
+
+STAGES = ("register", "login", "offers", "reserve", "checkout", "verify")
+BENCH_PASSWORD = "Bench!Passw0rd-2024"
+
+
+class _QueryCounter:
+    """`execute_wrapper` qui compte les requêtes SQL exécutées par le thread courant."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class _Recorder:
+    """Collecte thread-safe des mesures par étape."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {stage: [] for stage in STAGES}
+        self.queries = {stage: [] for stage in STAGES}
+        self.errors = {stage: 0 for stage in STAGES}
+        self.shed = {stage: 0 for stage in STAGES}
+
+    def add(self, stage: str, elapsed_ms: float, queries: int, ok: bool, shed: bool = False):
+        with self._lock:
+            self.samples[stage].append(elapsed_ms)
+            self.queries[stage].append(queries)
+            if not ok:
+                self.errors[stage] += 1
+            if shed:
+                self.shed[stage] += 1
+
+
+class Command(BaseCommand):
+    help = "Banc d'essai de bout en bout (register → login → reserve → checkout → verify)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Nombre d'utilisateurs virtuels.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Utilisateurs simultanés.")
+        parser.add_argument("--items", type=int, default=2, help="Lignes par panier.")
+        parser.add_argument("--output", default="", help="Fichier JSON de résultats.")
+        parser.add_argument("--compare", default="", help="Résultats JSON d'une exécution précédente.")
+        parser.add_argument("--no-migrate", action="store_true", help="Ne pas appliquer les migrations avant l'essai.")
+        parser.add_argument("--allow-database", action="store_true",
+                            help="Autoriser une base qui n'est ni SQLite ni nommée « bench ».")
+
+    def handle(self, *args, **opts):
+        if opts["users"] < 1 or opts["concurrency"] < 1:
+            raise CommandError("--users et --concurrency doivent être ≥ 1.")
+        if not (opts["allow_database"] or self._is_bench_database()):
+            raise CommandError(
+                f"Base {connection.settings_dict['NAME']!r} ({connection.vendor}) refusée : l'essai la migre "
+                "et y crée des comptes. Utiliser --settings=jo_backend.settings_bench, une base « bench » "
+                "ou --allow-database."
+            )
+        if not opts["no_migrate"]:
+            call_command("migrate", verbosity=0)
+
+        self.run_id = uuid.uuid4().hex[:8]
+        self.items = max(1, opts["items"])
+        self.handler = ClientHandler(enforce_csrf_checks=False)
+        self._ensure_offers()
+
+        recorder = _Recorder()
+        started = time.perf_counter()
+        if opts["concurrency"] == 1:
+            for idx in range(opts["users"]):
+                self._journey(idx, recorder)
+        else:
+            with ThreadPoolExecutor(max_workers=opts["concurrency"]) as pool:
+                list(pool.map(lambda idx: self._journey(idx, recorder, close=True), range(opts["users"])))
+        wall = time.perf_counter() - started
+
+        report = self._report(recorder, wall, opts)
+        self._print(report)
+        if opts["compare"]:
+            self._print_comparison(report, opts["compare"])
+        if opts["output"]:
+            out = Path(opts["output"])
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(f"Résultats enregistrés dans {out}")
+
+    # --- Préparation ---
+
+    @staticmethod
+    def _is_bench_database() -> bool:
+        """Vrai pour les settings de banc d'essai, une base SQLite ou une base nommée « bench »."""
+        return (
+            settings.SETTINGS_MODULE == "jo_backend.settings_bench"
+            or connection.vendor == "sqlite"
+            or "bench" in str(connection.settings_dict["NAME"]).lower()
+        )
+
+    def _ensure_offers(self):
+        """Crée quelques offres si le catalogue est vide (bulk_create : sans signaux)."""
+        if Offer.objects.exists():
+            return
+        Offer.objects.bulk_create([
+            Offer(name=f"Bench {cat}", slug=f"bench-{cat}", titre=f"Bench {cat}",
+                  category=cat, price=price, persons=persons)
+            for cat, price, persons in (("solo", 25, 1), ("duo", 45, 2), ("famille", 90, 4))
+        ])
+
+    # --- Parcours d'un utilisateur virtuel ---
+
+    def _call(self, recorder, stage, fn, expected):
+        counter = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = fn()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        ok = response.status_code in expected
+        recorder.add(stage, elapsed_ms, counter.count, ok, shed=response.status_code == 503)
+        return response if ok else None
+
+    def _journey(self, idx: int, recorder: _Recorder, close: bool = False):
+        client = Client(HTTP_HOST="localhost")
+        client.handler = self.handler  # cookies propres à l'utilisateur, middlewares partagés
+        username = f"bench_{self.run_id}_{idx}"
+        try:
+            r = self._call(recorder, "register", lambda: client.post(
+                reverse("accounts:register"),
+                {"username": username, "email": f"{username}@bench.local", "password": BENCH_PASSWORD},
+                content_type="application/json",
+            ), (201,))
+            if r is None:
+                return
+
+            r = self._call(recorder, "login", lambda: client.post(
+                reverse("accounts:login"), {"username": username, "password": BENCH_PASSWORD},
+                content_type="application/json",
+            ), (200,))
+            if r is None:
+                return
+            auth = {"HTTP_AUTHORIZATION": f"Bearer {r.json()['access']}"}
+
+            r = self._call(recorder, "offers", lambda: client.get(reverse("offers:offer-list"), **auth), (200,))
+            if r is None:
+                return
+            offers = r.json()[: self.items] or [{"id": 0, "titre": "Bench", "price": "10.00"}]
+
+            panier = [{"id": str(o["id"]), "titre": o.get("titre") or "Offre", "prix": str(o["price"]), "qty": 1}
+                      for o in offers]
+            payload = {
+                "client": {"nom": "Bench", "prenom": f"U{idx}", "email": f"{username}@bench.local"},
+                "panier": panier,
+                "total": str(sum(float(it["prix"]) for it in panier)),
+                "places": len(panier),
+            }
+            r = self._call(recorder, "reserve", lambda: client.post(
+                reverse("orders:reservation_create"), payload, content_type="application/json", **auth,
+            ), (201,))
+            if r is None:
+                return
+
+            rid = r.json()["reservation_id"]
+            r = self._call(recorder, "checkout", lambda: client.post(
+                reverse("orders:checkout"), {"reservation_id": rid}, content_type="application/json", **auth,
+            ), (201,))
+            if r is None:
+                return
+
+            # Le contenu du QR est recalculé hors mesure (le scanner le lit sur le billet).
+            qr = ticket_qr_payload(Ticket.objects.get(id=r.json()["ticket"]["id"]))
+            self._call(recorder, "verify", lambda: client.post(
+                reverse("orders:verify_ticket"), {"qr": qr}, content_type="application/json",
+            ), (200,))
+        finally:
+            if close:
+                connection.close()
+
+    # --- Rapport ---
+
+    def _report(self, recorder: _Recorder, wall: float, opts) -> dict:
+        stages = {}
+        for stage in STAGES:
+            samples = recorder.samples[stage]
+            queries = recorder.queries[stage]
+            stages[stage] = {
+                **summarize(samples),
+                "errors": recorder.errors[stage],
+                "shed": recorder.shed[stage],
+                "rps": round(len(samples) / wall, 2) if wall else 0.0,
+                "queries_per_request": round(sum(queries) / len(queries), 2) if queries else 0.0,
+            }
+        total = sum(len(s) for s in recorder.samples.values())
+        return {
+            "benchmark": "onsale",
+            "run_id": self.run_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "db_vendor": connection.vendor,
+            "users": opts["users"],
+            "concurrency": opts["concurrency"],
+            "wall_s": round(wall, 3),
+            "total_requests": total,
+            "total_rps": round(total / wall, 2) if wall else 0.0,
+            "stages": stages,
+        }
+
+    def _print(self, report: dict):
+        header = f"{'étape':<10} {'n':>6} {'err':>5} {'shed':>5} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'sql/req':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for stage, s in report["stages"].items():
+            self.stdout.write(
+                f"{stage:<10} {s['n']:>6} {s['errors']:>5} {s['shed']:>5} {s['rps']:>8} {s['p50_ms']:>9} "
+                f"{s['p95_ms']:>9} {s['p99_ms']:>9} {s['queries_per_request']:>8}"
+            )
+        self.stdout.write(
+            f"Total : {report['total_requests']} requêtes en {report['wall_s']} s ({report['total_rps']} req/s)"
+        )
+
+    def _print_comparison(self, report: dict, previous_path: str):
+        try:
+            previous = json.loads(Path(previous_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Impossible de lire {previous_path} : {e}")
+        self.stdout.write(f"\nComparaison avec {previous_path} (p95, sql/req) :")
+        for stage, s in report["stages"].items():
+            old = previous.get("stages", {}).get(stage)
+            if not old or not old.get("p95_ms"):
+                continue
+            delta = (s["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            self.stdout.write(
+                f"  {stage:<10} p95 {old['p95_ms']} → {s['p95_ms']} ms ({delta:+.1f} %), "
+                f"sql/req {old['queries_per_request']} → {s['queries_per_request']}"
+            )
@@ -0,0 +1,117 @@
+"""
+Fichier : bench_primitives.py (application 'benchmarks')
+Description : Micro-benchmarks répétables des primitives coûteuses en CPU
+              (voir `benchmarks/primitives.py`). Chaque cas est chauffé, puis
+              chronométré sur plusieurs séries ; les implémentations d'un même
+              groupe sont comparées entre elles. Avec `--baseline`, la commande
+              échoue si un cas régresse au-delà du seuil configuré.
+
+Exemple :
+    python manage.py bench_primitives --output bench/primitives.json
+    python manage.py bench_primitives --baseline bench/primitives.json --threshold 15
+"""
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.primitives import CASES
+from benchmarks.stats import summarize
+
+
+def measure(fn, warmup: int, repeat: int, min_time: float) -> dict:
+    """Chauffe `fn`, calibre le nombre d'appels par série puis mesure `repeat` séries."""
+    for _ in range(warmup):
+        fn()
+
+    start = time.perf_counter()
+    fn()
+    single = max(time.perf_counter() - start, 1e-7)
+    number = max(1, math.ceil(min_time / single))
+
+    per_call_ms = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call_ms.append((time.perf_counter() - start) * 1000 / number)
+    return {**summarize(per_call_ms), "calls_per_round": number}
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmarks des primitives CPU (QR, tokens, hachages) avec contrôle de régression."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", default="", help="Cas ou groupes à exécuter, séparés par des virgules.")
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--min-time", type=float, default=0.05,
+                            help="Durée minimale d'une série (s), pour calibrer le nombre d'appels.")
+        parser.add_argument("--output", default="", help="Fichier JSON de résultats.")
+        parser.add_argument("--baseline", default="", help="Résultats JSON de référence.")
+        parser.add_argument("--threshold", type=float, default=15.0,
+                            help="Régression tolérée sur le p50, en pourcentage.")
+
+    def handle(self, *args, **opts):
+        selected = {s.strip() for s in opts["only"].split(",") if s.strip()}
+        cases = {
+            name: (group, setup) for name, (group, setup) in CASES.items()
+            if not selected or name in selected or group in selected
+        }
+        if not cases:
+            raise CommandError(f"Aucun cas ne correspond à --only={opts['only']!r}.")
+
+        results = {}
+        for name, (group, setup) in cases.items():
+            stats = measure(setup(), opts["warmup"], opts["repeat"], opts["min_time"])
+            results[name] = {"group": group, **stats}
+
+        self._print(results)
+        report = {
+            "benchmark": "primitives",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "results": results,
+        }
+        if opts["output"]:
+            out = Path(opts["output"])
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(f"Résultats enregistrés dans {out}")
+        if opts["baseline"]:
+            self._check_regressions(results, opts["baseline"], opts["threshold"])
+
+    def _print(self, results: dict):
+        fastest = {}
+        for r in results.values():
+            fastest[r["group"]] = min(fastest.get(r["group"], math.inf), r["p50_ms"])
+
+        header = f"{'cas':<24} {'groupe':<13} {'p50 (ms)':>11} {'p95 (ms)':>11} {'relatif':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, r in results.items():
+            ratio = r["p50_ms"] / fastest[r["group"]] if fastest[r["group"]] else 1.0
+            self.stdout.write(f"{name:<24} {r['group']:<13} {r['p50_ms']:>11.4f} {r['p95_ms']:>11.4f} {'x%.2f' % ratio:>8}")
+
+    def _check_regressions(self, results: dict, baseline_path: str, threshold: float):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Référence illisible ({baseline_path}) : {e}")
+
+        regressions = []
+        for name, r in results.items():
+            ref = baseline.get(name)
+            if not ref or not ref.get("p50_ms"):
+                continue
+            delta = (r["p50_ms"] - ref["p50_ms"]) / ref["p50_ms"] * 100
+            if delta > threshold:
+                regressions.append(f"{name}: {ref['p50_ms']:.4f} → {r['p50_ms']:.4f} ms ({delta:+.1f} %)")
+
+        if regressions:
+            raise CommandError(
+                f"Régression au-delà de {threshold:.0f} % :\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write(f"Aucune régression au-delà de {threshold:.0f} % par rapport à {baseline_path}.")
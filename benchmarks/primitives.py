@@ -0,0 +1,137 @@
+"""
+Fichier : primitives.py (application 'benchmarks')
+Description : Registre des micro-benchmarks des points chauds CPU du service :
+              rendu des QR codes, signature/vérification des tokens de billet,
+              empreinte de la clé de billet, hachage des mots de passe et coût
+              de la pile de middlewares par requête d'API.
+
+              Chaque cas est une fonction de préparation qui retourne l'appel
+              à chronométrer. Les cas d'un même groupe sont des implémentations
+              alternatives d'une même opération et sont comparés entre eux.
+"""
+import hashlib
+import secrets
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core import signing
+
+# nom -> (groupe, fonction de préparation retournant un callable sans argument)
+CASES: dict[str, tuple[str, callable]] = {}
+
+SAMPLE_PAYLOAD = {"tid": 123456, "rid": 654321, "uid": 42}
+
+
+def case(name: str, group: str):
+    """Enregistre une fonction de préparation sous un nom et un groupe de comparaison."""
+    def decorator(setup):
+        CASES[name] = (group, setup)
+        return setup
+    return decorator
+
+
+# --- QR codes (orders/utils.py) ---
+
+@case("qr_png", group="qr")
+def _qr_png():
+    from orders.utils import render_qr_png
+    payload = "jo://ticket/" + signing.dumps(SAMPLE_PAYLOAD, salt="ticket")
+    return lambda: render_qr_png(payload)
+
+
+@case("qr_svg", group="qr")
+def _qr_svg():
+    from orders.utils import render_qr_svg
+    payload = "jo://ticket/" + signing.dumps(SAMPLE_PAYLOAD, salt="ticket")
+    return lambda: render_qr_svg(payload)
+
+
+# --- Tokens de billet (checkout / verify) ---
+
+@case("token_sign_dumps", group="token_sign")
+def _token_dumps():
+    return lambda: signing.dumps(SAMPLE_PAYLOAD, salt="ticket")
+
+
+@case("token_sign_compact", group="token_sign")
+def _token_compact_sign():
+    # Alternative compacte : identifiants concaténés signés, sans JSON ni horodatage.
+    signer = signing.Signer(salt="ticket")
+    value = "{tid}.{rid}.{uid}".format(**SAMPLE_PAYLOAD)
+    return lambda: signer.sign(value)
+
+
+@case("token_verify_loads", group="token_verify")
+def _token_loads():
+    token = signing.dumps(SAMPLE_PAYLOAD, salt="ticket")
+    return lambda: signing.loads(token, salt="ticket")
+
+
+@case("token_verify_compact", group="token_verify")
+def _token_compact_verify():
+    signer = signing.Signer(salt="ticket")
+    token = signer.sign("{tid}.{rid}.{uid}".format(**SAMPLE_PAYLOAD))
+    return lambda: signer.unsign(token)
+
+
+# --- Clé de billet (CheckoutAPIView) ---
+
+@case("ticket_key_sha256", group="ticket_key")
+def _ticket_key():
+    account_key = secrets.token_hex(32)
+    return lambda: hashlib.sha256((account_key + secrets.token_hex(32)).encode("utf-8")).hexdigest()
+
+
+# --- Mots de passe (inscription / connexion) ---
+
+@case("password_hash", group="password")
+def _password_hash():
+    return lambda: make_password("Bench!Passw0rd-2024")
+
+
+@case("password_check", group="password")
+def _password_check():
+    encoded = make_password("Bench!Passw0rd-2024")
+    return lambda: check_password("Bench!Passw0rd-2024", encoded)
+
+
+# --- Pile de middlewares (requête d'API complète, sans base de données) ---
+
+def _stock_middleware() -> list[str]:
+    """MIDDLEWARE avec les classes Django d'origine à la place des variantes ApiSkip*."""
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+    from jo_backend.middleware import SkipForApiMixin
+
+    stock = []
+    for path in settings.MIDDLEWARE:
+        cls = import_string(path)
+        if issubclass(cls, SkipForApiMixin):
+            base = next(b for b in cls.__bases__ if b is not SkipForApiMixin)
+            path = f"{base.__module__}.{base.__qualname__}"
+        stock.append(path)
+    return stock
+
+
+def _api_request(middleware: list[str]):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory, override_settings
+
+    with override_settings(MIDDLEWARE=middleware):
+        handler = WSGIHandler()
+    environ = RequestFactory().get("/api/health", HTTP_HOST="localhost").environ
+
+    def start_response(status, headers):
+        pass
+
+    return lambda: handler(dict(environ), start_response)
+
+
+@case("middleware_stock", group="middleware")
+def _middleware_stock():
+    return _api_request(_stock_middleware())
+
+
+@case("middleware_api_skip", group="middleware")
+def _middleware_api_skip():
+    from django.conf import settings
+    return _api_request(list(settings.MIDDLEWARE))
@@ -0,0 +1,30 @@
+"""
+Fichier : stats.py (application 'benchmarks')
+Description : Fonctions statistiques communes aux commandes de benchmark
+              (percentiles, résumé d'une série de mesures).
+"""
+import statistics
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentile par la méthode du rang le plus proche (valeurs non triées acceptées)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Résumé d'une série de durées exprimées en millisecondes."""
+    if not samples_ms:
+        return {"n": 0, "mean_ms": 0.0, "min_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "n": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "min_ms": round(min(samples_ms), 4),
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p95_ms": round(percentile(samples_ms, 95), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+        "max_ms": round(max(samples_ms), 4),
+    }
@@ -0,0 +1,43 @@
+"""
+Fichier : test_bench_onsale.py (application 'benchmarks')
+Description : Teste le banc d'essai de bout en bout sur un parcours réduit
+              (un utilisateur virtuel, exécution dans le thread du test).
+"""
+import io
+import json
+import pytest
+from django.core.management import call_command
+from benchmarks.stats import percentile
+
+pytestmark = pytest.mark.django_db
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+# Teste que chaque étape est mesurée sans erreur et que le rapport JSON est écrit.
+def test_bench_onsale_reports_every_stage(tmp_path):
+    out = tmp_path / "onsale.json"
+    call_command("bench_onsale", users=2, concurrency=1, no_migrate=True, output=str(out), stdout=io.StringIO())
+    report = json.loads(out.read_text())
+    assert set(report["stages"]) == {"register", "login", "offers", "reserve", "checkout", "verify"}
+    for stage in report["stages"].values():
+        assert stage["n"] == 2 and stage["errors"] == 0 and stage["shed"] == 0
+        assert stage["queries_per_request"] >= 1
+    assert report["stages"]["verify"]["queries_per_request"] == 1
+
+
+def test_bench_onsale_refuses_a_non_bench_database(monkeypatch):
+    """Teste que l'essai refuse une base qui n'est pas dédiée aux bancs d'essai, sauf --allow-database."""
+    from django.core.management.base import CommandError
+    from benchmarks.management.commands import bench_onsale
+
+    monkeypatch.setattr(bench_onsale.Command, "_is_bench_database", staticmethod(lambda: False))
+    with pytest.raises(CommandError, match="allow-database"):
+        call_command("bench_onsale", users=1, concurrency=1, no_migrate=True, stdout=io.StringIO())
+    call_command("bench_onsale", users=1, concurrency=1, no_migrate=True, allow_database=True,
+                 stdout=io.StringIO())
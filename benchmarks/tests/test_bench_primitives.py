@@ -0,0 +1,47 @@
+"""
+Fichier : test_bench_primitives.py (application 'benchmarks')
+Description : Teste les micro-benchmarks des primitives CPU et le contrôle
+              de régression par rapport à une référence.
+"""
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+FAST = {"warmup": 1, "repeat": 2, "min_time": 0.001, "stdout": io.StringIO()}
+
+
+# Teste la sélection par groupe et l'écriture du rapport JSON.
+def test_bench_primitives_writes_report(tmp_path):
+    out = tmp_path / "primitives.json"
+    call_command("bench_primitives", only="token_sign,ticket_key", output=str(out), **FAST)
+    results = json.loads(out.read_text())["results"]
+    assert set(results) == {"token_sign_dumps", "token_sign_compact", "ticket_key_sha256"}
+    assert all(r["p50_ms"] > 0 and r["calls_per_round"] >= 1 for r in results.values())
+
+
+# Teste l'échec de la commande lorsqu'un cas dépasse le seuil de régression.
+def test_bench_primitives_fails_on_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"token_verify_loads": {"p50_ms": 1e-6}}}))
+    with pytest.raises(CommandError, match="token_verify_loads"):
+        call_command("bench_primitives", only="token_verify_loads", baseline=str(baseline), threshold=10, **FAST)
+
+
+def test_bench_primitives_rejects_unknown_case():
+    with pytest.raises(CommandError):
+        call_command("bench_primitives", only="nope", **FAST)
+
+
+# Teste la comparaison de la pile de middlewares d'origine et de la pile allégée.
+@pytest.mark.django_db
+def test_bench_primitives_middleware_group(tmp_path):
+    from benchmarks.primitives import _stock_middleware
+    stock = _stock_middleware()
+    assert "django.contrib.sessions.middleware.SessionMiddleware" in stock
+    assert not any(path.startswith("jo_backend.middleware.ApiSkip") for path in stock)
+
+    out = tmp_path / "middleware.json"
+    call_command("bench_primitives", only="middleware", output=str(out), **FAST)
+    assert set(json.loads(out.read_text())["results"]) == {"middleware_stock", "middleware_api_skip"}
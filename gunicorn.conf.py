@@ -1,22 +1,166 @@
 import multiprocessing
 import os
+import shutil
+import time
 
-# Fly.io écoute sur le port 8080 à l'intérieur du conteneur
-bind = "0.0.0.0:8080"
+# Lecture de ce fichier : avec preload_app, gunicorn charge l'application juste
+# après (Arbiter.setup), avant même on_starting. Sert à chronométrer ce chargement.
+config_loaded_at = time.perf_counter()
 
-# Ajustables via variables d'env 
-workers = int(os.getenv("GUNICORN_WORKERS", str(max(2, multiprocessing.cpu_count() // 2))))
-threads = int(os.getenv("GUNICORN_THREADS", "2"))
+from jo_backend.pools import pool_config
+
+# Pool de workers (JO_POOL) : "web" sert tout ; "verify", "shop" et "admin" ont
+# leur port, leur URLconf et leur dimensionnement propres (jo_backend/pools.py).
+pool = pool_config()
+
+# Fly.io écoute sur le port 8080 à l'intérieur du conteneur (un port par pool)
+bind = f"0.0.0.0:{pool['port']}"
+proc_name = f"jo_backend-{pool['name']}"
+
+# Ajustables via variables d'env (GUNICORN_* prime sur le dimensionnement du pool)
+workers = int(os.getenv("GUNICORN_WORKERS", pool["workers"] or max(2, multiprocessing.cpu_count() // 2)))
+threads = int(os.getenv("GUNICORN_THREADS", pool["threads"] or 2))
 
 # Timeouts raisonnables 
-timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", pool["timeout"] or 60))
 graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
 keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
 
+# Recyclage des workers : un worker est remplacé après max_requests (± jitter, pour
+# ne pas redémarrer tous les workers en même temps) ou dès que son RSS dépasse
+# GUNICORN_MAX_RSS_MB (0 = pas de seuil). Le RSS est relevé toutes les
+# `rss_check_every` requêtes. En mode ASGI, seul max_requests s'applique.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+max_rss_mb = float(os.getenv("GUNICORN_MAX_RSS_MB", "0"))
+rss_check_every = max(1, int(os.getenv("GUNICORN_RSS_CHECK_EVERY", "20")))
+
+# Nombre de frames conservées par tracemalloc dans chaque worker (0 = désactivé).
+tracemalloc_frames = int(os.getenv("TRACEMALLOC_FRAMES", "0"))
+
 # Logs sur stdout/stderr 
 accesslog = "-"
 errorlog = "-"
 loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
 
-# module WSGI :  Module principal 
-wsgi_app = "jo_backend.wsgi:application"
+# Mode de service (SERVER_MODE, partagé avec settings.py) :
+#  - "wsgi" : workers synchrones à threads (workers × threads requêtes simultanées) ;
+#  - "asgi" : workers uvicorn, une boucle asyncio par worker. Les vues de lecture
+#             asynchrones libèrent le worker pendant les attentes d'E/S hors base
+#             (l'ORM reste exécuté sur un seul thread par worker). Mesures : README.
+server_mode = os.getenv("SERVER_MODE", "wsgi").lower()
+
+if server_mode == "asgi":
+    worker_class = "uvicorn_worker.UvicornWorker"
+    wsgi_app = "jo_backend.asgi:application"
+else:
+    # module WSGI :  Module principal 
+    wsgi_app = "jo_backend.wsgi:application"
+
+# Préchargement : l'application est importée et préchauffée dans le master avant
+# le fork, puis partagée par les workers (copie sur écriture). GUNICORN_PRELOAD=False
+# revient au chargement par worker (ex: pour recharger le code sans redémarrer le master).
+preload_app = os.getenv("GUNICORN_PRELOAD", "True").lower() in ("1", "true", "yes")
+
+# Étapes de préchauffage propres au pool (WARMUP_STEPS prime).
+if pool["warmup"]:
+    os.environ.setdefault("WARMUP_STEPS", ",".join(pool["warmup"]))
+
+# Métriques Prometheus : chaque worker écrit ses valeurs dans ce dossier partagé,
+# /metrics les agrège. La variable doit être posée, et le dossier vidé, avant le
+# chargement de l'application : avec preload_app, le master y crée ses fichiers
+# avant on_starting. Le marqueur évite de le vider à la relecture de cette
+# configuration (SIGHUP) pendant que les workers y écrivent.
+prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+if os.environ.get("JO_PROMETHEUS_RESET_PID") != str(os.getpid()):
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+    os.environ["JO_PROMETHEUS_RESET_PID"] = str(os.getpid())
+
+
+# Démarrage (STARTUP_MODE, positionné par l'image Docker) :
+#  - "fast" : statiques collectés au build, migrations par la release_command ;
+#             le master vérifie seulement que le schéma est à jour ;
+#  - "legacy" : start.sh attend la base, migre et collecte avant de lancer gunicorn.
+startup_mode = os.getenv("STARTUP_MODE", "legacy").lower()
+
+
+def on_starting(server):
+    """
+    Journalise la durée du chargement de l'application par le master (preload,
+    déjà terminé à ce stade) ; en mode rapide, vérifie le schéma.
+    """
+    from jo_backend.startup import log
+
+    if preload_app:
+        log(f"⏱ boot phase=app_load ms={(time.perf_counter() - config_loaded_at) * 1000:.0f}")
+
+    if startup_mode == "fast":
+        from jo_backend.startup import fast_boot
+
+        fast_boot()
+
+
+def when_ready(server):
+    """
+    Avant le premier fork : préchauffe l'application préchargée puis ferme les
+    connexions du master. Journalise la durée totale du démarrage.
+    """
+    from jo_backend.startup import log, since_container_start_ms
+
+    if preload_app:
+        from jo_backend.warmup import close_db_connections, warm_up
+
+        warm_up(label="master")
+        close_db_connections()
+
+    elapsed = since_container_start_ms()
+    if elapsed is not None:
+        log(f"⏱ boot phase=total ms={elapsed:.0f}")
+
+
+def child_exit(server, worker):
+    """Retire les jauges « live » d'un worker terminé (les compteurs sont conservés)."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    """Le worker ne doit réutiliser aucune connexion héritée du master."""
+    if preload_app:
+        from jo_backend.warmup import close_db_connections
+
+        close_db_connections()
+
+
+def post_worker_init(worker):
+    """
+    Préchauffe le worker (durée journalisée) ; `kill -USR2 <pid>` écrit son
+    rapport mémoire ; tracemalloc si demandé. En gthread, la file d'attente du
+    worker alimente le délestage (attente et requêtes en file, monitoring/shedding.py).
+    """
+    from jo_backend.warmup import warm_up
+    from monitoring import memory
+    from monitoring.shedding import worker_queue
+
+    warm_up()
+
+    worker_queue.install(worker)
+
+    memory.install_signal_handler()
+    if tracemalloc_frames:
+        memory.start_tracing(tracemalloc_frames)
+    worker.rss_checks = 0
+
+
+def post_request(worker, req, environ, resp):
+    """Recycle le worker (après cette requête) si sa mémoire résidente dépasse le seuil."""
+    worker.rss_checks = getattr(worker, "rss_checks", 0) + 1
+    if worker.rss_checks % rss_check_every:
+        return
+    from monitoring import memory
+
+    if memory.over_threshold(max_rss_mb):
+        worker.log.warning("Worker %s : RSS au-delà de %.0f Mo, recyclage.", worker.pid, max_rss_mb)
+        worker.alive = False
@@ -0,0 +1,57 @@
+"""
+Fichier : async_api.py
+Description : Outils communs aux vues asynchrones servies en mode ASGI
+              (workers uvicorn sous gunicorn). Ces vues n'utilisent pas la
+              pile synchrone de DRF : l'authentification JWT, la lecture du
+              corps JSON et le rendu de la réponse sont faits ici.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+
+async def authenticate_jwt(request):
+    """
+    Authentifie la requête via l'en-tête `Authorization: Bearer <token>`.
+    La validation du token ne touche pas la base ; seul le chargement de
+    l'utilisateur est délégué au thread ORM. Retourne `None` si anonyme.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header is None:
+        return None
+    raw_token = auth.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        validated = auth.get_validated_token(raw_token)
+        return await sync_to_async(auth.get_user)(validated)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def json_body(request) -> dict:
+    """Décode le corps JSON de la requête ; retourne un dict vide s'il est invalide."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def api_response(data, status: int = 200) -> JsonResponse:
+    """Réponse JSON rendue avec l'encodeur de DRF (mêmes formats de dates que les vues sync)."""
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+def unauthorized() -> JsonResponse:
+    """Réponse équivalente à celle de DRF pour une requête non authentifiée."""
+    response = api_response(
+        {"detail": "Informations d'authentification non fournies."}, status=401
+    )
+    response["WWW-Authenticate"] = 'Bearer realm="api"'
+    return response
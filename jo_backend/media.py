@@ -0,0 +1,57 @@
+"""
+Fichier : media.py
+Description : Diffusion des fichiers media (QR codes des billets, images des offres).
+              Selon `settings.MEDIA_DELIVERY`, le fichier est soit servi par
+              l'application (développement), soit délégué au serveur frontal
+              (X-Accel-Redirect pour nginx, X-Sendfile) afin de ne plus occuper
+              un worker pendant l'envoi. Les en-têtes de cache sont posés ici.
+"""
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+# Nom adressé par contenu : "<nom>_<empreinte hexadécimale ≥ 12>.<ext>".
+CONTENT_ADDRESSED_NAME = re.compile(r"_[0-9a-f]{12,}\.[A-Za-z0-9]+$")
+
+
+def is_content_addressed(path: str) -> bool:
+    """Indique si le nom du fichier contient une empreinte de son contenu."""
+    return bool(CONTENT_ADDRESSED_NAME.search(path))
+
+
+def apply_cache_headers(response, path: str):
+    """Cache long et `immutable` pour les noms adressés par contenu, court sinon."""
+    if is_content_addressed(path):
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_DEFAULT_MAX_AGE)
+    return response
+
+
+def serve_media(request, path: str):
+    """Sert (ou délègue l'envoi de) un fichier situé sous MEDIA_ROOT."""
+    try:
+        full_path = safe_join(str(settings.MEDIA_ROOT), path)
+    except SuspiciousFileOperation:
+        raise Http404("Chemin invalide.")
+
+    mode = settings.MEDIA_DELIVERY
+    if mode in ("x-accel", "sendfile"):
+        content_type, _ = mimetypes.guess_type(path)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        if mode == "x-accel":
+            # nginx sert lui-même le fichier depuis une location `internal`.
+            response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(path)
+        else:
+            response["X-Sendfile"] = full_path
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    return apply_cache_headers(response, path)
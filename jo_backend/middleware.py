@@ -0,0 +1,89 @@
+"""
+Fichier : middleware.py (projet 'jo_backend')
+Description : Variantes des middlewares Django qui ne s'exécutent pas sur l'API.
+
+              L'API REST s'authentifie uniquement par JWT : sessions, CSRF,
+              utilisateur de session, messages et X-Frame-Options n'y servent
+              à rien. Ces sous-classes laissent passer les requêtes dont le
+              chemin commence par un préfixe de `settings.API_PATH_PREFIXES`
+              et gardent le comportement d'origine ailleurs (admin, médias).
+              Étant des sous-classes, elles satisfont les vérifications
+              système de l'admin (admin.E408 à E410).
+
+              `AsyncWhiteNoiseMiddleware` rend WhiteNoise (synchrone seulement)
+              utilisable dans une pile ASGI sans repasser par le thread unique
+              de `sync_to_async` : seul l'envoi d'un fichier statique quitte la
+              boucle d'événements.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+def is_api_request(request) -> bool:
+    return request.path_info.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+class SkipForApiMixin:
+    """Court-circuite le middleware (requête, vue et réponse) pour les chemins de l'API."""
+
+    def __call__(self, request):
+        if is_api_request(request):
+            # En pile asynchrone, get_response retourne une coroutine, attendue par l'appelant.
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class ApiSkipSessionMiddleware(SkipForApiMixin, SessionMiddleware):
+    pass
+
+
+class ApiSkipCsrfViewMiddleware(SkipForApiMixin, CsrfViewMiddleware):
+    # `process_view` est appelé par le handler, hors de `__call__` : à court-circuiter aussi.
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if is_api_request(request):
+            return None
+        return super().process_view(request, view_func, view_args, view_kwargs)
+
+
+class ApiSkipAuthenticationMiddleware(SkipForApiMixin, AuthenticationMiddleware):
+    pass
+
+
+class ApiSkipMessageMiddleware(SkipForApiMixin, MessageMiddleware):
+    pass
+
+
+class ApiSkipXFrameOptionsMiddleware(SkipForApiMixin, XFrameOptionsMiddleware):
+    pass
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise compatible avec les piles WSGI et ASGI."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,54 @@
+"""
+Fichier : pagination.py (projet 'jo_backend')
+Description : Pagination de l'admin pour les tables volumineuses.
+
+              Le paginateur standard exécute un `SELECT COUNT(*)` complet à
+              chaque affichage d'une liste : sur des millions de réservations
+              ou de billets, c'est un parcours de table entier.
+              `EstimatedCountPaginator` :
+                - liste non filtrée : lit l'estimation du moteur (statistiques
+                  de la table MySQL ou PostgreSQL), sans parcours ;
+                - liste filtrée ou recherche : compte au plus
+                  `ADMIN_EXACT_COUNT_LIMIT` lignes (sous-requête bornée).
+              En dessous de ce seuil, le décompte reste exact.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+ESTIMATE_SQL = {
+    "mysql": (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    ),
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+}
+
+
+def estimated_row_count(model, using: str = "default") -> int | None:
+    """Nombre de lignes estimé par le moteur ; None si indisponible (SQLite, statistiques absentes)."""
+    connection = connections[using]
+    sql = ESTIMATE_SQL.get(connection.vendor)
+    if sql is None:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginateur dont le décompte ne parcourt jamais toute la table."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return queryset.order_by().values("pk")[:limit].count()
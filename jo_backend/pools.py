@@ -0,0 +1,92 @@
+"""
+Fichier : pools.py (projet 'jo_backend')
+Description : Pools de workers dédiés par classe de trafic.
+
+              Par défaut (JO_POOL=web), un seul pool sert toutes les routes.
+              En déploiement par pools (fly.pools.toml), chaque groupe de
+              machines lance gunicorn avec JO_POOL=<pool> :
+                - "verify" : vérification des billets aux portes (scanners),
+                  URLconf et pile de middlewares minimales, capacité réservée ;
+                - "shop"   : catalogue, comptes, commande, billets et médias ;
+                - "admin"  : administration Django et outils de diagnostic.
+
+              Une route absente de l'URLconf d'un pool y répond 404 : une
+              exportation de l'admin ou une rafale de médias ne peut pas
+              occuper les workers de la vérification.
+
+              Ce module est lu par settings.py (URLconf, middlewares) et par
+              gunicorn.conf.py (port, dimensionnement) : il ne doit pas importer
+              Django. Le dimensionnement est surchargeable par pool
+              (POOL_VERIFY_WORKERS, POOL_VERIFY_THREADS...).
+"""
+import os
+
+# Pile réduite du pool "verify" : ni sessions, ni CSRF, ni messages, ni statiques.
+# L'authentification des scanners passe par DRF (JWT) ou la vue est publique.
+VERIFY_MIDDLEWARE = [
+    "monitoring.middleware.ServerTimingMiddleware",
+    "monitoring.middleware.ProfilerMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+POOLS = {
+    "web": {
+        "urlconf": "jo_backend.urls",
+        "port": 8080,
+        "middleware": None,  # pile par défaut de settings.py
+        "workers": None,     # dimensionnement par défaut de gunicorn.conf.py
+        "threads": None,
+        "timeout": None,
+        "warmup": None,      # toutes les étapes de warmup.py, dont "catalog"
+    },
+    "verify": {
+        "urlconf": "jo_backend.urls_verify",
+        "port": 8081,
+        "middleware": VERIFY_MIDDLEWARE,
+        "workers": 2,
+        "threads": 8,
+        "timeout": 10,
+        "warmup": ["url_resolver", "signing", "orm"],
+    },
+    "shop": {
+        "urlconf": "jo_backend.urls_shop",
+        "port": 8082,
+        "middleware": None,
+        "workers": None,
+        "threads": None,
+        "timeout": None,
+        "warmup": None,      # toutes les étapes, dont "catalog" (recherche d'offres)
+    },
+    "admin": {
+        "urlconf": "jo_backend.urls_admin",
+        "port": 8083,
+        "middleware": None,
+        "workers": 1,
+        "threads": 4,
+        "timeout": 300,  # exports et impressions de l'admin
+        "warmup": ["url_resolver", "password_validators", "orm"],
+    },
+}
+
+# Vérifications système de l'admin à ignorer dans un pool sans sessions ni messages
+# (l'admin n'y est pas routé).
+SLIM_SILENCED_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
+
+def current_pool_name() -> str:
+    return os.getenv("JO_POOL", "web").lower()
+
+
+def pool_config(name: str | None = None) -> dict:
+    """Configuration du pool, avec les surcharges POOL_<NOM>_WORKERS/THREADS/TIMEOUT."""
+    name = name or current_pool_name()
+    if name not in POOLS:
+        raise ValueError(f"JO_POOL inconnu : {name!r} (choix : {', '.join(POOLS)})")
+    cfg = {"name": name, **POOLS[name]}
+    for key in ("workers", "threads", "timeout"):
+        raw = os.getenv(f"POOL_{name.upper()}_{key.upper()}")
+        if raw:
+            cfg[key] = int(raw)
+    return cfg
@@ -9,7 +9,7 @@ Description : Fichier de configuration principal du projet Django.
 from pathlib import Path
 import os
 from datetime import timedelta
-from dotenv import load_dotenv
+import importlib.util
 import urllib.parse
 
 def env_list(name: str, default=""):
@@ -31,10 +31,12 @@ env_file_map = {
     "production": BASE_DIR / ".env.production",
 }
 env_file = env_file_map.get(DJANGO_ENV)
-if env_file and env_file.exists():
+if not (env_file and env_file.exists()):
+    env_file = BASE_DIR / ".env"
+# python-dotenv n'est importé que si un fichier est présent (absent des conteneurs).
+if env_file.exists():
+    from dotenv import load_dotenv
     load_dotenv(env_file)
-else:
-    load_dotenv(BASE_DIR / ".env")
 
 # --- Utilitaire pour dériver les noms d'hôtes depuis les URLs CORS ---
 def _hosts_from_urls(urls: list[str]) -> list[str]:
@@ -75,7 +77,6 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "django_extensions",
 
     # Tiers
     "rest_framework",
@@ -85,22 +86,182 @@ INSTALLED_APPS = [
     "accounts",
     "orders",
     "offers.apps.OffersConfig",
+    "benchmarks",
+    "monitoring",
+    "analytics",
 ]
 
+# Outils de développement (shell_plus, runserver_plus...) : chargés seulement en
+# DEBUG ou sur demande (DJANGO_EXTENSIONS=True), et s'ils sont installés.
+if os.getenv("DJANGO_EXTENSIONS", str(DEBUG)).lower() in ("1", "true", "yes") \
+        and importlib.util.find_spec("django_extensions"):
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("rest_framework"), "django_extensions")
+
 MIDDLEWARE = [
+    # En premier : mesure la durée de toute la pile (middlewares compris).
+    "monitoring.middleware.ServerTimingMiddleware",
+    # Profilage à la demande (inactif tant qu'il n'est pas armé par le staff).
+    "monitoring.middleware.ProfilerMiddleware",
+    # Délestage des routes peu prioritaires quand le worker est saturé.
+    "monitoring.middleware.LoadSheddingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # WhiteNoise, utilisable en ASGI sans sérialiser les requêtes (voir middleware.py).
+    "jo_backend.middleware.AsyncWhiteNoiseMiddleware",
+    # Sessions, CSRF, utilisateur de session, messages et X-Frame-Options : ignorés
+    # sur l'API (JWT uniquement, voir API_PATH_PREFIXES), actifs pour l'admin.
+    "jo_backend.middleware.ApiSkipSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "jo_backend.middleware.ApiSkipCsrfViewMiddleware",
+    "jo_backend.middleware.ApiSkipAuthenticationMiddleware",
+    "jo_backend.middleware.ApiSkipMessageMiddleware",
+    "jo_backend.middleware.ApiSkipXFrameOptionsMiddleware",
 ]
 
+# Préfixes des routes de l'API REST (authentification JWT seule).
+API_PATH_PREFIXES = ("/api/",)
+
 ROOT_URLCONF = "jo_backend.urls"
 
+# --- Pool de workers (JO_POOL, voir pools.py) ---
+# "web" (défaut) sert toutes les routes ; "verify", "shop" et "admin" n'en servent
+# qu'une partie, avec leur propre URLconf et, pour "verify", une pile réduite.
+from .pools import SLIM_SILENCED_CHECKS, pool_config
+JO_POOL = pool_config()
+ROOT_URLCONF = JO_POOL["urlconf"]
+if JO_POOL["middleware"] is not None:
+    MIDDLEWARE = list(JO_POOL["middleware"])
+    SILENCED_SYSTEM_CHECKS = SLIM_SILENCED_CHECKS
+else:
+    # `check --deploy` ne reconnaît que les classes d'origine de Django : les sous-classes
+    # ApiSkipCsrfViewMiddleware et ApiSkipXFrameOptionsMiddleware (jo_backend/middleware.py)
+    # assurent la protection CSRF (W003) et X-Frame-Options (W002) hors de l'API.
+    SILENCED_SYSTEM_CHECKS = ["security.W002", "security.W003"]
+
+# --- Mesure des temps par requête (en-tête Server-Timing + logs JSON) ---
+SERVER_TIMING = {
+    "ENABLED": os.getenv("SERVER_TIMING_ENABLED", "True").lower() in ("1", "true", "yes"),
+    # Part des réponses portant l'en-tête Server-Timing (0.0 à 1.0). L'en-tête révèle
+    # les temps SQL et le nombre de requêtes : aucune réponse publique hors DEBUG.
+    "HEADER_SAMPLE_RATE": float(os.getenv("SERVER_TIMING_HEADER_RATE", "1.0" if DEBUG else "0")),
+    # Le staff authentifié reçoit toujours l'en-tête (diagnostic en production).
+    "HEADER_FOR_STAFF": os.getenv("SERVER_TIMING_HEADER_FOR_STAFF", "True").lower() in ("1", "true", "yes"),
+    # Part des requêtes journalisées en JSON ; les requêtes lentes le sont toujours.
+    "LOG_SAMPLE_RATE": float(os.getenv("SERVER_TIMING_LOG_RATE", "0.01")),
+    "SLOW_REQUEST_MS": float(os.getenv("SERVER_TIMING_SLOW_MS", "1000")),
+}
+
+# --- Délestage adaptatif (monitoring.middleware.LoadSheddingMiddleware) ---
+# Au-delà du seuil de saturation de sa priorité, une route reçoit 503 + Retry-After.
+# Saturation = part des threads du worker occupés, ou attente (QUEUE_HEADER) rapportée
+# à QUEUE_TARGET_MS. Les routes "critical" (paiement, vérification) ne sont jamais rejetées.
+LOAD_SHEDDING = {
+    "ENABLED": os.getenv("LOAD_SHEDDING_ENABLED", "True").lower() in ("1", "true", "yes"),
+    # Requêtes simultanées d'un worker : ses threads, par défaut.
+    "CAPACITY": int(os.getenv("LOAD_SHEDDING_CAPACITY")
+                    or JO_POOL["threads"] or os.getenv("GUNICORN_THREADS", "2")),
+    "QUEUE_HEADER": "HTTP_" + os.getenv("LOAD_SHEDDING_QUEUE_HEADER", "X-Request-Start").upper().replace("-", "_"),
+    "QUEUE_TARGET_MS": float(os.getenv("LOAD_SHEDDING_QUEUE_TARGET_MS", "500")),
+    "RETRY_AFTER": int(os.getenv("LOAD_SHEDDING_RETRY_AFTER", "5")),
+    "THRESHOLDS": {"low": 0.75, "normal": 1.0, "critical": None},
+    "DEFAULT_PRIORITY": "normal",
+    # Premier motif correspondant au nom de route (fnmatch).
+    "ROUTE_PRIORITIES": {
+        "orders:checkout": "critical",
+        "orders:verify_ticket": "critical",
+        "health*": "critical",
+        "metrics": "critical",
+        "offers:*": "low",
+        "orders:my_tickets": "low",
+        "orders:wallet*": "low",
+        "orders:ticket_pdf": "low",
+        "admin:*": "low",
+        "analytics:*": "low",
+        "media": "low",
+        # Lecture du cache seulement : ne pas faire perdre sa place à un client en file.
+        "orders:waiting_room_*": "critical",
+    },
+}
+
+# --- Cache ---
+# Partagé entre workers et machines dès que REDIS_URL est défini (salle d'attente,
+# contrôles de santé) ; sinon cache mémoire local, suffisant pour un seul processus.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+
+# --- Salle d'attente des ouvertures de ventes ---
+# ADMIT_PER_SECOND : réservations admises par seconde, à régler sur le débit mesuré
+# par `bench_onsale` (étape "reserve") pour l'ensemble des workers. Ouverture et
+# débit sont aussi réglables à chaud par le staff (POST /api/waiting-room).
+WAITING_ROOM = {
+    "ENABLED": os.getenv("WAITING_ROOM_ENABLED", "False").lower() in ("1", "true", "yes"),
+    "ADMIT_PER_SECOND": int(os.getenv("WAITING_ROOM_ADMIT_PER_SECOND", "20")),
+    "ADMISSION_TTL": int(os.getenv("WAITING_ROOM_ADMISSION_TTL", "600")),
+    "TICKET_MAX_AGE": int(os.getenv("WAITING_ROOM_TICKET_MAX_AGE", "7200")),
+    "POLL_INTERVAL_S": int(os.getenv("WAITING_ROOM_POLL_INTERVAL", "5")),
+    "MAX_CATCH_UP_S": 10,
+    # Cache mémoire local admis seulement avec un unique processus (développement, tests).
+    "ALLOW_LOCAL_CACHE": os.getenv("WAITING_ROOM_ALLOW_LOCAL_CACHE", "False").lower() in ("1", "true", "yes"),
+}
+if WAITING_ROOM["ENABLED"] and not os.getenv("REDIS_URL") and not WAITING_ROOM["ALLOW_LOCAL_CACHE"]:
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured("WAITING_ROOM_ENABLED exige un cache partagé entre workers (REDIS_URL).")
+
+# --- Métriques Prometheus (/metrics) ---
+# Le scraper envoie `Authorization: Bearer <jeton>`. Sans jeton, /metrics n'est servi
+# qu'en DEBUG : routes, volumes et erreurs ne sont pas publics.
+# L'agrégation entre workers gunicorn passe par PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --- Sonde de disponibilité (/api/health/ready) ---
+# Durée de mise en cache du résultat des contrôles, en secondes.
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+
+# --- Recherche dans le catalogue ---
+# Âge maximal (s) de l'index en mémoire des offres (offers/search.py), pour les
+# modifications faites sans signal ; les signaux l'invalident immédiatement.
+OFFER_SEARCH_MAX_AGE = float(os.getenv("OFFER_SEARCH_MAX_AGE", "300"))
+
+# --- Agrégats de ventes (analytics) ---
+# LAG_S : les lignes plus récentes sont intégrées au passage suivant (transactions en cours).
+ANALYTICS_ROLLUP = {
+    "BATCH_SIZE": int(os.getenv("ANALYTICS_ROLLUP_BATCH_SIZE", "5000")),
+    "LAG_S": int(os.getenv("ANALYTICS_ROLLUP_LAG_S", "60")),
+}
+
+# Lignes lues par lot pour les exports en flux (analytics/exports.py).
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+# --- Administration ---
+# Au-delà de ce nombre de lignes, les listes de l'admin affichent un décompte
+# estimé (liste complète) ou borné (recherche, filtres) : jo_backend/pagination.py.
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", "10000"))
+
+# --- Profilage à la demande ---
+# Dossier partagé par les workers : état armé et profils (.folded / .prof).
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/jo_profiles")
+# Nombre de profils conservés : les plus anciens sont supprimés à chaque nouveau profil.
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# --- Logs ---
+# Les lignes de mesure sont déjà du JSON : elles sont écrites telles quelles sur stdout.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"raw": {"format": "%(message)s"}},
+    "handlers": {"timing": {"class": "logging.StreamHandler", "formatter": "raw"}},
+    "loggers": {
+        "jo_backend.timing": {"handlers": ["timing"], "level": "INFO", "propagate": False},
+        "jo_backend.memory": {"handlers": ["timing"], "level": "INFO", "propagate": False},
+    },
+}
+
 # --- Templates ---
 
 TEMPLATES = [
@@ -122,6 +283,15 @@ TEMPLATES = [
 WSGI_APPLICATION = "jo_backend.wsgi.application"
 ASGI_APPLICATION = "jo_backend.asgi.application"
 
+# --- Mode de service ---
+# "wsgi" : gunicorn + threads synchrones (défaut).
+# "asgi" : gunicorn + workers uvicorn ; les vues de lecture les plus sollicitées
+#          (offres, vérification, mes billets) sont alors servies en asynchrone.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+ASYNC_API_VIEWS = os.getenv(
+    "ASYNC_API_VIEWS", "True" if SERVER_MODE == "asgi" else "False"
+).lower() in ("1", "true", "yes")
+
 # --- Base de données ---
 # La configuration est entièrement lue depuis les variables d'environnement.
 DATABASES = {
@@ -139,6 +309,17 @@ DATABASES = {
     }
 }
 
+# Réplique en lecture facultative, utilisée par les tableaux de bord (analytics) pour
+# ne pas charger la base principale pendant les ventes.
+if os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+ANALYTICS_DATABASE = "replica" if "replica" in DATABASES else "default"
+
 # --- Modèle Utilisateur Personnalisé ---
 AUTH_USER_MODEL = "accounts.User"
 
@@ -168,11 +349,60 @@ STATICFILES_DIRS = [
 ]
 
 STATIC_ROOT = Path(BASE_DIR) / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
-MEDIA_URL = "/media/"
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
 MEDIA_ROOT = BASE_DIR / "media"
 
+# --- Diffusion des médias (QR codes des billets, images des offres) ---
+# Stockage des médias : disque local ("local") ou stockage objet compatible S3 ("s3",
+# ex: Tigris sur Fly.io, MinIO en local). Le backend S3 nécessite django-storages.
+MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "local").lower()
+
+# MEDIA_DELIVERY :
+#  - "django"   : fichiers servis par l'application (développement, défaut en local) ;
+#  - "x-accel"  : l'application ne fait que valider le chemin et délègue l'envoi
+#                 à nginx via l'en-tête X-Accel-Redirect ;
+#  - "sendfile" : idem via X-Sendfile (Apache / lighttpd) ;
+#  - "external" : aucune route /media/ ; les URLs pointent vers le stockage
+#                 objet ou le CDN (défaut, et seul mode possible, avec MEDIA_STORAGE=s3).
+# "x-accel" et "sendfile" exigent un serveur frontal devant gunicorn (exemple nginx
+# dans le README) : le proxy de Fly.io ne l'est pas, il faut y utiliser S3.
+MEDIA_DELIVERY = os.getenv("MEDIA_DELIVERY", "external" if MEDIA_STORAGE == "s3" else "django").lower()
+if MEDIA_STORAGE == "s3" and MEDIA_DELIVERY != "external":
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured(
+        "MEDIA_STORAGE=s3 : les fichiers ne sont pas sur le disque, MEDIA_DELIVERY doit être \"external\"."
+    )
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+# Les noms adressés par contenu (ex: tickets/ticket_12_3fa9c1d2e4b5.png) ne changent
+# jamais de contenu : ils sont servis avec un cache long et `immutable`.
+MEDIA_IMMUTABLE_MAX_AGE = int(os.getenv("MEDIA_IMMUTABLE_MAX_AGE", str(365 * 24 * 3600)))
+MEDIA_DEFAULT_MAX_AGE = int(os.getenv("MEDIA_DEFAULT_MAX_AGE", "3600"))
+
+if MEDIA_STORAGE == "s3":
+    _media_storage = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": os.getenv("AWS_STORAGE_BUCKET_NAME", ""),
+            "endpoint_url": os.getenv("AWS_S3_ENDPOINT_URL") or None,
+            "custom_domain": os.getenv("AWS_S3_CUSTOM_DOMAIN") or None,
+            "querystring_auth": False,
+            # Jamais d'écrasement : un nom publié désigne toujours le même contenu.
+            "file_overwrite": False,
+            "object_parameters": {
+                "CacheControl": f"public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable",
+            },
+        },
+    }
+else:
+    _media_storage = {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+
+STORAGES = {
+    "default": _media_storage,
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # --- CORS ---
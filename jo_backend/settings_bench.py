@@ -0,0 +1,24 @@
+"""
+Fichier : settings_bench.py
+Description : Configuration des bancs d'essai locaux (commande `bench_onsale`).
+              Base SQLite sur fichier, partagée entre les threads des
+              utilisateurs virtuels. Pour mesurer sur MariaDB/MySQL, utiliser
+              les settings habituels avec les variables DB_*.
+"""
+from .settings import *  # noqa
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("BENCH_DB_PATH", str(BASE_DIR / "bench.sqlite3")),
+        # Attente du verrou d'écriture plutôt qu'une erreur immédiate sous concurrence.
+        "OPTIONS": {"timeout": 30},
+    }
+}
+
+MEDIA_ROOT = Path(os.getenv("BENCH_MEDIA_ROOT", str(BASE_DIR / "bench_media")))
+STORAGES = {
+    **STORAGES,
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
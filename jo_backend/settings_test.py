@@ -8,3 +8,14 @@ DATABASES = {
 }
 
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+# Pas de manifeste collectstatic pendant les tests.
+STORAGES = {
+    **STORAGES,
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+MEDIA_DELIVERY = "django"
+
+# Un seul processus de test : la salle d'attente peut s'appuyer sur le cache local.
+WAITING_ROOM = {**WAITING_ROOM, "ALLOW_LOCAL_CACHE": True}
@@ -0,0 +1,94 @@
+"""
+Fichier : startup.py (projet 'jo_backend')
+Description : Étapes de démarrage rapide d'une instance (STARTUP_MODE=fast),
+              appelées depuis les hooks de gunicorn.conf.py.
+
+              Les fichiers statiques sont collectés à la construction de l'image
+              et les migrations appliquées par la `release_command` de Fly : au
+              démarrage, on vérifie seulement que le schéma est à jour (une
+              requête sur `django_migrations`). Chaque phase est chronométrée
+              et journalisée (`⏱ boot phase=… ms=…`), comme dans start.sh.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+@contextmanager
+def phase(name: str):
+    """Chronomètre une phase de démarrage et l'écrit dans les logs."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        log(f"⏱ boot phase={name} ms={(time.perf_counter() - start) * 1000:.0f}")
+
+
+def since_container_start_ms() -> float | None:
+    """Durée écoulée depuis le lancement de start.sh (STARTUP_T0, en ms epoch)."""
+    t0 = os.getenv("STARTUP_T0", "")
+    return time.time() * 1000 - int(t0) if t0.isdigit() else None
+
+
+def pending_migrations() -> list[str]:
+    """Migrations non appliquées, comme `migrate --check`, sans lancer de processus."""
+    from django.db import DEFAULT_DB_ALIAS, connections
+    from django.db.migrations.executor import MigrationExecutor
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    try:
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    finally:
+        # Le master ne doit pas transmettre de connexion ouverte aux workers.
+        connection.close()
+    return [f"{migration.app_label}.{migration.name}" for migration, _backwards in plan]
+
+
+def wait_for_database(timeout: float):
+    """Attend que la base accepte une connexion (reprises courtes, `timeout` secondes max)."""
+    from django.db import connection
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection.ensure_connection()
+            return
+        except Exception:
+            connection.close()
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.25)
+
+
+def fast_boot():
+    """
+    Démarrage rapide : charge Django une fois dans le master (hérité par les
+    workers), attend la base puis vérifie que les migrations sont appliquées.
+    Avec preload_app, Django est déjà chargé : la phase `django_setup` n'est
+    pas journalisée (gunicorn.conf.py chronomètre alors `app_load`).
+    Selon STARTUP_PENDING_MIGRATIONS, une migration manquante arrête le
+    démarrage ("fail", défaut) ou est seulement signalée ("warn").
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jo_backend.settings")
+    from django.apps import apps
+
+    if not apps.ready:
+        with phase("django_setup"):
+            import django
+            django.setup()
+
+    with phase("db_wait"):
+        wait_for_database(float(os.getenv("STARTUP_DB_WAIT", "30")))
+
+    with phase("migrations_check"):
+        pending = pending_migrations()
+    if pending:
+        log(f"⚠️ Migrations non appliquées : {', '.join(pending)}")
+        if os.getenv("STARTUP_PENDING_MIGRATIONS", "fail").lower() == "fail":
+            raise SystemExit("Schéma en retard : lancer `python manage.py migrate` (release_command).")
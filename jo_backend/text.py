@@ -0,0 +1,29 @@
+"""
+Fichier : text.py (projet 'jo_backend')
+Description : Normalisation des textes saisis pour les colonnes de recherche.
+
+              La même fonction sert à l'enregistrement (colonnes `*_norm`
+              indexées) et à la recherche : minuscules, accents retirés,
+              ponctuation des noms remplacée par des espaces. Une recherche
+              par préfixe sur ces colonnes utilise l'index B-tree, là où
+              `icontains` parcourt toute la table.
+"""
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def strip_accents(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_text(value: str | None) -> str:
+    """« Élodie  D'Arc-Müller » → « elodie d arc muller »."""
+    return _NON_ALNUM.sub(" ", strip_accents(value or "").lower()).strip()
+
+
+def normalize_email(value: str | None) -> str:
+    """Adresse e-mail sans espaces ni majuscules (les points et `+` sont conservés)."""
+    return strip_accents(value or "").strip().lower()
@@ -3,6 +3,10 @@ Fichier : urls.py (projet 'jo_backend')
 Description : Fichier de configuration principal des URL pour l'ensemble du projet.
               Il agit comme un routeur qui délègue les requêtes API aux
               applications concernées (accounts, orders, offers).
+
+              Les routes sont regroupées par classe de trafic ; les pools de
+              workers dédiés (voir pools.py) assemblent les groupes qui les
+              concernent (urls_shop.py, urls_admin.py, urls_verify.py).
 """
 from django.contrib import admin
 from django.urls import path, include
@@ -11,27 +15,26 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
     TokenVerifyView,
 )
-from django.http import JsonResponse
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import re_path
-from django.views.static import serve
-
-
-def health(_request):
-    """
-    Vue simple pour vérifier l'état de santé de l'API.
-    Utile pour les services de monitoring.
-    """
-    return JsonResponse({"status": "ok", "service": "jo_backend", "version": "0.1.0"}, status=200)
+from .media import serve_media
+from monitoring.metrics import metrics_view
+from monitoring.views import liveness, readiness
 
-# Liste des routes principales du projet.
-urlpatterns = [
-     # Route pour l'interface d'administration de Django.
-    path("admin/", admin.site.urls),
+# Santé et métriques : servies par tous les pools.
+health_patterns = [
     # Route pour le "health check" de l'API.
-    path("api/health", health, name="health"),   
-    path("api/health/", health, name="health_s"),
+    path("api/health", liveness, name="health"),   
+    path("api/health/", liveness, name="health_s"),
+    # Vivacité (processus en vie) et disponibilité (dépendances joignables).
+    path("api/health/live", liveness, name="health_live"),
+    path("api/health/ready", readiness, name="health_ready"),
+    # Métriques Prometheus (latences par route, requêtes SQL, QR, vérifications).
+    path("metrics", metrics_view, name="metrics"),
+]
+
+# API publique : comptes, commande, billets et catalogue.
+api_patterns = [
     # Délègue toutes les URL commençant par /api/accounts/
     # à l'application 'accounts'.
     path("api/accounts/", include("accounts.urls")),
@@ -39,7 +42,6 @@ urlpatterns = [
     # 'orders' et 'offers'.
     path("api/", include("orders.urls")),
     path("api/", include("offers.urls")),
-    re_path(r"^media/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT}),
 
     # JWT (SimpleJWT)
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
@@ -47,8 +49,23 @@ urlpatterns = [
     path("api/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
 ]
 
-# Ajoute les routes pour servir les fichiers media (images uploadées)
-# uniquement en mode DÉVELOPPEMENT.
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Back-office : administration Django et outils de diagnostic réservés au staff.
+admin_patterns = [
+     # Route pour l'interface d'administration de Django.
+    path("admin/", admin.site.urls),
+    # Outils de diagnostic réservés au staff (profileur, mémoire).
+    path("api/monitoring/", include("monitoring.urls")),
+    # Ventes agrégées (tables d'agrégats uniquement).
+    path("api/analytics/", include("analytics.urls")),
+]
+
+# Route des fichiers media, sauf s'ils sont diffusés par un stockage externe (S3/CDN).
+# En mode "x-accel"/"sendfile", la vue ne fait que déléguer l'envoi au serveur frontal.
+media_patterns = []
+if settings.MEDIA_DELIVERY != "external":
+    media_patterns += [
+        re_path(r"^%s(?P<path>.*)$" % settings.MEDIA_URL.lstrip("/"), serve_media, name="media"),
+    ]
 
+# Liste des routes principales du projet (pool unique "web").
+urlpatterns = admin_patterns + health_patterns + api_patterns + media_patterns
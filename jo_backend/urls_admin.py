@@ -0,0 +1,8 @@
+"""
+Fichier : urls_admin.py (projet 'jo_backend')
+Description : URLconf du pool "admin" (JO_POOL=admin) : administration Django,
+              outils de diagnostic du staff et médias (aperçus de l'admin).
+"""
+from .urls import admin_patterns, health_patterns, media_patterns
+
+urlpatterns = admin_patterns + health_patterns + media_patterns
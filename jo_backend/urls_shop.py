@@ -0,0 +1,8 @@
+"""
+Fichier : urls_shop.py (projet 'jo_backend')
+Description : URLconf du pool "shop" (JO_POOL=shop) : catalogue, comptes,
+              commande, billets et médias. Ni administration, ni diagnostic.
+"""
+from .urls import api_patterns, health_patterns, media_patterns
+
+urlpatterns = health_patterns + api_patterns + media_patterns
@@ -0,0 +1,18 @@
+"""
+Fichier : urls_verify.py (projet 'jo_backend')
+Description : URLconf du pool "verify" (JO_POOL=verify) : uniquement la
+              vérification des billets par les scanners, la santé et les
+              métriques. Le nom de route `orders:verify_ticket` est conservé.
+"""
+from django.urls import include, path
+
+from orders.urls import verify_view
+from .urls import health_patterns
+
+verify_patterns = ([
+    path("verify", verify_view, name="verify_ticket"),
+], "orders")
+
+urlpatterns = health_patterns + [
+    path("api/", include(verify_patterns)),
+]
@@ -0,0 +1,137 @@
+"""
+Fichier : warmup.py (projet 'jo_backend')
+Description : Préchauffage de l'application avant sa première requête réelle.
+
+              Avec `preload_app`, gunicorn charge l'application dans le master
+              puis forke les workers : ce qui est préchauffé dans le master
+              (table de routage, champs des serializers, liste des mots de passe
+              courants, bibliothèques QR, index de recherche du catalogue) est
+              partagé en copie sur écriture.
+              Chaque worker relance ensuite le préchauffage (quasi gratuit s'il
+              hérite d'un master préchauffé) et journalise sa durée par étape.
+
+              Les étapes sont enregistrées avec le décorateur `@step` ; la liste
+              exécutée est réglable par WARMUP_STEPS (vide = toutes).
+"""
+import os
+import time
+
+from django.utils.module_loading import import_string
+
+from .startup import log
+
+STEPS: dict = {}
+
+# Serializers des endpoints les plus sollicités (construction des champs ModelSerializer).
+SERIALIZERS = (
+    "offers.api.OfferSerializer",
+    "orders.serializers.ReservationCreateSerializer",
+    "orders.serializers.ReservationDetailSerializer",
+    "orders.serializers.TicketDetailSerializer",
+    "accounts.serializers.RegisterSerializer",
+    "accounts.serializers.UserSerializer",
+)
+
+
+def step(name: str):
+    """Enregistre une étape de préchauffage."""
+    def decorator(fn):
+        STEPS[name] = fn
+        return fn
+    return decorator
+
+
+@step("url_resolver")
+def _url_resolver():
+    from django.urls import get_resolver, reverse
+
+    resolver = get_resolver()
+    resolver.resolve("/api/health")
+    reverse("health")  # peuple aussi la table de résolution inverse
+
+
+@step("serializers")
+def _serializers():
+    for path in SERIALIZERS:
+        serializer = import_string(path)()
+        serializer.fields
+
+
+@step("password_validators")
+def _password_validators():
+    from django.contrib.auth.password_validation import get_default_password_validators
+
+    # Mis en cache par Django : la liste des mots de passe courants est lue une seule fois.
+    get_default_password_validators()
+
+
+@step("signing")
+def _signing():
+    from django.core import signing
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    signing.loads(signing.dumps({"warmup": True}, salt="ticket"), salt="ticket")
+    JWTAuthentication().get_validated_token(str(AccessToken()))
+
+
+@step("orm")
+def _orm():
+    from offers.models import Offer
+    from orders.models import Ticket
+
+    # Compilation SQL seule : les requêtes ne sont pas exécutées.
+    str(Offer.objects.filter(is_active=True).order_by("sort_order", "name").query)
+    str(Ticket.objects.select_related("reservation").filter(user_id=0).query)
+
+
+@step("catalog")
+def _catalog():
+    from offers.search import get_index
+
+    # Seule étape qui lit la base : construit l'index de recherche des offres
+    # actives, pour que la première recherche ne paie pas sa construction.
+    get_index()
+
+
+@step("qr")
+def _qr():
+    # Rendu direct (hors orders.utils) pour ne pas fausser les métriques de rendu.
+    import io
+
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    qrcode.make("jo://ticket/warmup").save(io.BytesIO())
+    qrcode.make("jo://ticket/warmup", image_factory=SvgPathImage).to_string()
+
+
+def selected_steps() -> list[str]:
+    raw = os.getenv("WARMUP_STEPS", "")
+    names = [s.strip() for s in raw.split(",") if s.strip()]
+    return names or list(STEPS)
+
+
+def warm_up(names: list[str] | None = None, label: str = "worker") -> dict[str, float]:
+    """
+    Exécute les étapes demandées, journalise et retourne leur durée (ms).
+    Une étape en échec est signalée sans empêcher le démarrage.
+    """
+    timings: dict[str, float] = {}
+    for name in names if names is not None else selected_steps():
+        start = time.perf_counter()
+        try:
+            STEPS[name]()
+        except Exception as e:
+            log(f"⚠️ warmup step={name} échec : {type(e).__name__}: {e}")
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    detail = " ".join(f"{k}={v:.0f}" for k, v in timings.items())
+    log(f"⏱ warmup {label} pid={os.getpid()} ms={sum(timings.values()):.0f} {detail}")
+    return timings
+
+
+def close_db_connections():
+    """Ferme les connexions ouvertes, pour qu'aucun socket ne soit partagé entre processus."""
+    from django.db import connections
+
+    connections.close_all()
@@ -0,0 +1,19 @@
+"""
+Fichier : apps.py (application 'monitoring')
+Description : Fichier de configuration pour l'application Django 'monitoring'.
+              Elle regroupe l'instrumentation du service (mesure des temps
+              par requête, métriques, santé, outils de diagnostic).
+"""
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .timing import on_connection_created
+
+        connection_created.connect(on_connection_created, dispatch_uid="monitoring_timing")
@@ -0,0 +1,114 @@
+"""
+Fichier : health.py (application 'monitoring')
+Description : Contrôles de disponibilité (readiness) des dépendances du service :
+              aller-retour base de données, écriture dans le stockage des médias,
+              accès au cache et clé de signature des billets.
+
+              Chaque contrôle est chronométré. Le résultat global est mis en
+              cache dans le worker pendant HEALTH_CACHE_TTL secondes, pour que
+              les sondes fréquentes (Fly, Docker) ne chargent pas la base.
+
+              La sonde est publique : le message d'erreur d'un contrôle (qui
+              peut contenir un hôte, un chemin ou une URL) est journalisé et
+              n'est renvoyé qu'au staff ou en DEBUG (voir `public_view`).
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connection
+
+logger = logging.getLogger("jo_backend.health")
+
+_lock = threading.Lock()
+_cache = {"at": float("-inf"), "result": None}
+
+
+def check_database():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        # Connexion cassée : la fermer pour que le prochain essai se reconnecte.
+        connection.close()
+        raise
+
+
+def check_media():
+    if isinstance(default_storage, FileSystemStorage):
+        # Création et suppression d'un fichier temporaire dans le dossier des médias.
+        os.makedirs(default_storage.location, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=default_storage.location, prefix=".health-"):
+            pass
+    else:
+        # Stockage objet (S3) : un aller-retour en lecture, sans écriture facturée.
+        default_storage.exists(".health")
+
+
+def check_cache():
+    key, value = f"health:{uuid.uuid4().hex}", os.getpid()
+    cache.set(key, value, 10)
+    if cache.get(key) != value:
+        raise RuntimeError("valeur relue différente")
+    cache.delete(key)
+
+
+def check_signing():
+    token = signing.dumps({"health": True}, salt="ticket")
+    signing.loads(token, salt="ticket")
+
+
+CHECKS = {
+    "database": check_database,
+    "media": check_media,
+    "cache": check_cache,
+    "signing": check_signing,
+}
+
+
+def run_checks() -> dict:
+    """Exécute tous les contrôles et retourne l'état et la durée de chacun."""
+    results = {}
+    for name, check in CHECKS.items():
+        start = time.perf_counter()
+        try:
+            check()
+            entry = {"ok": True}
+        except Exception as e:
+            logger.warning("health check %s failed", name, exc_info=True)
+            entry = {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
+        entry["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        results[name] = entry
+    return {
+        "status": "ok" if all(r["ok"] for r in results.values()) else "fail",
+        "checks": results,
+    }
+
+
+def readiness() -> dict:
+    """Résultat des contrôles, recalculé au plus une fois par HEALTH_CACHE_TTL."""
+    ttl = float(getattr(settings, "HEALTH_CACHE_TTL", 5.0))
+    with _lock:
+        now = time.monotonic()
+        if _cache["result"] is None or now - _cache["at"] >= ttl:
+            _cache["result"], _cache["at"] = run_checks(), now
+        age = now - _cache["at"]
+    return {**_cache["result"], "cached": age > 0, "age_s": round(age, 2)}
+
+
+def public_view(result: dict) -> dict:
+    """Copie du résultat sans le message d'erreur des contrôles (seuls `ok` et `ms` restent)."""
+    checks = {name: {"ok": c["ok"], "ms": c["ms"]} for name, c in result["checks"].items()}
+    return {**result, "checks": checks}
+
+
+def reset():
+    _cache["result"] = None
@@ -0,0 +1,123 @@
+"""
+Fichier : profile_startup.py (application 'monitoring')
+Description : Mesure le coût d'import de chaque module au démarrage de Django.
+
+              Le démarrage est rejoué dans un interpréteur neuf lancé avec
+              `python -X importtime` ; la sortie est agrégée par module et par
+              paquet. `--forbid` fait échouer la commande si un module donné est
+              chargé (ex: vérifier que qrcode et Pillow restent différés).
+
+Exemple :
+    python manage.py profile_startup --top 20
+    python manage.py profile_startup --target setup --forbid qrcode,PIL
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Code exécuté dans l'interpréteur mesuré, selon la cible.
+TARGETS = {
+    # Chargement des settings et des applications (comme toute commande manage.py).
+    "setup": "import django; django.setup()",
+    # Worker WSGI prêt à servir : application, middlewares et table de routage.
+    "wsgi": (
+        "from django.core.wsgi import get_wsgi_application; get_wsgi_application(); "
+        "from django.urls import get_resolver; get_resolver().url_patterns"
+    ),
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Lignes `import time: self | cumulé | module` → liste de modules (durées en ms)."""
+    modules = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m:
+            modules.append({
+                "module": m.group(4),
+                "self_ms": int(m.group(1)) / 1000,
+                "cumulative_ms": int(m.group(2)) / 1000,
+                "depth": (len(m.group(3)) - 1) // 2,
+            })
+    return modules
+
+
+def by_package(modules: list[dict]) -> dict[str, float]:
+    totals: dict[str, float] = defaultdict(float)
+    for m in modules:
+        totals[m["module"].split(".")[0]] += m["self_ms"]
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+class Command(BaseCommand):
+    help = "Profile le coût d'import des modules au démarrage (python -X importtime)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(TARGETS), default="wsgi")
+        parser.add_argument("--top", type=int, default=25, help="Nombre de lignes affichées.")
+        parser.add_argument("--forbid", default="",
+                            help="Modules (ou paquets) qui ne doivent pas être chargés, séparés par des virgules.")
+        parser.add_argument("--output", default="", help="Fichier JSON de résultats.")
+
+    def handle(self, *args, **opts):
+        code = (
+            "import time; _t0 = time.perf_counter(); "
+            f"{TARGETS[opts['target']]}; "
+            "print('WALL_MS', (time.perf_counter() - _t0) * 1000)"
+        )
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=Path(settings.BASE_DIR), env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Le démarrage mesuré a échoué :\n{proc.stderr[-2000:]}")
+
+        modules = parse_importtime(proc.stderr)
+        wall = re.search(r"WALL_MS ([\d.]+)", proc.stdout)
+        report = {
+            "target": opts["target"],
+            "settings": settings.SETTINGS_MODULE,
+            "wall_ms": round(float(wall.group(1)), 1) if wall else None,
+            "import_ms": round(sum(m["self_ms"] for m in modules), 1),
+            "modules_loaded": len(modules),
+            "packages": {k: round(v, 2) for k, v in by_package(modules).items()},
+            "modules": sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True),
+        }
+        self._print(report, opts["top"])
+
+        if opts["output"]:
+            out = Path(opts["output"])
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(f"Résultats enregistrés dans {out}")
+
+        forbidden = {f.strip() for f in opts["forbid"].split(",") if f.strip()}
+        loaded = sorted({
+            m["module"] for m in modules
+            if any(m["module"] == f or m["module"].startswith(f + ".") for f in forbidden)
+        })
+        if loaded:
+            raise CommandError(f"Modules interdits chargés au démarrage : {', '.join(loaded)}")
+
+    def _print(self, report: dict, top: int):
+        self.stdout.write(
+            f"Cible {report['target']} : {report['wall_ms']} ms, dont {report['import_ms']} ms d'imports "
+            f"({report['modules_loaded']} modules)."
+        )
+        self.stdout.write(f"\n{'paquet':<28} {'self (ms)':>10}")
+        for name, ms in list(report["packages"].items())[:top]:
+            self.stdout.write(f"{name:<28} {ms:>10.2f}")
+
+        self.stdout.write(f"\n{'module':<48} {'cumulé (ms)':>12} {'self (ms)':>10}")
+        for m in report["modules"][:top]:
+            self.stdout.write(f"{m['module']:<48} {m['cumulative_ms']:>12.2f} {m['self_ms']:>10.2f}")
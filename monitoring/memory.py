@@ -0,0 +1,131 @@
+"""
+Fichier : memory.py (application 'monitoring')
+Description : Introspection mémoire d'un worker : mémoire résidente (RSS) et
+              sites d'allocation via `tracemalloc`.
+
+              Les instantanés sont conservés dans le worker qui les a pris ;
+              chaque rapport indique donc le `pid` concerné. Pour cibler un
+              worker précis, `kill -USR2 <pid>` écrit son rapport dans les logs
+              (gestionnaire installé par gunicorn.conf.py).
+
+              Le RSS sert aussi au recyclage des workers : au-delà du seuil
+              GUNICORN_MAX_RSS_MB, le worker termine sa requête puis est remplacé.
+"""
+import json
+import logging
+import os
+import signal
+import tracemalloc
+
+from prometheus_client import Gauge
+
+logger = logging.getLogger("jo_backend.memory")
+
+WORKER_RSS = Gauge(
+    "jo_worker_rss_bytes",
+    "Mémoire résidente de chaque worker.",
+    multiprocess_mode="liveall",
+)
+
+# Allocations internes au diagnostic, exclues des rapports.
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+_snapshots: dict[str, tracemalloc.Snapshot] = {}
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def rss_bytes() -> int:
+    """Mémoire résidente actuelle du processus (Linux) ; pic de RSS à défaut."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        import resource  # Unix hors Linux : ru_maxrss est un pic (octets sur macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def record_rss() -> int:
+    rss = rss_bytes()
+    WORKER_RSS.set(rss)
+    return rss
+
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def start_tracing(frames: int = 10):
+    """Démarre `tracemalloc` et prend l'instantané de référence "baseline"."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        _snapshots.clear()
+    _snapshots.setdefault("baseline", take_snapshot())
+
+
+def stop_tracing():
+    _snapshots.clear()
+    tracemalloc.stop()
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def save_snapshot(label: str) -> tracemalloc.Snapshot:
+    """Prend et conserve un instantané nommé (démarre le traçage si besoin)."""
+    start_tracing()
+    _snapshots[label] = take_snapshot()
+    return _snapshots[label]
+
+
+def top_growth(since: str = "baseline", limit: int = 15, key_type: str = "lineno") -> list[dict]:
+    """Sites d'allocation dont la taille a le plus augmenté depuis l'instantané `since`."""
+    if since not in _snapshots:
+        raise KeyError(since)
+    stats = take_snapshot().compare_to(_snapshots[since], key_type)
+    return [
+        {
+            "site": " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback[:3]),
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def report(since: str = "baseline", limit: int = 15) -> dict:
+    data = {
+        "pid": os.getpid(),
+        "rss_mb": round(record_rss() / 2**20, 1),
+        "tracing": is_tracing(),
+        "snapshots": sorted(_snapshots),
+    }
+    if is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        data.update(traced_mb=round(current / 2**20, 2), traced_peak_mb=round(peak / 2**20, 2))
+        if since in _snapshots:
+            data.update(since=since, top=top_growth(since, limit))
+    return data
+
+
+def install_signal_handler(signum: int = signal.SIGUSR2):
+    """Écrit le rapport mémoire du worker dans les logs à la réception de `signum`."""
+    def _handler(_signum, _frame):
+        logger.info(json.dumps({"event": "memory_report", **report()}))
+
+    signal.signal(signum, _handler)
+
+
+def over_threshold(max_rss_mb: float) -> bool:
+    """Vrai si le RSS du worker dépasse le seuil de recyclage (0 = désactivé)."""
+    return bool(max_rss_mb) and record_rss() > max_rss_mb * 2**20
@@ -0,0 +1,120 @@
+"""
+Fichier : metrics.py (application 'monitoring')
+Description : Métriques au format Prometheus (bibliothèque prometheus_client).
+
+              Sous gunicorn, chaque worker est un processus distinct : les
+              valeurs sont alors écrites dans des fichiers partagés du dossier
+              PROMETHEUS_MULTIPROC_DIR (configuré par gunicorn.conf.py) et
+              l'endpoint /metrics agrège tous les workers. Sans cette variable
+              (développement, tests), le registre du processus est utilisé.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "jo_http_request_duration_seconds",
+    "Durée des requêtes HTTP par route.",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "jo_http_request_db_queries",
+    "Nombre de requêtes SQL par requête HTTP.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "jo_http_requests_in_flight",
+    "Requêtes en cours de traitement (somme des workers vivants).",
+    multiprocess_mode="livesum",
+)
+QR_RENDER_DURATION = Histogram(
+    "jo_qr_render_duration_seconds",
+    "Durée de rendu d'un QR code.",
+    ["format"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25),
+)
+VERIFY_OUTCOMES = Counter(
+    "jo_ticket_verify_total",
+    "Résultats des vérifications de billets (valid ou raison du refus).",
+    ["outcome"],
+)
+SIGNAL_PUBLISH_DURATION = Histogram(
+    "jo_signal_publish_duration_seconds",
+    "Durée des publications déclenchées par les signaux des offres.",
+    ["step", "outcome"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+REQUESTS_SHED = Counter(
+    "jo_http_requests_shed_total",
+    "Requêtes rejetées (503) par le contrôle d'admission, par route et priorité.",
+    ["route", "priority"],
+)
+QUEUE_WAIT = Histogram(
+    "jo_http_queue_wait_seconds",
+    "Attente avant traitement (en-tête X-Request-Start du proxy, sinon file du worker gunicorn).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+WAITING_ROOM_EVENTS = Counter(
+    "jo_waiting_room_events_total",
+    "Salle d'attente : entrées en file, jetons d'admission émis, créations refusées.",
+    ["event"],
+)
+
+
+def status_class(status_code: int) -> str:
+    """Regroupe les statuts par classe (2xx, 4xx...) pour borner la cardinalité."""
+    return f"{status_code // 100}xx"
+
+
+def observe_request(route: str, method: str, status_code: int, seconds: float, db_queries: int):
+    REQUEST_LATENCY.labels(route, method, status_class(status_code)).observe(seconds)
+    REQUEST_DB_QUERIES.labels(route).observe(db_queries)
+
+
+def record_verify_outcome(body: dict):
+    """Compte le résultat d'une vérification à partir du corps de la réponse."""
+    VERIFY_OUTCOMES.labels("valid" if body.get("valid") else body.get("reason", "unknown")).inc()
+
+
+def record_waiting_room_event(event: str):
+    WAITING_ROOM_EVENTS.labels(event).inc()
+
+
+def _registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    Expose les métriques au format texte Prometheus. L'en-tête
+    `Authorization: Bearer <METRICS_TOKEN>` est exigé ; sans jeton configuré,
+    l'endpoint n'est ouvert qu'en DEBUG (404 sinon).
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,271 @@
+"""
+Fichier : middleware.py (application 'monitoring')
+Description : Middleware de mesure des temps par requête. Pour chaque requête
+              il mesure la durée totale, le nombre et la durée des requêtes SQL
+              et le temps de sérialisation, puis les expose :
+                - dans l'en-tête `Server-Timing` (lisible dans les DevTools) ;
+                - en lignes de log JSON structurées (logger "jo_backend.timing") ;
+                - dans les histogrammes Prometheus par route (`metrics.py`).
+              L'échantillonnage (`settings.SERVER_TIMING`) permet de le laisser
+              actif en production ; les requêtes lentes sont toujours journalisées.
+
+              `ProfilerMiddleware` profile les requêtes ciblées quand le staff a
+              armé le profileur.
+
+              `LoadSheddingMiddleware` rejette tôt (503) les routes peu
+              prioritaires quand le worker est saturé (voir `shedding.py`).
+
+              Les trois sont synchrones et asynchrones : en ASGI (SERVER_MODE=asgi),
+              la pile reste asynchrone de bout en bout et les vues asynchrones
+              d'un worker s'exécutent concurremment.
+"""
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject, empty
+
+from . import profiler
+from .metrics import QUEUE_WAIT, REQUESTS_IN_FLIGHT, REQUESTS_SHED, observe_request
+from .shedding import AdmissionController, RoutePriorities, queue_wait_ms, worker_queue
+from .timing import RequestTimings, activate, deactivate, instrument
+
+logger = logging.getLogger("jo_backend.timing")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "HEADER_SAMPLE_RATE": 0.0,
+    "HEADER_FOR_STAFF": True,
+    "LOG_SAMPLE_RATE": 0.0,
+    "SLOW_REQUEST_MS": 1000.0,
+}
+
+
+def route_name(request) -> str:
+    """Nom de la route résolue (ex: "orders:checkout"), ou "unresolved"."""
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match and match.view_name else "unresolved"
+
+
+class AsyncCapableMiddleware:
+    """
+    Base des middlewares de ce module : compatibles avec les deux piles. En ASGI,
+    l'instance est marquée coroutine pour que Django ne la fasse pas passer par
+    `sync_to_async` (un thread partagé par worker, qui sérialiserait les requêtes).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+    """Mesure app/db/ser et les publie en en-tête Server-Timing et en logs JSON."""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        cfg = {**DEFAULTS, **getattr(settings, "SERVER_TIMING", {})}
+        self.enabled = cfg["ENABLED"]
+        self.header_rate = float(cfg["HEADER_SAMPLE_RATE"])
+        self.header_for_staff = cfg["HEADER_FOR_STAFF"]
+        self.log_rate = float(cfg["LOG_SAMPLE_RATE"])
+        self.slow_ms = float(cfg["SLOW_REQUEST_MS"])
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        timings, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(token)
+        return self._finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        timings, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(token)
+        return self._finish(request, response, timings, start)
+
+    @staticmethod
+    def _start():
+        timings = RequestTimings()
+        instrument(connection)
+        REQUESTS_IN_FLIGHT.inc()
+        return timings, activate(timings), time.perf_counter()
+
+    @staticmethod
+    def _stop(token):
+        REQUESTS_IN_FLIGHT.dec()
+        deactivate(token)
+
+    def _finish(self, request, response, timings: RequestTimings, start: float):
+        total_ms = (time.perf_counter() - start) * 1000
+        request.timings = timings
+        request.timings_total_ms = total_ms
+        observe_request(route_name(request), request.method, response.status_code,
+                        total_ms / 1000, timings.db_count)
+
+        if self._wants_header(request):
+            response["Server-Timing"] = self._header(timings, total_ms)
+        if total_ms >= self.slow_ms or (self.log_rate and random.random() < self.log_rate):
+            logger.info(self._log_line(request, response, timings, total_ms))
+        return response
+
+    def _wants_header(self, request) -> bool:
+        """Échantillon public (HEADER_SAMPLE_RATE) ou membre du staff authentifié (vue DRF ou admin)."""
+        if self.header_rate >= 1.0 or (self.header_rate and random.random() < self.header_rate):
+            return True
+        if not self.header_for_staff:
+            return False
+        user = getattr(request, "user", None)
+        # Utilisateur de session jamais lu par la vue : pas de requête SQL (impossible en ASGI) pour l'en-tête.
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            return False
+        return bool(user is not None and getattr(user, "is_staff", False))
+
+    @staticmethod
+    def _header(timings: RequestTimings, total_ms: float) -> str:
+        parts = [
+            f"app;dur={total_ms:.1f}",
+            f'db;dur={timings.db_ms:.1f};desc="{timings.db_count} queries"',
+        ]
+        parts += [f"{name};dur={ms:.1f}" for name, ms in timings.spans.items()]
+        return ", ".join(parts)
+
+    @staticmethod
+    def _log_line(request, response, timings: RequestTimings, total_ms: float) -> str:
+        return json.dumps({
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "route": route_name(request),
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_queries": timings.db_count,
+            "db_ms": round(timings.db_ms, 2),
+            **{f"{name}_ms": round(ms, 2) for name, ms in timings.spans.items()},
+        })
+
+
+class ProfilerMiddleware(AsyncCapableMiddleware):
+    """
+    Profile les requêtes ciblées lorsque le profileur est armé (voir `profiler.py`).
+    Le profil démarre dans `process_view`, une fois la route résolue. En ASGI,
+    il porte sur le thread de la boucle d'événements : les autres requêtes
+    servies pendant ce temps par le worker y figurent aussi.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.is_async:
+            # Appelée par le handler sans passer par `sync_to_async`.
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self._finish(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._finish(request, await self.get_response(request))
+
+    @staticmethod
+    def _finish(request, response):
+        current = getattr(request, "_profile", None)
+        if current is not None:
+            request._profile = None
+            current.finish()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = profiler.claim(route_name(request))
+        if state is not None:
+            request._profile = profiler.RequestProfile(state, route_name(request))
+        return None
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return ProfilerMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+
+class LoadSheddingMiddleware(AsyncCapableMiddleware):
+    """
+    Contrôle d'admission : compte les requêtes en cours du worker et, une fois
+    la route résolue, rejette (503 + Retry-After) celles dont la priorité ne
+    tolère plus la saturation actuelle.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        cfg = settings.LOAD_SHEDDING
+        self.enabled = cfg["ENABLED"]
+        self.controller = AdmissionController(cfg["CAPACITY"], cfg["QUEUE_TARGET_MS"])
+        self.priority = RoutePriorities(cfg["ROUTE_PRIORITIES"], cfg["DEFAULT_PRIORITY"])
+        self.thresholds = cfg["THRESHOLDS"]
+        self.queue_header = cfg["QUEUE_HEADER"]
+        self.retry_after = str(cfg["RETRY_AFTER"])
+        if self.is_async:
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        self._enter(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.controller.leave()
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        self._enter(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.controller.leave()
+
+    def _enter(self, request):
+        wait = queue_wait_ms(request.META, self.queue_header)
+        if wait is None:
+            wait = worker_queue.wait_ms()
+        if wait is not None:
+            QUEUE_WAIT.observe(wait / 1000)
+        request.queue_wait_ms = wait
+        self.controller.enter()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled:
+            return None
+        route = route_name(request)
+        priority = self.priority(route)
+        threshold = self.thresholds.get(priority)
+        saturation = self.controller.saturation(request.queue_wait_ms, worker_queue.waiting)
+        if threshold is None or saturation < threshold:
+            return None
+        REQUESTS_SHED.labels(route, priority).inc()
+        response = JsonResponse(
+            {"detail": "Service momentanément surchargé, veuillez réessayer."}, status=503,
+        )
+        response["Retry-After"] = self.retry_after
+        return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return LoadSheddingMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
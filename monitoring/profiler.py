@@ -0,0 +1,263 @@
+"""
+Fichier : profiler.py (application 'monitoring')
+Description : Profilage à la demande des workers en production.
+
+              Un membre du staff « arme » le profileur (vue `ProfilerAPIView`)
+              pour les N prochaines requêtes d'une route, ou pour une fenêtre de
+              temps. L'état armé est écrit dans un fichier partagé du dossier
+              PROFILE_DIR, relu par chaque worker au plus une fois par seconde :
+              désarmé, le coût par requête se limite à une comparaison d'horloge.
+
+              Deux modes :
+                - "sample" : un thread échantillonne la pile du thread de la
+                  requête (`sys._current_frames`) et écrit des piles repliées
+                  (`.folded`, format des flamegraphs) ;
+                - "cprofile" : profil déterministe écrit au format pstats (`.prof`).
+                  Un seul profil cProfile peut être actif par processus
+                  (Python ≥ 3.12 refuse un second `enable()`) : une requête qui
+                  se chevauche avec une autre est échantillonnée à la place.
+
+              Seuls les PROFILE_MAX_FILES profils les plus récents sont gardés.
+"""
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou, le décompte reste approximatif.
+    fcntl = None
+
+STATE_FILE = "armed.json"
+LOCK_FILE = "armed.lock"
+POLL_INTERVAL = 1.0
+MODES = ("sample", "cprofile")
+
+_lock = threading.Lock()
+_cprofile_lock = threading.Lock()
+_cache = {"checked": float("-inf"), "mtime": None, "state": None}
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def _state_path() -> Path:
+    return profile_dir() / STATE_FILE
+
+
+def _invalidate():
+    _cache["checked"] = float("-inf")
+
+
+@contextmanager
+def _state_lock():
+    """Verrou exclusif entre workers (fichier à part : l'état est remplacé, pas réécrit)."""
+    with open(profile_dir() / LOCK_FILE, "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _write_state(state: dict):
+    """Écriture atomique : un worker qui relit l'état ne voit jamais un fichier tronqué."""
+    tmp = _state_path().with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, _state_path())
+
+
+# --- État armé (partagé entre workers) ---
+
+def arm(route: str = "", requests: int | None = None, seconds: float | None = None,
+        mode: str = "sample", interval_ms: float = 5.0) -> dict:
+    """Arme le profileur ; au moins une limite (`requests` ou `seconds`) est requise."""
+    if mode not in MODES:
+        raise ValueError(f"mode inconnu : {mode}")
+    if not requests and not seconds:
+        raise ValueError("requests ou seconds est requis")
+    state = {
+        "route": route,
+        "remaining": int(requests) if requests else None,
+        "until": time.time() + float(seconds) if seconds else None,
+        "mode": mode,
+        "interval_ms": max(1.0, float(interval_ms)),
+    }
+    profile_dir().mkdir(parents=True, exist_ok=True)
+    with _state_lock():
+        _write_state(state)
+    _invalidate()
+    return state
+
+
+def disarm():
+    _state_path().unlink(missing_ok=True)
+    _invalidate()
+
+
+def armed_state() -> dict | None:
+    """État armé courant, relu depuis le disque au plus une fois par seconde."""
+    now = time.monotonic()
+    if now - _cache["checked"] < POLL_INTERVAL:
+        return _cache["state"]
+    with _lock:
+        if now - _cache["checked"] < POLL_INTERVAL:  # relu entre-temps par un autre thread
+            return _cache["state"]
+        try:
+            mtime = _state_path().stat().st_mtime_ns
+        except OSError:
+            mtime = None
+            _cache["state"] = None
+        if mtime is not None and mtime != _cache["mtime"]:
+            try:
+                _cache["state"] = json.loads(_state_path().read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                _cache["state"] = None
+        _cache["mtime"] = mtime
+        # Horodaté une fois l'état chargé : les autres threads ne lisent jamais un état périmé.
+        _cache["checked"] = now
+    return _cache["state"]
+
+
+def _take_slot() -> bool:
+    """Décrémente le nombre de requêtes restantes dans le fichier partagé (sous verrou)."""
+    try:
+        with _state_lock():
+            state = json.loads(_state_path().read_text(encoding="utf-8") or "null")
+            if not state or not state.get("remaining"):
+                return False
+            state["remaining"] -= 1
+            _write_state(state)
+    except (OSError, ValueError):
+        return False
+    if state["remaining"] == 0:
+        disarm()
+    else:
+        _invalidate()
+    return True
+
+
+def claim(route: str) -> dict | None:
+    """Retourne l'état armé si la requête de cette route doit être profilée."""
+    state = armed_state()
+    if state is None:
+        return None
+    if state["until"] is not None and time.time() > state["until"]:
+        if state["remaining"] is None:
+            disarm()
+        return None
+    if state["route"] and state["route"] != route:
+        return None
+    if state["remaining"] is not None and not _take_slot():
+        return None
+    return state
+
+
+# --- Profileurs ---
+
+class StackSampler(threading.Thread):
+    """Échantillonne périodiquement la pile d'un thread et compte les piles repliées."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="jo-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "?")
+                frames.append(f"{module}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+class RequestProfile:
+    """Profil d'une requête : démarré avant la vue, arrêté et écrit après la réponse."""
+
+    def __init__(self, state: dict, route: str):
+        self.mode = state["mode"]
+        self.route = route
+        if self.mode == "cprofile" and not self._start_cprofile():
+            self.mode = "sample"
+        if self.mode == "sample":
+            self.profiler = StackSampler(threading.get_ident(), state["interval_ms"] / 1000)
+            self.profiler.start()
+
+    def _start_cprofile(self) -> bool:
+        """Démarre cProfile si aucun autre profil déterministe n'est actif dans le processus."""
+        if not _cprofile_lock.acquire(blocking=False):
+            return False
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError:  # autre outil de profilage actif (débogueur, couverture…)
+            _cprofile_lock.release()
+            return False
+        return True
+
+    def finish(self) -> Path:
+        if self.mode == "cprofile":
+            self.profiler.disable()
+            _cprofile_lock.release()
+        else:
+            self.profiler.stop()
+
+        safe_route = re.sub(r"[^\w.-]+", "_", self.route)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_route}_{os.getpid()}_{time.monotonic_ns() % 10**6:06d}"
+        out_dir = profile_dir()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            path = out_dir / f"{stem}.prof"
+            self.profiler.dump_stats(path)
+        else:
+            path = out_dir / f"{stem}.folded"
+            path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self.profiler.stacks.most_common()),
+                encoding="utf-8",
+            )
+        _prune(out_dir)
+        return path
+
+
+def _profiles(out_dir: Path) -> list[Path]:
+    """Profils du dossier, les plus récents d'abord."""
+    files = []
+    for p in out_dir.iterdir():
+        if p.suffix not in (".folded", ".prof"):
+            continue
+        try:
+            files.append((p.stat().st_mtime_ns, p))
+        except OSError:  # supprimé entre-temps par un autre worker
+            continue
+    return [p for _, p in sorted(files, reverse=True)]
+
+
+def _prune(out_dir: Path):
+    """Supprime les profils les plus anciens au-delà de PROFILE_MAX_FILES."""
+    for old in _profiles(out_dir)[settings.PROFILE_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+
+
+def list_profiles() -> list[str]:
+    out_dir = profile_dir()
+    if not out_dir.is_dir():
+        return []
+    return [p.name for p in _profiles(out_dir)]
@@ -0,0 +1,136 @@
+"""
+Fichier : shedding.py (application 'monitoring')
+Description : Contrôle d'admission d'un worker (délestage adaptatif).
+
+              La saturation du worker combine deux signaux :
+                - la demande concurrente : requêtes en cours dans ses autres
+                  threads plus requêtes acceptées par gunicorn qui attendent
+                  un thread libre, rapportées au nombre de threads ;
+                - l'attente de la requête avant traitement, mesurée depuis
+                  l'en-tête `X-Request-Start` posé par un proxy frontal (nom
+                  configurable) ou, à défaut, depuis sa mise en file dans le
+                  worker gunicorn (`WorkerQueue`, installé par gunicorn.conf.py).
+              Chaque route a une priorité ; au-delà du seuil de sa priorité,
+              la requête est rejetée immédiatement (503 + Retry-After) au lieu
+              d'occuper un thread jusqu'au timeout de gunicorn. Les routes
+              critiques (paiement, vérification) ne sont jamais délestées.
+"""
+import threading
+import time
+from fnmatch import fnmatchcase
+
+
+class AdmissionController:
+    """Compteur des requêtes en cours d'un worker et calcul de sa saturation."""
+
+    def __init__(self, capacity: int, queue_target_ms: float = 0.0):
+        self.capacity = max(1, int(capacity))
+        self.queue_target_ms = float(queue_target_ms)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def saturation(self, queue_wait_ms: float | None = None, waiting: int = 0) -> float:
+        """
+        Saturation vue par la requête courante : autres requêtes en cours et
+        requêtes en attente d'un thread (`waiting`), rapportées à la capacité.
+        0 = libre, ≥ 1 = tous les threads pris et au moins une requête en file.
+        """
+        busy = (max(0, self.in_flight - 1) + max(0, waiting)) / self.capacity
+        if queue_wait_ms and self.queue_target_ms:
+            return max(busy, queue_wait_ms / self.queue_target_ms)
+        return busy
+
+
+class WorkerQueue:
+    """
+    File d'attente du worker gunicorn `gthread` : une connexion prête est
+    soumise au pool de threads (`enqueue_req`) puis traitée par un thread
+    (`handle`). Les deux méthodes sont enveloppées pour compter les requêtes
+    en attente et mesurer l'attente de chacune, sans proxy frontal.
+    """
+
+    def __init__(self):
+        self.waiting = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self, worker) -> bool:
+        """Enveloppe un worker gthread ; False pour les autres classes de worker."""
+        if not (hasattr(worker, "enqueue_req") and hasattr(worker, "handle")):
+            return False
+        enqueue_req, handle = worker.enqueue_req, worker.handle
+
+        def queued_enqueue_req(conn):
+            conn.jo_queued_at = time.monotonic()
+            self._add(1)
+            try:
+                enqueue_req(conn)
+            except BaseException:
+                self._add(-1)
+                raise
+
+        def queued_handle(conn):
+            self._add(-1)
+            self._local.wait_ms = (time.monotonic() - conn.jo_queued_at) * 1000
+            try:
+                return handle(conn)
+            finally:
+                self._local.wait_ms = None
+
+        worker.enqueue_req, worker.handle = queued_enqueue_req, queued_handle
+        return True
+
+    def _add(self, n: int):
+        with self._lock:
+            self.waiting += n
+
+    def wait_ms(self) -> float | None:
+        """Attente dans le worker de la requête du thread courant (None hors gthread)."""
+        return getattr(self._local, "wait_ms", None)
+
+
+worker_queue = WorkerQueue()
+
+
+def queue_wait_ms(meta: dict, header: str = "HTTP_X_REQUEST_START", now: float | None = None) -> float | None:
+    """
+    Attente depuis l'en-tête posé par le proxy (`t=<horodatage>`, en s, ms ou µs
+    selon le proxy). None si l'en-tête est absent ou invalide.
+    """
+    raw = meta.get(header, "")
+    if not raw:
+        return None
+    try:
+        value = float(raw.split("=", 1)[-1].strip())
+    except ValueError:
+        return None
+    if value > 1e14:      # microsecondes
+        value /= 1e6
+    elif value > 1e11:    # millisecondes
+        value /= 1e3
+    now = time.time() if now is None else now
+    return max(0.0, (now - value) * 1000)
+
+
+class RoutePriorities:
+    """Priorité d'une route à partir de motifs (`admin:*`, `orders:checkout`...)."""
+
+    def __init__(self, patterns: dict[str, str], default: str):
+        self.patterns = list(patterns.items())
+        self.default = default
+        self._cache: dict[str, str] = {}
+
+    def __call__(self, route: str) -> str:
+        priority = self._cache.get(route)
+        if priority is None:
+            priority = next((p for pattern, p in self.patterns if fnmatchcase(route, pattern)), self.default)
+            self._cache[route] = priority
+        return priority
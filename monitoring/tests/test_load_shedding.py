@@ -0,0 +1,127 @@
+"""
+Fichier : test_load_shedding.py (application 'monitoring')
+Description : Teste le contrôle d'admission : calcul de la saturation, lecture
+              de l'attente en file (X-Request-Start), priorités des routes et
+              rejet 503 + Retry-After des routes peu prioritaires.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from monitoring.shedding import AdmissionController, RoutePriorities, WorkerQueue, queue_wait_ms, worker_queue
+
+pytestmark = pytest.mark.django_db
+
+
+def test_saturation_from_in_flight_and_queue_wait():
+    controller = AdmissionController(capacity=4, queue_target_ms=500)
+    for _ in range(3):
+        controller.enter()
+    # 2 autres requêtes en cours sur 4 threads.
+    assert controller.saturation() == 0.5
+    assert controller.saturation(queue_wait_ms=1000) == 2.0
+    controller.leave()
+    assert controller.saturation(queue_wait_ms=100) == 0.25
+
+
+# Teste que la saturation atteint les seuils sans en-tête : threads pris et requêtes en file.
+def test_saturation_reaches_thresholds_without_header():
+    controller = AdmissionController(capacity=2, queue_target_ms=500)
+    controller.enter()
+    controller.enter()
+    assert controller.saturation() == 0.5
+    assert controller.saturation(waiting=1) == 1.0
+    assert controller.saturation(waiting=3) == 2.0
+
+
+class FakeConn:
+    pass
+
+
+class FakeGthreadWorker:
+    """Même interface que le worker gthread de gunicorn : `enqueue_req` soumet `handle` au pool."""
+
+    def __init__(self, threads, queue):
+        self.queue = queue
+        self.tpool = ThreadPoolExecutor(max_workers=threads)
+        self.release = threading.Event()
+        self.waits = []
+
+    def enqueue_req(self, conn):
+        self.tpool.submit(self.handle, conn)
+
+    def handle(self, conn):
+        self.waits.append(self.queue.wait_ms())
+        self.release.wait(timeout=5)
+
+
+# Teste la file du worker gthread : requêtes en attente d'un thread et attente de chacune.
+def test_worker_queue_counts_waiting_requests():
+    queue = WorkerQueue()
+    worker = FakeGthreadWorker(threads=1, queue=queue)
+    assert queue.install(worker)
+    assert not queue.install(object())
+    for _ in range(3):
+        worker.enqueue_req(FakeConn())
+    deadline = time.monotonic() + 5
+    while not worker.waits and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert queue.waiting == 2
+    time.sleep(0.02)
+    worker.release.set()
+    worker.tpool.shutdown(wait=True)
+    assert queue.waiting == 0
+    assert queue.wait_ms() is None
+    assert len(worker.waits) == 3 and min(worker.waits[1:]) >= 20
+
+
+# Teste le délestage sans en-tête du proxy : tous les threads pris et une requête en file.
+def test_shedding_without_queue_header(client, settings, monkeypatch):
+    settings.LOAD_SHEDDING = {**settings.LOAD_SHEDDING, "CAPACITY": 2}
+    monkeypatch.setattr(worker_queue, "waiting", 2)
+    r = client.get(reverse("offers:offer-list"))
+    assert r.status_code == 503
+    assert client.get(reverse("health")).status_code == 200
+    monkeypatch.setattr(worker_queue, "waiting", 0)
+    assert client.get(reverse("offers:offer-list")).status_code == 200
+
+
+def test_queue_wait_header_formats():
+    now = 1_700_000_000.0
+    for raw in ("t=1699999999.75", "t=1699999999750", "t=1699999999750000", "1699999999.75"):
+        assert queue_wait_ms({"HTTP_X_REQUEST_START": raw}, now=now) == pytest.approx(250, abs=1)
+    assert queue_wait_ms({}, now=now) is None
+    assert queue_wait_ms({"HTTP_X_REQUEST_START": "t=abc"}, now=now) is None
+
+
+def test_route_priorities():
+    priority = RoutePriorities({"orders:checkout": "critical", "admin:*": "low"}, default="normal")
+    assert priority("orders:checkout") == "critical"
+    assert priority("admin:orders_ticket_changelist") == "low"
+    assert priority("accounts:me") == "normal"
+
+
+# Teste le délestage : routes basses rejetées, routes critiques toujours servies.
+def test_saturated_worker_sheds_low_priority_routes(client):
+    late = {"HTTP_X_REQUEST_START": f"t={time.time() - 2:.3f}"}
+    before = REGISTRY.get_sample_value("jo_http_requests_shed_total",
+                                       {"route": "offers:offer-list", "priority": "low"}) or 0
+
+    r = client.get(reverse("offers:offer-list"), **late)
+    assert r.status_code == 503 and r["Retry-After"] == "5"
+    assert REGISTRY.get_sample_value("jo_http_requests_shed_total",
+                                     {"route": "offers:offer-list", "priority": "low"}) == before + 1
+
+    r = client.post(reverse("orders:verify_ticket"), {"token": "x"}, content_type="application/json", **late)
+    assert r.status_code == 200
+    assert client.get(reverse("health"), **late).status_code == 200
+    assert client.get(reverse("offers:offer-list")).status_code == 200
+
+
+def test_load_shedding_can_be_disabled(client, settings):
+    settings.LOAD_SHEDDING = {**settings.LOAD_SHEDDING, "ENABLED": False}
+    late = {"HTTP_X_REQUEST_START": f"t={time.time() - 2:.3f}"}
+    assert client.get(reverse("offers:offer-list"), **late).status_code == 200
@@ -0,0 +1,59 @@
+"""
+Fichier : test_memory.py (application 'monitoring')
+Description : Teste l'introspection mémoire : RSS, instantanés tracemalloc et
+              comparaison, endpoint réservé au staff et seuil de recyclage.
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from monitoring import memory
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def tracing():
+    yield
+    if memory.is_tracing():
+        memory.stop_tracing()
+
+
+# Teste la lecture du RSS et le seuil de recyclage.
+def test_rss_and_threshold():
+    assert memory.rss_bytes() > 0
+    assert memory.over_threshold(0) is False
+    assert memory.over_threshold(1) is True
+    assert memory.over_threshold(10**9) is False
+
+
+# Teste que la croissance d'allocations est attribuée à la bonne ligne.
+def test_top_growth_reports_allocation_site(tracing):
+    memory.start_tracing(5)
+    leak = [bytearray(1024) for _ in range(2000)]
+    top = memory.top_growth("baseline", limit=5)
+    assert any("test_memory.py" in row["site"] and row["size_diff_kb"] >= 1500 for row in top)
+    del leak
+
+
+# Teste l'endpoint : réservé au staff, instantané nommé puis rapport comparé.
+def test_memory_endpoint(api_client, tracing):
+    user = User.objects.create_user(username="bob", password="x")
+    api_client.force_authenticate(user=user)
+    assert api_client.get(reverse("monitoring:memory")).status_code == 403
+
+    staff = User.objects.create_user(username="ops", password="x", is_staff=True)
+    api_client.force_authenticate(user=staff)
+    r = api_client.get(reverse("monitoring:memory"))
+    assert r.status_code == 200 and r.json()["tracing"] is False and r.json()["rss_mb"] > 0
+
+    r = api_client.post(reverse("monitoring:memory"), {"label": "avant"}, format="json")
+    assert r.status_code == 201
+    assert set(r.json()["snapshots"]) == {"baseline", "avant"}
+
+    r = api_client.get(reverse("monitoring:memory"), {"since": "avant", "limit": 3})
+    data = r.json()
+    assert data["since"] == "avant" and len(data["top"]) <= 3
+
+    assert api_client.delete(reverse("monitoring:memory")).status_code == 204
+    assert memory.is_tracing() is False
@@ -0,0 +1,68 @@
+"""
+Fichier : test_metrics.py (application 'monitoring')
+Description : Teste l'endpoint Prometheus /metrics et les métriques alimentées
+              par le middleware, la vérification des billets et le rendu des QR.
+"""
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+pytestmark = pytest.mark.django_db
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+# Teste que les latences et le nombre de requêtes SQL sont exposés par route.
+def test_metrics_endpoint_exposes_route_histograms(client, settings):
+    settings.METRICS_TOKEN = "s3cret"
+    before = sample("jo_http_request_duration_seconds_count", route="health", method="GET", status="2xx")
+    client.get(reverse("health"))
+    after = sample("jo_http_request_duration_seconds_count", route="health", method="GET", status="2xx")
+    assert after == before + 1
+
+    r = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+    assert r.status_code == 200
+    assert r["Content-Type"].startswith("text/plain")
+    body = r.content.decode()
+    assert 'jo_http_request_duration_seconds_bucket{le="0.005",method="GET",route="health",status="2xx"}' in body
+    assert "jo_http_request_db_queries_bucket" in body
+
+
+# Teste le comptage des résultats de vérification par raison.
+def test_verify_outcomes_are_counted(api_client):
+    before = sample("jo_ticket_verify_total", outcome="bad_signature")
+    api_client.post(reverse("orders:verify_ticket"), {"token": "forged"}, format="json")
+    assert sample("jo_ticket_verify_total", outcome="bad_signature") == before + 1
+
+    before = sample("jo_ticket_verify_total", outcome="missing_token")
+    r = api_client.post(reverse("orders:verify_ticket"), {}, format="json")
+    assert r.status_code == 400
+    assert sample("jo_ticket_verify_total", outcome="missing_token") == before + 1
+
+
+# Teste la mesure du rendu des QR codes.
+def test_qr_render_duration_is_observed():
+    from orders.utils import render_qr_png
+
+    before = sample("jo_qr_render_duration_seconds_count", format="png")
+    render_qr_png("jo://ticket/test")
+    assert sample("jo_qr_render_duration_seconds_count", format="png") == before + 1
+
+
+# Teste la protection par jeton.
+def test_metrics_token(client, settings):
+    settings.METRICS_TOKEN = "s3cret"
+    assert client.get(reverse("metrics")).status_code == 401
+    assert client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer autre").status_code == 401
+    r = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+    assert r.status_code == 200
+
+
+# Teste que, sans jeton configuré, /metrics n'est servi qu'en DEBUG.
+def test_metrics_without_token_only_in_debug(client, settings):
+    settings.METRICS_TOKEN = ""
+    assert client.get(reverse("metrics")).status_code == 404
+    settings.DEBUG = True
+    assert client.get(reverse("metrics")).status_code == 200
@@ -0,0 +1,39 @@
+"""
+Fichier : test_profile_startup.py (application 'monitoring')
+Description : Teste la commande `profile_startup` : analyse de la sortie
+              `-X importtime` et vérification que qrcode et Pillow ne sont pas
+              chargés au démarrage d'un worker.
+"""
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from monitoring.management.commands.profile_startup import by_package, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   io
+import time:      1000 |       1500 | django.conf
+"""
+
+
+# Teste l'analyse des lignes `import time`.
+def test_parse_importtime():
+    modules = parse_importtime(SAMPLE + "Warning: ligne ignorée\n")
+    assert [m["module"] for m in modules] == ["_io", "io", "django.conf"]
+    assert modules[2] == {"module": "django.conf", "self_ms": 1.0, "cumulative_ms": 1.5, "depth": 0}
+    assert modules[0]["depth"] == 2
+    assert by_package(modules) == {"django": 1.0, "io": 0.3, "_io": 0.12}
+
+
+# Teste la commande complète : les bibliothèques d'image restent différées.
+def test_profile_startup_keeps_image_libraries_lazy(tmp_path):
+    out = tmp_path / "startup.json"
+    call_command("profile_startup", "--forbid", "qrcode,PIL", "--top", "3", "--output", str(out))
+    report = json.loads(out.read_text())
+    assert report["wall_ms"] > 0 and report["modules_loaded"] > 100
+    assert "django" in report["packages"]
+
+    with pytest.raises(CommandError, match="django.conf"):
+        call_command("profile_startup", "--target", "setup", "--forbid", "django.conf", "--top", "1")
@@ -0,0 +1,134 @@
+"""
+Fichier : test_profiler.py (application 'monitoring')
+Description : Teste le profileur à la demande : armement réservé au staff,
+              ciblage par route, décompte des requêtes et profils produits.
+"""
+import pstats
+import time
+import threading
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from monitoring import profiler
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = str(tmp_path / "profiles")
+    profiler._invalidate()
+    yield tmp_path / "profiles"
+    profiler.disarm()
+
+
+@pytest.fixture
+def staff_client(api_client):
+    staff = User.objects.create_user(username="ops", password="x", is_staff=True)
+    api_client.force_authenticate(user=staff)
+    return api_client
+
+
+# Teste que l'armement est réservé au staff.
+def test_profiler_requires_staff(api_client, profile_dir):
+    user = User.objects.create_user(username="bob", password="x")
+    api_client.force_authenticate(user=user)
+    r = api_client.post(reverse("monitoring:profiler"), {"requests": 1}, format="json")
+    assert r.status_code == 403
+
+
+# Teste le profilage des N prochaines requêtes d'une route, en ignorant les autres.
+def test_profiler_profiles_next_requests_of_route(staff_client, client, profile_dir):
+    r = staff_client.post(reverse("monitoring:profiler"),
+                          {"route": "health", "requests": 2, "mode": "cprofile"}, format="json")
+    assert r.status_code == 201
+
+    client.get(reverse("offers:offer-list"))
+    assert profiler.list_profiles() == []
+
+    client.get(reverse("health"))
+    client.get(reverse("health"))
+    client.get(reverse("health"))
+    names = profiler.list_profiles()
+    assert len(names) == 2 and all(n.endswith(".prof") and "_health_" in n for n in names)
+    assert profiler.armed_state() is None
+    pstats.Stats(str(profile_dir / names[0]))
+
+    r = staff_client.get(reverse("monitoring:profile_download", args=[names[0]]))
+    assert r.status_code == 200
+    assert staff_client.get(reverse("monitoring:profile_download", args=["absent.prof"])).status_code == 404
+
+
+# Teste qu'une fenêtre de temps expirée désarme le profileur.
+def test_profiler_time_window(profile_dir):
+    profiler.arm(seconds=0.01)
+    time.sleep(0.02)
+    assert profiler.claim("health") is None
+    assert profiler.armed_state() is None
+
+
+# Teste l'échantillonnage : les piles repliées contiennent la fonction en cours.
+def test_stack_sampler_collects_folded_stacks():
+    sampler = profiler.StackSampler(threading.get_ident(), 0.001)
+    sampler.start()
+
+    def busy_loop():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    busy_loop()
+    sampler.stop()
+    assert sampler.stacks
+    assert any(stack.endswith("busy_loop") for stack in sampler.stacks)
+
+
+# Teste deux requêtes profilées simultanées en mode cprofile : la seconde est échantillonnée.
+def test_overlapping_cprofile_requests_fall_back_to_sampling(profile_dir, rf):
+    from django.http import HttpResponse
+    from django.urls import resolve
+    from monitoring.middleware import ProfilerMiddleware
+
+    profiler.arm(route="health", requests=2, mode="cprofile", interval_ms=1)
+    started, release = threading.Barrier(3), threading.Event()
+
+    def view(request):
+        middleware.process_view(request, None, (), {})
+        started.wait(timeout=5)
+        release.wait(timeout=5)
+        return HttpResponse("ok")
+
+    middleware = ProfilerMiddleware(view)
+    errors = []
+
+    def handle():
+        request = rf.get(reverse("health"))
+        request.resolver_match = resolve(request.path)
+        try:
+            middleware(request)
+        except Exception as exc:  # noqa: BLE001 - remonté par l'assertion
+            errors.append(exc)
+
+    threads = [threading.Thread(target=handle) for _ in range(2)]
+    for t in threads:
+        t.start()
+    started.wait(timeout=5)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert sorted(name.rsplit(".", 1)[1] for name in profiler.list_profiles()) == ["folded", "prof"]
+    # Le verrou est libéré : un nouveau profil cprofile est possible.
+    profile = profiler.RequestProfile({"mode": "cprofile", "interval_ms": 1}, "health")
+    assert profile.mode == "cprofile"
+    profile.finish()
+
+
+# Teste que seuls les PROFILE_MAX_FILES profils les plus récents sont conservés.
+def test_profile_dir_is_pruned(profile_dir, settings):
+    settings.PROFILE_MAX_FILES = 3
+    for _ in range(5):
+        profiler.RequestProfile({"mode": "sample", "interval_ms": 1}, "health").finish()
+    assert len(profiler.list_profiles()) == 3
@@ -0,0 +1,71 @@
+"""
+Fichier : test_server_timing.py (application 'monitoring')
+Description : Teste le middleware de mesure des temps (en-tête Server-Timing,
+              comptage SQL, segment de sérialisation et logs JSON échantillonnés).
+"""
+import json
+import logging
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from monitoring.timing import RequestTimings, activate, deactivate, span
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def parse(header: str) -> dict:
+    metrics = {}
+    for part in header.split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        metrics[name] = dict(p.split("=", 1) for p in params)
+    return metrics
+
+
+# Teste l'en-tête Server-Timing sur une vue DRF (SQL et sérialisation mesurés).
+def test_server_timing_header_on_drf_view(api_client):
+    user = User.objects.create_user(username="tom", password="x", is_staff=True)
+    api_client.force_authenticate(user=user)
+    r = api_client.get(reverse("accounts:me"))
+    metrics = parse(r["Server-Timing"])
+    assert {"app", "db", "ser"} <= set(metrics)
+    assert float(metrics["app"]["dur"]) >= float(metrics["ser"]["dur"])
+
+    r = api_client.get(reverse("orders:my_tickets"))
+    assert parse(r["Server-Timing"])["db"]["desc"] == '"1 queries"'
+
+
+# Teste que l'en-tête n'est pas exposé au public par défaut (hors DEBUG), sauf échantillonnage explicite.
+def test_server_timing_header_hidden_from_public(api_client, client, settings):
+    user = User.objects.create_user(username="ann", password="x")
+    api_client.force_authenticate(user=user)
+    assert "Server-Timing" not in api_client.get(reverse("accounts:me"))
+    api_client.force_authenticate(user=None)
+    assert "Server-Timing" not in api_client.get(reverse("offers:offer-list"))
+
+    settings.SERVER_TIMING = {**settings.SERVER_TIMING, "HEADER_SAMPLE_RATE": 1.0}
+    assert "Server-Timing" in client.get(reverse("offers:offer-list"))
+
+
+# Teste la journalisation JSON lorsque la requête est échantillonnée.
+def test_server_timing_json_log(api_client, settings, caplog):
+    settings.SERVER_TIMING = {"LOG_SAMPLE_RATE": 1.0, "HEADER_SAMPLE_RATE": 0.0}
+    with caplog.at_level(logging.INFO, logger="jo_backend.timing"):
+        r = api_client.get(reverse("offers:offer-list"))
+    assert "Server-Timing" not in r
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["route"] == "offers:offer-list" and line["status"] == 200
+    assert line["db_queries"] == 1
+
+
+# Teste que les segments imbriqués de même nom ne sont comptés qu'une fois.
+def test_nested_spans_are_not_double_counted():
+    timings = RequestTimings()
+    token = activate(timings)
+    try:
+        with span("ser"):
+            with span("ser"):
+                pass
+    finally:
+        deactivate(token)
+    assert list(timings.spans) == ["ser"]
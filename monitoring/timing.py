@@ -0,0 +1,108 @@
+"""
+Fichier : timing.py (application 'monitoring')
+Description : Collecte des temps d'une requête en cours : requêtes SQL (nombre
+              et durée) et segments nommés comme la sérialisation. L'état est
+              porté par une variable de contexte, ce qui fonctionne aussi bien
+              en WSGI (threads) qu'en ASGI (tâches asyncio).
+
+              Les requêtes SQL sont comptées par un `execute_wrapper` posé sur
+              chaque connexion à sa création (signal `connection_created`,
+              branché par apps.py) : en ASGI, l'ORM s'exécute dans les threads
+              de `sync_to_async`, qui ont leurs propres connexions mais
+              héritent de la variable de contexte de la requête.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current: ContextVar["RequestTimings | None"] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Compteurs d'une requête ; les durées sont en millisecondes."""
+
+    __slots__ = ("db_count", "db_ms", "spans", "_active")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_ms = 0.0
+        self.spans: dict[str, float] = {}
+        self._active: set[str] = set()
+
+    def record_query(self, execute, sql, params, many, context):
+        """`execute_wrapper` : compte et chronomètre chaque requête SQL."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_count += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+    def add(self, name: str, elapsed_ms: float):
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed_ms
+
+
+def record_query(execute, sql, params, many, context):
+    """`execute_wrapper` de toutes les connexions : compte pour la requête instrumentée en cours, s'il y en a une."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.record_query(execute, sql, params, many, context)
+
+
+def instrument(connection):
+    """Pose `record_query` sur une connexion (une seule fois)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    instrument(connection)
+
+
+def current() -> RequestTimings | None:
+    """Compteurs de la requête en cours, ou None hors requête instrumentée."""
+    return _current.get()
+
+
+def activate(timings: RequestTimings):
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Chronomètre un segment nommé de la requête en cours. Les segments imbriqués
+    portant le même rôle (ex: serializers imbriqués) ne sont comptés qu'une fois :
+    seul le segment le plus externe est mesuré.
+    """
+    timings = _current.get()
+    if timings is None or name in timings._active:
+        yield
+        return
+    timings._active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._active.discard(name)
+        timings.add(name, (time.perf_counter() - start) * 1000)
+
+
+class TimedSerializerMixin:
+    """
+    Mixin de serializer DRF : le temps passé en validation et en représentation
+    est ajouté au segment "ser" de la requête en cours.
+    """
+
+    def to_representation(self, instance):
+        with span("ser"):
+            return super().to_representation(instance)
+
+    def run_validation(self, *args, **kwargs):
+        with span("ser"):
+            return super().run_validation(*args, **kwargs)
@@ -0,0 +1,16 @@
+"""
+Fichier : urls.py (application 'monitoring')
+Description : Routes des outils de diagnostic réservés au staff.
+"""
+app_name = "monitoring"
+from django.urls import path
+from .views import MemoryAPIView, ProfilerAPIView, ProfileDownloadAPIView
+
+urlpatterns = [
+    # Armement / désarmement du profileur à la demande.
+    path("profiler", ProfilerAPIView.as_view(), name="profiler"),
+    # Téléchargement d'un profil produit.
+    path("profiler/<str:name>", ProfileDownloadAPIView.as_view(), name="profile_download"),
+    # Rapport mémoire (RSS, tracemalloc) du worker courant.
+    path("memory", MemoryAPIView.as_view(), name="memory"),
+]
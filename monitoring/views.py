@@ -0,0 +1,117 @@
+"""
+Fichier : views.py (application 'monitoring')
+Description : Vues d'administration des outils de diagnostic, réservées au staff :
+              armement du profileur, téléchargement des profils produits et
+              rapports mémoire du worker qui traite la requête.
+              Seules les sondes de santé (`liveness`, `readiness`) sont publiques.
+"""
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from rest_framework import exceptions, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import health, memory, profiler
+
+
+def liveness(_request):
+    """
+    Vue simple pour vérifier l'état de santé de l'API (sonde de vivacité) :
+    elle ne touche à aucune dépendance. La disponibilité réelle (base, médias,
+    cache) est vérifiée par /api/health/ready.
+    """
+    return JsonResponse({"status": "ok", "service": "jo_backend", "version": "0.1.0"}, status=200)
+
+
+def _is_staff(request) -> bool:
+    """Vrai si la requête vient d'un membre du staff (session ou JWT)."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_staff:
+        return True
+    try:
+        auth = JWTAuthentication().authenticate(request)
+    except exceptions.APIException:
+        return False
+    return bool(auth and auth[0].is_staff)
+
+
+def readiness(request):
+    """
+    Sonde de disponibilité : 200 si la base, les médias, le cache et la clé de
+    signature répondent, 503 sinon. L'état et la durée de chaque contrôle sont
+    retournés en JSON ; le message d'erreur n'est donné qu'au staff ou en DEBUG
+    (il est toujours journalisé).
+    """
+    result = health.readiness()
+    if not (settings.DEBUG or _is_staff(request)):
+        result = health.public_view(result)
+    return JsonResponse(result, status=200 if result["status"] == "ok" else 503)
+
+
+class ProfilerAPIView(APIView):
+    """
+    GET : état armé et profils disponibles.
+    POST : arme le profileur (`route`, `requests` et/ou `seconds`, `mode`, `interval_ms`).
+    DELETE : désarme.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"armed": profiler.armed_state(), "profiles": profiler.list_profiles()})
+
+    def post(self, request):
+        data = request.data
+        try:
+            state = profiler.arm(
+                route=str(data.get("route") or ""),
+                requests=int(data["requests"]) if data.get("requests") else None,
+                seconds=float(data["seconds"]) if data.get("seconds") else None,
+                mode=str(data.get("mode") or "sample"),
+                interval_ms=float(data.get("interval_ms") or 5),
+            )
+        except (TypeError, ValueError) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"armed": state}, status=status.HTTP_201_CREATED)
+
+    def delete(self, request):
+        profiler.disarm()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileDownloadAPIView(APIView):
+    """Télécharge un profil (`.folded` pour flamegraph.pl / speedscope, `.prof` pour pstats)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, name: str):
+        if name not in profiler.list_profiles():
+            raise Http404
+        return FileResponse(open(profiler.profile_dir() / name, "rb"), as_attachment=True, filename=name)
+
+
+class MemoryAPIView(APIView):
+    """
+    GET : RSS du worker et, si `tracemalloc` est actif, sites d'allocation en
+          croissance depuis un instantané (`?since=baseline`, `?limit=15`).
+    POST : prend un instantané nommé (`label`), en démarrant le traçage si besoin.
+    DELETE : arrête le traçage et libère les instantanés.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        since = request.query_params.get("since", "baseline")
+        try:
+            limit = max(1, min(100, int(request.query_params.get("limit", 15))))
+        except ValueError:
+            limit = 15
+        return Response(memory.report(since=since, limit=limit))
+
+    def post(self, request):
+        label = str(request.data.get("label") or "last")
+        memory.save_snapshot(label)
+        return Response(memory.report(since="baseline"), status=status.HTTP_201_CREATED)
+
+    def delete(self, request):
+        if memory.is_tracing():
+            memory.stop_tracing()
+        return Response(status=status.HTTP_204_NO_CONTENT)
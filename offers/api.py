@@ -3,10 +3,12 @@ Fichier : api.py (application 'offers')
 Description : Définit le ViewSet pour l'API des offres (Offer).
 """
 from rest_framework import serializers, viewsets, permissions, filters
-from django.db.models import QuerySet
+from django.db.models import Case, IntegerField, QuerySet, Value, When
 from .models import Offer
+from . import search
+from monitoring.timing import TimedSerializerMixin
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle Offer.
     Convertit les instances du modèle Offer en JSON et vice-versa,
@@ -38,7 +40,9 @@ class OfferSerializer(serializers.ModelSerializer):
 
     def get_image_url(self, obj):
         request = self.context.get("request")
-        url = getattr(getattr(obj, "image", None), "url", None)
+        image = getattr(obj, "image", None)
+        # Un ImageField vide lève ValueError sur `.url` : on ne lit l'URL que si un fichier est associé.
+        url = image.url if image else None
         if not url:
             url = getattr(obj, "image_url", None)
         if not url:
@@ -57,13 +61,50 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         # Pour les autres méthodes (écriture), l'utilisateur doit être
-        # authentifié.
-        user = request.user
-        return bool(
-            user
-            and user.is_authenticated
-            and (getattr(user, "is_staff", False) or getattr(user, "is_admin", False))
-        )
+        # un administrateur.
+        return is_admin(request.user)
+
+def is_admin(user) -> bool:
+    return bool(
+        user
+        and user.is_authenticated
+        and (getattr(user, "is_staff", False) or getattr(user, "is_admin", False))
+    )
+
+
+def rank_by_search(queryset: QuerySet, query: str) -> QuerySet:
+    """Restreint aux offres trouvées par l'index et annote leur rang (`search_rank`)."""
+    ids = search.search(query)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(pk__in=ids).annotate(search_rank=Case(
+        *(When(pk=pk, then=Value(rank)) for rank, pk in enumerate(ids)),
+        output_field=IntegerField(),
+    ))
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Recherche par l'index en mémoire (offers/search.py) pour le public.
+    Les administrateurs, qui voient aussi les offres inactives (absentes de
+    l'index), gardent la recherche en base de `SearchFilter`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        if not query.strip() or is_admin(request.user):
+            return super().filter_queryset(request, queryset, view)
+        return rank_by_search(queryset, query.replace(",", " "))
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """Sans `ordering` explicite, une recherche est triée par pertinence."""
+
+    def filter_queryset(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and "search_rank" in queryset.query.annotations:
+            return queryset.order_by("search_rank")
+        return super().filter_queryset(request, queryset, view)
+
 
 class OfferViewSet(viewsets.ModelViewSet):
     """
@@ -74,7 +115,7 @@ class OfferViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Offer.objects.all().order_by("sort_order", "name")
 
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [OfferSearchFilter, RankedOrderingFilter]
     search_fields = ["name", "slug", "description"]
     ordering_fields = ["sort_order", "name", "price", "persons", "updated_at", "created_at"]
     ordering = ["sort_order", "name"]
@@ -86,7 +127,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         """
         qs = super().get_queryset()
         user = getattr(self, "request", None).user if hasattr(self, "request") else None
-        if not (user and user.is_authenticated and (getattr(user, "is_staff", False) or getattr(user, "is_admin", False))):
+        if not is_admin(user):
             qs = qs.filter(is_active=True)
         return qs
     
@@ -0,0 +1,58 @@
+"""
+Fichier : async_views.py (application 'offers')
+Description : Version asynchrone de la liste des offres, routée à la place
+              du `OfferViewSet` pour les lectures lorsque le projet tourne en
+              mode ASGI. Les écritures (réservées aux administrateurs) restent
+              traitées par le ViewSet synchrone.
+"""
+from functools import reduce
+import operator
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.views.decorators.csrf import csrf_exempt
+
+from jo_backend.async_api import api_response, authenticate_jwt
+from .api import OfferSerializer, OfferViewSet, is_admin, rank_by_search
+from .models import Offer
+
+_sync_list_view = OfferViewSet.as_view({"get": "list", "post": "create"})
+
+
+def _ordering(raw: str | None) -> list[str]:
+    """Reprend les règles d'`OrderingFilter` : seuls les champs autorisés sont acceptés."""
+    allowed = set(OfferViewSet.ordering_fields)
+    fields = [f.strip() for f in (raw or "").split(",") if f.strip()]
+    fields = [f for f in fields if f.lstrip("-") in allowed]
+    return fields or list(OfferViewSet.ordering)
+
+
+@csrf_exempt
+async def offer_list(request):
+    """Liste les offres (GET) ; délègue les autres méthodes au ViewSet."""
+    if request.method != "GET":
+        return await sync_to_async(_sync_list_view)(request)
+
+    user = await authenticate_jwt(request)
+    admin = is_admin(user)
+    qs = Offer.objects.all()
+    if not admin:
+        qs = qs.filter(is_active=True)
+
+    query = request.GET.get("search", "").replace(",", " ")
+    ordering = request.GET.get("ordering")
+    ranked = bool(query.strip()) and not admin
+    if ranked:
+        # Mêmes règles qu'`OfferSearchFilter` : index en mémoire, tri par pertinence par défaut.
+        qs = await sync_to_async(rank_by_search)(qs, query)
+    else:
+        # Administrateurs : même sémantique que `SearchFilter`, en base.
+        for term in query.split():
+            qs = qs.filter(reduce(operator.or_, (
+                Q(**{f"{field}__icontains": term}) for field in OfferViewSet.search_fields
+            )))
+    qs = qs.order_by("search_rank") if ranked and not ordering else qs.order_by(*_ordering(ordering))
+
+    offers = [o async for o in qs]
+    data = OfferSerializer(offers, many=True, context={"request": request}).data
+    return api_response(data)
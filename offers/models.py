@@ -9,7 +9,6 @@ Description : Définit le modèle de base de données pour les offres de billets
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
-from PIL import Image  
 
 class Offer(models.Model):
     """
@@ -89,6 +88,9 @@ class Offer(models.Model):
 
         # Vérification stricte de la taille de l'image si fournie : 900x1025
         if self.image:
+            # Import différé : Pillow n'est chargé que lors de la validation d'une image.
+            from PIL import Image
+
             try:
                 self.image.open()
                 with Image.open(self.image) as im:
@@ -0,0 +1,130 @@
+"""
+Fichier : search.py (application 'offers')
+Description : Moteur de recherche en mémoire du catalogue des offres actives.
+
+              `SearchFilter` compile chaque terme en `LIKE '%terme%'` sur
+              plusieurs colonnes, sans index possible. Ici, chaque worker
+              garde un index inversé des offres actives :
+                - tokenisation française insensible aux accents et à la casse
+                  (mots vides retirés, pluriels en -s/-x ramenés au singulier) ;
+                - poids par champ (nom et titre > slug > description) ;
+                - correspondance par préfixe (« fam » trouve « Famille »),
+                  le mot exact étant mieux classé ;
+                - chaque terme de la requête doit correspondre (ET).
+
+              Les signaux de `offers/signals.py` invalident l'index après
+              validation de la transaction ; la version est partagée par le
+              cache, pour que les autres workers (et les autres machines avec
+              REDIS_URL) reconstruisent au prochain appel.
+              Un âge maximal couvre les modifications faites sans signal
+              (`QuerySet.update`).
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from jo_backend.text import normalize_text
+
+from .models import Offer
+
+VERSION_KEY = "offers:search:version"
+
+STOPWORDS = frozenset(
+    "a au aux avec ce ces d de des du en et l la le les leur ou par pour sa se ses sur un une".split()
+)
+
+# Poids des champs indexés.
+FIELDS = {"name": 3.0, "titre": 3.0, "slug": 2.0, "description": 1.0}
+PREFIX_FACTOR = 0.6
+
+
+def tokenize(text: str | None) -> list[str]:
+    """« Les Pass Familles » → ['pass', 'famille']."""
+    tokens = []
+    for word in normalize_text(text).split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word[-1] in "sx" and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+class OfferIndex:
+    """Index inversé immuable : jeton → {offre: poids du meilleur champ}."""
+
+    def __init__(self, offers, version=None):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.postings: dict[str, dict[int, float]] = {}
+        for offer in offers:
+            for field, weight in FIELDS.items():
+                for token in tokenize(getattr(offer, field, "")):
+                    posting = self.postings.setdefault(token, {})
+                    posting[offer.pk] = max(posting.get(offer.pk, 0.0), weight)
+        self.vocabulary = sorted(self.postings)
+
+    def _prefixed(self, term: str):
+        i = bisect_left(self.vocabulary, term)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            yield self.vocabulary[i]
+            i += 1
+
+    def search(self, query: str) -> list[int]:
+        """Identifiants des offres correspondantes, les plus pertinentes d'abord."""
+        scores: dict[int, float] | None = None
+        for term in tokenize(query):
+            term_scores: dict[int, float] = {}
+            for token in self._prefixed(term):
+                factor = 1.0 if token == term else PREFIX_FACTOR
+                for pk, weight in self.postings[token].items():
+                    term_scores[pk] = max(term_scores.get(pk, 0.0), weight * factor)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pk: s + term_scores[pk] for pk, s in scores.items() if pk in term_scores}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        # À pertinence égale, ordre stable (identifiant croissant) ; le tri du catalogue reste possible via `ordering`.
+        return sorted(scores, key=lambda pk: (-scores[pk], pk))
+
+
+_index: OfferIndex | None = None
+_lock = threading.Lock()
+
+
+def _active_offers():
+    return Offer.objects.filter(is_active=True).only("pk", *FIELDS)
+
+
+def _is_stale(index: OfferIndex, version) -> bool:
+    return index.version != version or time.monotonic() - index.built_at > settings.OFFER_SEARCH_MAX_AGE
+
+
+def get_index() -> OfferIndex:
+    """Index courant, reconstruit s'il a été invalidé (ici ou par un autre processus) ou s'il est trop ancien."""
+    global _index
+    version = cache.get(VERSION_KEY)
+    index = _index
+    if index is None or _is_stale(index, version):
+        with _lock:
+            index = _index
+            if index is None or _is_stale(index, version):
+                index = _index = OfferIndex(_active_offers(), version)
+    return index
+
+
+def search(query: str) -> list[int]:
+    return get_index().search(query)
+
+
+def invalidate():
+    """Appelé par les signaux : nouvelle version partagée, index local abandonné."""
+    global _index
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    _index = None
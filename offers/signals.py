@@ -9,14 +9,18 @@ Description : Ce fichier met en place une automatisation:
 from __future__ import annotations
 import json
 import os
+import time
 from urllib.parse import urljoin
 from pathlib import Path
 from django.conf import settings
 from django.conf import settings
 from jo_backend.github_dispatch import send_repository_dispatch
+from monitoring.metrics import SIGNAL_PUBLISH_DURATION
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from . import search
 from .models import Offer
 
 # --- Configuration des chemins (modifiable via les variables d'environnement) ---
@@ -138,6 +142,7 @@ def _trigger_front_sync(why: str, offer_id: int):
     event = cfg.get("EVENT", "offres_updated")
 
     if not (token and owner and repo):
+        SIGNAL_PUBLISH_DURATION.labels("repository_dispatch", "skipped").observe(0)
         return
 
     payload = {
@@ -145,29 +150,43 @@ def _trigger_front_sync(why: str, offer_id: int):
         "offer_id": offer_id,
         "backend": "fly:jobackend",
     }
+    start = time.perf_counter()
+    outcome = "ok"
     try:
         send_repository_dispatch(owner, repo, token, event, client_payload=payload)
     except Exception:
+        outcome = "error"
         import logging
         logging.exception("Repository dispatch failed")
+    SIGNAL_PUBLISH_DURATION.labels("repository_dispatch", outcome).observe(time.perf_counter() - start)
 
 
-# --- Connexion des signaux ---
-@receiver(post_save, sender=Offer)
-def offer_saved(sender, instance, created, **kwargs):
+def _regenerate_offres_js():
+    """Regénère `offres.js` sans jamais bloquer l'enregistrement, et mesure la durée."""
+    start = time.perf_counter()
+    outcome = "ok"
     try:
         _write_offres_js()
     except Exception as e:
+        outcome = "error"
         print("[offers.signals] WARN: génération offres.js échouée:", e)
+    SIGNAL_PUBLISH_DURATION.labels("offres_js", outcome).observe(time.perf_counter() - start)
+
+
+# --- Connexion des signaux ---
+# L'index n'est invalidé qu'après validation : reconstruit plus tôt (ici ou dans un
+# autre worker), il relirait l'état d'avant la modification et le garderait.
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    transaction.on_commit(search.invalidate)
+    _regenerate_offres_js()
     _trigger_front_sync("created" if created else "updated", instance.id)
 
 
 @receiver(post_delete, sender=Offer)
 def offer_deleted(sender, instance, **kwargs):
-    try:
-        _write_offres_js()
-    except Exception as e:
-        print("[offers.signals] WARN: génération offres.js échouée:", e)
+    transaction.on_commit(search.invalidate)
+    _regenerate_offres_js()
     _trigger_front_sync("deleted", instance.id)
 
 
@@ -0,0 +1,27 @@
+"""
+Fichier : test_offers_async.py (application 'offers')
+Description : Contient les tests de la liste asynchrone des offres (mode ASGI).
+"""
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from offers.async_views import offer_list
+from offers.models import Offer
+
+pytestmark = pytest.mark.django_db
+
+
+# Teste que la liste asynchrone applique le filtre actif, la recherche et le tri.
+def test_async_offer_list_filters_and_orders(monkeypatch, tmp_path):
+    monkeypatch.setenv("FRONT_OFFRES_JS_PATH", str(tmp_path / "offres.js"))
+    Offer.objects.create(name="Solo A", price=25, persons=1, is_active=True)
+    Offer.objects.create(name="Duo B", price=40, persons=2, is_active=True)
+    Offer.objects.create(name="Famille C", price=90, persons=4, is_active=False)
+
+    response = async_to_sync(offer_list)(RequestFactory().get("/api/offers/", {"ordering": "-price"}))
+    data = json.loads(response.content)
+    assert [o["name"] for o in data] == ["Duo B", "Solo A"]
+
+    response = async_to_sync(offer_list)(RequestFactory().get("/api/offers/", {"search": "solo"}))
+    assert [o["name"] for o in json.loads(response.content)] == ["Solo A"]
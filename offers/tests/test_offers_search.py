@@ -0,0 +1,84 @@
+"""
+Fichier : test_offers_search.py (application 'offers')
+Description : Contient les tests du moteur de recherche en mémoire des offres
+              (tokenisation, préfixes, classement, invalidation) et de son
+              branchement dans l'API.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from offers import search
+from offers.models import Offer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch, tmp_path):
+    monkeypatch.setenv("FRONT_OFFRES_JS_PATH", str(tmp_path / "offres.js"))
+    cache.clear()
+    search.invalidate()
+    yield
+    search.invalidate()
+
+
+def _offers():
+    return {
+        "solo": Offer.objects.create(name="Pass Solo", price=25, category="solo", description="Accès athlétisme"),
+        "famille": Offer.objects.create(name="Pass Familles", price=90, category="famille",
+                                        description="Quatre places pour la finale d'athlétisme"),
+        "natation": Offer.objects.create(name="Natation Duo", price=40, category="duo", description="Centre aquatique"),
+        "inactive": Offer.objects.create(name="Athlétisme VIP", price=300, is_active=False),
+    }
+
+
+def test_tokenize_is_accent_insensitive_and_french_aware():
+    """Teste la tokenisation : accents, casse, mots vides et pluriels."""
+    assert search.tokenize("Les Pass FAMILLES pour l'Athlétisme") == ["pass", "famille", "athletisme"]
+
+
+def test_prefix_matching_ranking_and_and_semantics():
+    """Teste les préfixes, le classement par champ et l'obligation de tous les termes."""
+    o = _offers()
+    assert search.search("fam") == [o["famille"].pk]
+    # Le nom pèse plus que la description ; les offres inactives ne sont pas indexées.
+    assert search.search("athle") == [o["solo"].pk, o["famille"].pk]
+    assert search.search("pass athletisme finale") == [o["famille"].pk]
+    assert search.search("aquatique solo") == []
+    assert search.search("de la") == []
+
+
+def test_signals_invalidate_and_other_workers_rebuild(django_capture_on_commit_callbacks):
+    """Teste que l'enregistrement d'une offre rend l'index obsolète, ici comme dans les autres processus."""
+    o = _offers()
+    index = search.get_index()
+    assert search.get_index() is index
+    with django_capture_on_commit_callbacks() as callbacks:
+        o["natation"].name = "Plongeon Duo"
+        o["natation"].save()
+        # Pas encore validé : l'index n'est pas reconstruit sur l'état d'avant.
+        assert search.get_index() is index
+    for callback in callbacks:
+        callback()
+    assert search.search("plongeon") == [o["natation"].pk]
+
+    # Un autre worker : index local intact, version partagée changée dans le cache.
+    stale = search.get_index()
+    cache.set(search.VERSION_KEY, "autre-version")
+    assert search.get_index() is not stale
+
+
+def test_api_uses_index_for_public_and_database_for_admins(api_client):
+    """Teste l'API : tri par pertinence pour le public, recherche en base (offres inactives) pour l'admin."""
+    o = _offers()
+    r = api_client.get(reverse("offers:offer-list"), {"search": "athle"})
+    assert [x["id"] for x in r.json()] == [o["solo"].pk, o["famille"].pk]
+    r = api_client.get(reverse("offers:offer-list"), {"search": "athle", "ordering": "-price"})
+    assert [x["id"] for x in r.json()] == [o["famille"].pk, o["solo"].pk]
+
+    admin = get_user_model().objects.create_user(username="admin", password="x", is_staff=True)
+    api_client.force_authenticate(user=admin)
+    r = api_client.get(reverse("offers:offer-list"), {"search": "Athlétisme"})
+    assert {x["id"] for x in r.json()} == {o["solo"].pk, o["famille"].pk, o["inactive"].pk}
@@ -5,6 +5,7 @@ Description : Définit les routes de l'API pour les offres.
               toutes les URL nécessaires pour le ViewSet.
 """
 app_name = "offers"
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from .api import OfferViewSet
@@ -17,3 +18,9 @@ router.register(r"offers", OfferViewSet, basename="offer")
 
 urlpatterns = router.urls
 
+# En mode ASGI, la liste des offres est servie par une vue asynchrone
+# (déclarée avant les routes du routeur pour être résolue en priorité).
+if settings.ASYNC_API_VIEWS:
+    from .async_views import offer_list
+    urlpatterns = [path("offers/", offer_list, name="offer-list")] + urlpatterns
+
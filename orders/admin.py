@@ -1,11 +1,17 @@
 """
 Fichier : admin.py (application 'orders')
-Description : Personnalise l'affichage et la gestion des modèles de commande
-            
+Description : Personnalise l'affichage et la gestion des modèles de commande.
+              Les listes sont dimensionnées pour des millions de lignes :
+              jointures en une requête, décompte estimé, recherche par
+              préfixe sur colonnes indexées (orders/lookup.py) et tri par
+              clé primaire.
 """
 
 from django.contrib import admin
+from jo_backend.pagination import EstimatedCountPaginator
+from .lookup import lookup_ids
 from .models import Reservation, ReservationItem, Ticket
+from .views import tickets_pdf_response
 
 
 class ReservationItemInline(admin.TabularInline):
@@ -17,21 +23,54 @@ class ReservationItemInline(admin.TabularInline):
     extra = 0
 
 
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Réglages communs aux tables volumineuses : pas de `COUNT(*)` complet,
+    tri par clé primaire décroissante (index de la clé, ordre de création).
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ("-id",)
+    date_hierarchy = "created_at"
+
+
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(LargeTableAdmin):
     """
     Configuration de l'interface d'administration pour le modèle Reservation.
     """
     list_display = ("id", "user", "client_nom", "client_prenom", "client_email", "total", "places", "created_at")
-    list_filter = ("created_at",)
-    search_fields = ("client_nom", "client_prenom", "client_email", "user__username")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    # Recherche par préfixe sur colonnes indexées : voir orders/lookup.py.
+    search_fields = ("client_email_norm",)
+    search_help_text = "Numéro, e-mail, nom et/ou prénom du client, ou début de la clé du billet."
     inlines = [ReservationItemInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(pk__in=lookup_ids(search_term)), False
+
 
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(LargeTableAdmin):
     """
     Configuration de l'interface d'administration pour le modèle Ticket.
-    """ 
+    """
     list_display = ("id", "reservation", "user", "ticket_key", "created_at")
-    search_fields = ("ticket_key", "user__username", "reservation__id")
+    list_select_related = ("reservation", "user")
+    raw_id_fields = ("reservation", "user")
+    search_fields = ("=ticket_key",)
+    search_help_text = "Début de la clé du billet, numéro de réservation, e-mail ou nom du client."
+    actions = ["print_pdf"]
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(reservation_id__in=lookup_ids(search_term)), False
+
+    @admin.action(description="Imprimer les e-billets sélectionnés (PDF)")
+    def print_pdf(self, request, queryset):
+        """Réimpression groupée : le PDF est généré en flux, une page par billet."""
+        return tickets_pdf_response(queryset, "reimpression_billets.pdf")
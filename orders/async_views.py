@@ -0,0 +1,47 @@
+"""
+Fichier : async_views.py (application 'orders')
+Description : Versions asynchrones des vues de lecture les plus sollicitées
+              (vérification au contrôle d'accès, liste des billets).
+              Elles sont routées à la place des vues DRF lorsque le projet
+              tourne en mode ASGI (`SERVER_MODE=asgi`), afin qu'une attente
+              d'E/S n'immobilise plus un thread de worker.
+"""
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from jo_backend.async_api import api_response, authenticate_jwt, json_body, unauthorized
+from monitoring.metrics import record_verify_outcome
+from .models import Ticket
+from .views import VERIFY_FIELDS, MyTicketsView, _decode_ticket_token, _verify_ticket_body
+
+
+@csrf_exempt
+@require_POST
+async def verify_ticket(request):
+    """Équivalent asynchrone de `VerifyTicketAPIView.post`."""
+    payload = json_body(request)
+    data, reason = _decode_ticket_token(payload.get("token") or payload.get("qr"))
+    if reason:
+        body = {"valid": False, "reason": reason}
+    else:
+        try:
+            ticket = await Ticket.objects.select_related("reservation").only(*VERIFY_FIELDS).aget(id=data["tid"])
+            body = _verify_ticket_body(ticket, data)
+        except Ticket.DoesNotExist:
+            body = {"valid": False, "reason": "ticket_not_found"}
+
+    record_verify_outcome(body)
+    return api_response(body, status=400 if reason == "missing_token" else 200)
+
+
+@require_GET
+async def my_tickets(request):
+    """Équivalent asynchrone de `MyTicketsView.get`."""
+    user = await authenticate_jwt(request)
+    if user is None:
+        return unauthorized()
+
+    qs = Ticket.objects.filter(user=user).order_by("-id").values_list(*MyTicketsView.FIELDS)
+    rows = [row async for row in qs]
+    results = MyTicketsView._results(request, rows)
+    return api_response({"count": len(results), "results": results})
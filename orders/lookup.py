@@ -0,0 +1,66 @@
+"""
+Fichier : lookup.py (application 'orders')
+Description : Recherche de réservations par le support (API et admin).
+
+              La saisie est classée puis traduite en recherches par préfixe
+              sur des colonnes indexées, chacune exécutée séparément pour que
+              le moteur utilise son index :
+                - contient « @ »        → e-mail normalisé ;
+                - chiffres seuls        → numéro de réservation ;
+                - hexadécimal (≥ 6 car.) → début de la clé du billet ;
+                - sinon                 → nom et/ou prénom normalisés
+                  (« jean dupont » comme « dupont jean »).
+              Jamais de `icontains` : aucune requête ne parcourt la table.
+"""
+import re
+
+from django.db.models import Q
+
+from jo_backend.text import normalize_email, normalize_text
+
+from .models import Reservation
+
+HEX = re.compile(r"[0-9a-f]+")
+MIN_KEY_PREFIX = 6
+MAX_RESULTS = 50
+
+
+def _strategies(query: str) -> list[Q]:
+    query = query.strip()
+    if "@" in query:
+        return [Q(client_email_norm__startswith=normalize_email(query))]
+
+    strategies = []
+    compact = query.lower()
+    if compact.isdigit():
+        strategies.append(Q(pk=int(compact)))
+    if len(compact) >= MIN_KEY_PREFIX and HEX.fullmatch(compact):
+        strategies.append(Q(ticket__ticket_key__startswith=compact))
+
+    words = normalize_text(query).split()
+    if words and not compact.isdigit():
+        whole = " ".join(words)
+        strategies += [Q(client_nom_norm__startswith=whole), Q(client_prenom_norm__startswith=whole)]
+        if len(words) > 1:
+            first, rest = words[0], " ".join(words[1:])
+            strategies += [
+                Q(client_prenom_norm=first, client_nom_norm__startswith=rest),
+                Q(client_nom_norm=first, client_prenom_norm__startswith=rest),
+            ]
+    return strategies
+
+
+def lookup_ids(query: str, limit: int = MAX_RESULTS) -> list[int]:
+    """Identifiants des réservations correspondantes, les plus récentes d'abord."""
+    ids: set[int] = set()
+    for strategy in _strategies(query):
+        ids.update(Reservation.objects.filter(strategy).order_by("-id").values_list("id", flat=True)[:limit])
+    return sorted(ids, reverse=True)[:limit]
+
+
+def search_reservations(query: str, limit: int = MAX_RESULTS):
+    return (
+        Reservation.objects.filter(pk__in=lookup_ids(query, limit))
+        .select_related("ticket")
+        .order_by("-id")
+    )
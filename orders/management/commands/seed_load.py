@@ -0,0 +1,185 @@
+"""
+Fichier : seed_load.py (application 'orders')
+Description : Génère un jeu de données synthétique à l'échelle de la production
+              (utilisateurs, réservations, lignes de réservation, billets) pour
+              reproduire les performances de `MyTicketsView`, des listes de
+              l'admin et de la vérification des billets.
+
+              Les lignes sont insérées par `bulk_create` dans des transactions
+              par lots, avec des identifiants attribués à l'avance (MySQL ne
+              retourne pas les clés d'une insertion groupée). Le signal
+              `post_save` de génération de l'account_key et l'écriture des
+              images QR sont volontairement court-circuités : les clés sont
+              fournies directement et les billets référencent un nom de fichier
+              sans le créer. Une même graine produit toujours la même
+              répartition (seules les clés secrètes restent aléatoires).
+
+Exemple :
+    python manage.py seed_load --users 500000 --tickets 5000000 --seed 2024
+"""
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from offers.models import Offer
+from orders.models import Reservation, ReservationItem, Ticket
+
+FIRST_NAMES = ["Léa", "Hugo", "Chloé", "Lucas", "Emma", "Louis", "Inès", "Jules", "Manon", "Adam", "Zoé", "Noé"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand", "Leroy", "Moreau", "Lefèvre"]
+
+
+@contextmanager
+def _explicit_created_at(*models):
+    """Désactive temporairement `auto_now_add` pour insérer des dates réparties sur la période."""
+    fields = [m._meta.get_field("created_at") for m in models]
+    previous = [f.auto_now_add for f in fields]
+    for f in fields:
+        f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, value in zip(fields, previous):
+            f.auto_now_add = value
+
+
+def _next_id(model) -> int:
+    return (model.objects.aggregate(m=Max("id"))["m"] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = "Génère des utilisateurs, réservations et billets synthétiques en masse (bulk_create)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--tickets", type=int, default=50_000, help="Nombre de billets (réservations payées).")
+        parser.add_argument("--paid-ratio", type=float, default=0.8,
+                            help="Part des réservations payées (les autres restent sans billet).")
+        parser.add_argument("--max-items", type=int, default=3, help="Lignes maximum par réservation.")
+        parser.add_argument("--skew", type=float, default=1.0,
+                            help="1 = réservations réparties uniformément ; > 1 = concentrées sur peu d'utilisateurs.")
+        parser.add_argument("--days", type=int, default=30, help="Durée de la période de vente simulée.")
+        parser.add_argument("--start", default="", help="Début de la période (AAAA-MM-JJ), défaut : il y a --days jours.")
+        parser.add_argument("--chunk-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=2024)
+        parser.add_argument("--prefix", default="load", help="Préfixe des noms d'utilisateur générés.")
+
+    def handle(self, *args, **opts):
+        if opts["users"] < 1 or opts["tickets"] < 0 or not 0 < opts["paid_ratio"] <= 1:
+            raise CommandError("--users ≥ 1, --tickets ≥ 0 et 0 < --paid-ratio ≤ 1 sont requis.")
+
+        self.rng = random.Random(opts["seed"])
+        self.opts = opts
+        self.chunk = max(100, opts["chunk_size"])
+        if opts["start"]:
+            self.start = timezone.make_aware(datetime.fromisoformat(opts["start"]))
+        else:
+            self.start = timezone.now() - timedelta(days=opts["days"])
+        self.window = timedelta(days=opts["days"]).total_seconds()
+        self.offers = list(Offer.objects.values_list("id", "titre", "price")) or [
+            (1, "Solo", Decimal("25.00")), (2, "Duo", Decimal("45.00")), (3, "Famille", Decimal("90.00")),
+        ]
+
+        started = time.perf_counter()
+        first_user_id = self._seed_users()
+        with _explicit_created_at(Reservation, Ticket):
+            self._seed_reservations(first_user_id)
+        self.stdout.write(self.style.SUCCESS(f"Jeu de données généré en {time.perf_counter() - started:.1f} s."))
+
+    def _progress(self, label: str, done: int, total: int, started: float):
+        rate = done / max(time.perf_counter() - started, 1e-6)
+        self.stdout.write(f"  {label} : {done}/{total} ({rate:,.0f}/s)")
+
+    # --- Utilisateurs ---
+
+    def _seed_users(self) -> int:
+        User = get_user_model()
+        total = self.opts["users"]
+        first_id = _next_id(User)
+        # Un seul hachage PBKDF2 partagé : le coût par utilisateur est nul.
+        password = make_password("Load!Passw0rd-2024")
+        prefix = f"{self.opts['prefix']}{self.opts['seed']}_"
+        started = time.perf_counter()
+
+        for offset in range(0, total, self.chunk):
+            batch = []
+            for i in range(offset, min(offset + self.chunk, total)):
+                batch.append(User(
+                    id=first_id + i,
+                    username=f"{prefix}{i}",
+                    email=f"{prefix}{i}@load.local",
+                    password=password,
+                    # Fournie directement : le signal post_save n'est pas émis par bulk_create.
+                    account_key=secrets.token_hex(32),
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(batch, batch_size=self.chunk)
+            self._progress("utilisateurs", offset + len(batch), total, started)
+        return first_id
+
+    # --- Réservations, lignes et billets ---
+
+    def _pick_user(self, first_user_id: int) -> int:
+        users = self.opts["users"]
+        # Loi puissance : avec skew > 1, les premiers utilisateurs concentrent les réservations.
+        return first_user_id + min(users - 1, int(users * self.rng.random() ** self.opts["skew"]))
+
+    def _seed_reservations(self, first_user_id: int):
+        tickets_total = self.opts["tickets"]
+        reservations_total = max(tickets_total, round(tickets_total / self.opts["paid_ratio"]))
+        res_id, item_id, ticket_id = _next_id(Reservation), _next_id(ReservationItem), _next_id(Ticket)
+        tickets_left = tickets_total
+        started = time.perf_counter()
+
+        for offset in range(0, reservations_total, self.chunk):
+            size = min(self.chunk, reservations_total - offset)
+            reservations, items, tickets = [], [], []
+            for _ in range(size):
+                user_id = self._pick_user(first_user_id)
+                created = self.start + timedelta(seconds=self.rng.random() * self.window)
+                lines = [self.rng.choice(self.offers) for _ in range(self.rng.randint(1, self.opts["max_items"]))]
+                places = 0
+                total = Decimal("0.00")
+                for offer_id, titre, price in lines:
+                    qty = self.rng.randint(1, 4)
+                    places += qty
+                    total += price * qty
+                    items.append(ReservationItem(id=item_id, reservation_id=res_id, offre_id=str(offer_id),
+                                                 titre=titre or "Offre", prix=price, qty=qty))
+                    item_id += 1
+                reservation = Reservation(
+                    id=res_id, user_id=user_id, created_at=created,
+                    client_nom=self.rng.choice(LAST_NAMES), client_prenom=self.rng.choice(FIRST_NAMES),
+                    client_email=f"client{res_id}@load.local", total=total, places=places,
+                )
+                # bulk_create n'appelle pas save() : colonnes de recherche calculées ici.
+                reservation.fill_lookup_fields()
+                reservations.append(reservation)
+                # Répartit les billets restants sur les réservations restantes.
+                remaining = reservations_total - (offset + len(reservations)) + 1
+                if tickets_left and self.rng.random() < tickets_left / remaining:
+                    tickets.append(Ticket(
+                        id=ticket_id, user_id=user_id, reservation_id=res_id,
+                        ticket_key=secrets.token_hex(32),
+                        # Nom de fichier référencé sans écrire l'image QR.
+                        qr_image=f"tickets/ticket_{ticket_id}.png",
+                        created_at=created + timedelta(seconds=self.rng.randint(30, 900)),
+                    ))
+                    ticket_id += 1
+                    tickets_left -= 1
+                res_id += 1
+
+            with transaction.atomic():
+                Reservation.objects.bulk_create(reservations, batch_size=self.chunk)
+                ReservationItem.objects.bulk_create(items, batch_size=self.chunk)
+                Ticket.objects.bulk_create(tickets, batch_size=self.chunk)
+            self._progress("réservations", offset + size, reservations_total, started)
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+from jo_backend.text import normalize_email, normalize_text
+
+BATCH = 5000
+
+
+def backfill_lookup_columns(apps, schema_editor):
+    """Remplit les colonnes normalisées par lots de clés primaires, avant la création des index."""
+    Reservation = apps.get_model("orders", "Reservation")
+    last_id = 0
+    while True:
+        batch = list(
+            Reservation.objects.filter(id__gt=last_id).order_by("id")
+            .only("id", "client_email", "client_nom", "client_prenom")[:BATCH]
+        )
+        if not batch:
+            break
+        for r in batch:
+            r.client_email_norm = normalize_email(r.client_email)
+            r.client_nom_norm = normalize_text(r.client_nom)
+            r.client_prenom_norm = normalize_text(r.client_prenom)
+        Reservation.objects.bulk_update(batch, ["client_email_norm", "client_nom_norm", "client_prenom_norm"])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_admin_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='client_email_norm',
+            field=models.CharField(default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='client_nom_norm',
+            field=models.CharField(default='', editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='client_prenom_norm',
+            field=models.CharField(default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(backfill_lookup_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['client_email_norm'], name='orders_rese_client__1d70aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['client_nom_norm', 'client_prenom_norm'], name='orders_rese_client__f3e381_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['client_prenom_norm'], name='orders_rese_client__adaa2c_idx'),
+        ),
+    ]
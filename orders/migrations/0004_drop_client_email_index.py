@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_reservation_lookup_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='orders_rese_client__4f8980_idx',
+        ),
+    ]
@@ -8,6 +8,8 @@ Description : Définit les modèles pour le processus de commande,
 from django.conf import settings
 from django.db import models
 
+from jo_backend.text import normalize_email, normalize_text
+
 
 class Reservation(models.Model):
     """
@@ -29,16 +31,43 @@ class Reservation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Colonnes de recherche du support (préfixe indexé), tenues à jour par save().
+    client_email_norm = models.CharField(max_length=254, default="", editable=False)
+    client_nom_norm = models.CharField(max_length=150, default="", editable=False)
+    client_prenom_norm = models.CharField(max_length=150, default="", editable=False)
+
+    LOOKUP_SOURCES = {"client_email", "client_nom", "client_prenom"}
+    LOOKUP_FIELDS = {"client_email_norm", "client_nom_norm", "client_prenom_norm"}
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "created_at"]),
+            # Hiérarchie par date de l'admin.
+            models.Index(fields=["created_at"]),
+            # Recherche du support : e-mail, nom puis prénom, prénom seul.
+            models.Index(fields=["client_email_norm"]),
+            models.Index(fields=["client_nom_norm", "client_prenom_norm"]),
+            models.Index(fields=["client_prenom_norm"]),
         ]
 
     def __str__(self) -> str:
         """Représentation textuelle de l'objet, utile dans l'admin."""
         return f"Reservation #{self.id} par {self.client_prenom} {self.client_nom} (user={self.user_id})"
 
+    def fill_lookup_fields(self):
+        """Calcule les colonnes normalisées (à appeler avant un bulk_create)."""
+        self.client_email_norm = normalize_email(self.client_email)
+        self.client_nom_norm = normalize_text(self.client_nom)
+        self.client_prenom_norm = normalize_text(self.client_prenom)
+
+    def save(self, *args, **kwargs):
+        self.fill_lookup_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.LOOKUP_SOURCES & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, *self.LOOKUP_FIELDS}
+        super().save(*args, **kwargs)
+
 
 class ReservationItem(models.Model):
     """
@@ -90,6 +119,7 @@ class Ticket(models.Model):
         indexes = [
             models.Index(fields=["user", "created_at"]),
             models.Index(fields=["ticket_key"]),
+            models.Index(fields=["created_at"]),
         ]
 
     def __str__(self) -> str:
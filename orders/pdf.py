@@ -0,0 +1,180 @@
+"""
+Fichier : pdf.py (application 'orders')
+Description : Rendu des e-billets au format PDF (une page par billet) avec le
+              récapitulatif de la réservation et le QR code vectoriel.
+
+              Le document est produit en flux : chaque page est émise dès
+              qu'elle est rendue, seules les positions des objets (table xref)
+              sont conservées jusqu'à la fin. Une réimpression de milliers de
+              billets reste donc à mémoire bornée. Les polices (Helvetica
+              standard, non embarquée) et le gabarit commun des pages sont
+              construits une seule fois par processus.
+"""
+import zlib
+from functools import lru_cache
+
+from django.utils import timezone
+
+from monitoring.metrics import QR_RENDER_DURATION
+
+from .utils import ticket_qr_payload
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 en points
+
+# Numéros d'objets fixes ; les pages sont numérotées à partir de FIRST_PAGE_OBJ.
+CATALOG_OBJ, PAGES_OBJ, FONT_OBJ, FONT_BOLD_OBJ, TEMPLATE_OBJ = 1, 2, 3, 4, 5
+FIRST_PAGE_OBJ = 6
+
+MAX_ITEM_LINES = 18
+
+
+def _pdf_text(value) -> bytes:
+    """Encode une chaîne en littéral PDF (WinAnsi), caractères spéciaux échappés."""
+    raw = str(value).encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _text(x: int, y: int, value, size: int = 11, font: bytes = b"F1") -> bytes:
+    return b"BT /%s %d Tf %d %d Td %s Tj ET\n" % (font, size, x, y, _pdf_text(value))
+
+
+def _stream(content: bytes, extra: bytes = b"") -> bytes:
+    data = zlib.compress(content)
+    return b"<< /Length %d /Filter /FlateDecode %s>>\nstream\n%s\nendstream" % (len(data), extra, data)
+
+
+@lru_cache(maxsize=None)
+def _font_object(base_font: str) -> bytes:
+    """Police Type1 standard (non embarquée), construite une fois par processus."""
+    return b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font.encode()
+
+
+@lru_cache(maxsize=None)
+def _template_object() -> bytes:
+    """
+    Gabarit commun à toutes les pages (bandeau, pied de page), rendu une fois par
+    processus et inclus une seule fois par document sous forme de Form XObject.
+    """
+    content = b"".join([
+        b"0.05 0.16 0.42 rg 0 762 %d 80 re f\n" % PAGE_WIDTH,
+        b"1 g\n",
+        _text(40, 795, "Jeux Olympiques - E-billet", size=22, font=b"F2"),
+        b"0 g 0.6 G 40 70 m %d 70 l S\n" % (PAGE_WIDTH - 40),
+        _text(40, 52, "Billet nominatif et personnel. Présentez ce QR code au contrôle d'accès.", size=9),
+    ])
+    extra = b"/Type /XObject /Subtype /Form /BBox [0 0 %d %d] /Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> " % (
+        PAGE_WIDTH, PAGE_HEIGHT, FONT_OBJ, FONT_BOLD_OBJ,
+    )
+    return _stream(content, extra)
+
+
+@QR_RENDER_DURATION.labels("pdf").time()
+def _qr_commands(qr_payload: str, x: int, y: int, size: int) -> bytes:
+    """Dessine le QR code en rectangles vectoriels (modules contigus fusionnés par ligne)."""
+    import qrcode
+
+    code = qrcode.QRCode(border=2)
+    code.add_data(qr_payload)
+    code.make(fit=True)
+    matrix = code.get_matrix()
+    module = size / len(matrix)
+
+    parts = [b"0 g\n"]
+    for row_idx, row in enumerate(matrix):
+        top = y + size - (row_idx + 1) * module
+        col = 0
+        while col < len(row):
+            if not row[col]:
+                col += 1
+                continue
+            start = col
+            while col < len(row) and row[col]:
+                col += 1
+            parts.append(b"%.2f %.2f %.2f %.2f re\n" % (x + start * module, top, (col - start) * module, module))
+    parts.append(b"f\n")
+    return b"".join(parts)
+
+
+def _page_content(ticket) -> bytes:
+    """Contenu d'une page : récapitulatif de la réservation, lignes de commande et QR code."""
+    res = ticket.reservation
+    created = timezone.localtime(ticket.created_at).strftime("%d/%m/%Y %H:%M") if ticket.created_at else ""
+    lines = [
+        b"/Tpl Do\n",
+        _text(40, 720, f"Billet n° {ticket.id}", size=18, font=b"F2"),
+        _text(40, 690, f"Réservation n° {ticket.reservation_id}"),
+        _text(40, 672, f"Titulaire : {res.client_prenom} {res.client_nom}"),
+        _text(40, 654, f"Email : {res.client_email}"),
+        _text(40, 636, f"Places : {res.places}"),
+        _text(40, 618, f"Total : {res.total} €"),
+        _text(40, 600, f"Émis le : {created}"),
+        _text(40, 560, "Détail de la commande", size=13, font=b"F2"),
+    ]
+
+    items = list(res.items.all())
+    y = 540
+    for item in items[:MAX_ITEM_LINES]:
+        lines.append(_text(48, y, f"- {item.titre} x{item.qty} : {item.prix} €", size=10))
+        y -= 15
+    if len(items) > MAX_ITEM_LINES:
+        lines.append(_text(48, y, f"... et {len(items) - MAX_ITEM_LINES} autre(s) ligne(s)", size=10))
+
+    lines.append(_qr_commands(ticket_qr_payload(ticket), x=345, y=470, size=210))
+    return b"".join(lines)
+
+
+class _PdfWriter:
+    """Sérialise des objets PDF en mémorisant uniquement leur position (table xref)."""
+
+    def __init__(self):
+        self.offset = 0
+        self.xref: dict[int, int] = {}
+
+    def raw(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+
+    def obj(self, num: int, body: bytes) -> bytes:
+        self.xref[num] = self.offset
+        return self.raw(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+
+    def trailer(self) -> bytes:
+        size = max(self.xref) + 1
+        xref_offset = self.offset
+        rows = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        rows += [b"%010d 00000 n \n" % self.xref[num] for num in range(1, size)]
+        rows.append(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, CATALOG_OBJ, xref_offset))
+        return self.raw(b"".join(rows))
+
+
+def iter_tickets_pdf(tickets):
+    """
+    Génère un PDF multi-pages (une page par billet) morceau par morceau.
+    Les billets doivent être chargés avec leur réservation ; précharger
+    `reservation__items` évite une requête par page.
+    """
+    writer = _PdfWriter()
+    yield writer.raw(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    yield writer.obj(CATALOG_OBJ, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES_OBJ)
+    yield writer.obj(FONT_OBJ, _font_object("Helvetica"))
+    yield writer.obj(FONT_BOLD_OBJ, _font_object("Helvetica-Bold"))
+    yield writer.obj(TEMPLATE_OBJ, _template_object())
+
+    resources = b"<< /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << /Tpl %d 0 R >> >>" % (
+        FONT_OBJ, FONT_BOLD_OBJ, TEMPLATE_OBJ,
+    )
+    kids: list[int] = []
+    num = FIRST_PAGE_OBJ
+    for ticket in tickets:
+        content_num, page_num = num, num + 1
+        num += 2
+        chunk = writer.obj(content_num, _stream(_page_content(ticket)))
+        chunk += writer.obj(page_num, b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>" % (
+            PAGES_OBJ, PAGE_WIDTH, PAGE_HEIGHT, resources, content_num,
+        ))
+        kids.append(page_num)
+        yield chunk
+
+    kids_ref = b" ".join(b"%d 0 R" % k for k in kids)
+    yield writer.obj(PAGES_OBJ, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids_ref, len(kids)))
+    yield writer.trailer()
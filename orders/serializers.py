@@ -7,6 +7,7 @@ Description : Gère la validation et la transformation des données pour les
 
 from decimal import Decimal
 from rest_framework import serializers
+from monitoring.timing import TimedSerializerMixin
 from .models import Reservation, ReservationItem, Ticket 
 
 
@@ -26,7 +27,7 @@ class CartItemSerializer(serializers.Serializer):
     qty = serializers.IntegerField(min_value=1)
 
 
-class ReservationCreateSerializer(serializers.Serializer):
+class ReservationCreateSerializer(TimedSerializerMixin, serializers.Serializer):
     """Définit la structure et la validation pour un article du panier."""
     client = ClientSerializer()
     panier = CartItemSerializer(many=True)
@@ -89,7 +90,7 @@ class ReservationItemOutSerializer(serializers.ModelSerializer):
         fields = ("offre_id", "titre", "prix", "qty")
 
 
-class ReservationDetailSerializer(serializers.ModelSerializer):
+class ReservationDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer complet pour afficher les détails d'une réservation et de ses articles."""
     items = ReservationItemOutSerializer(many=True, read_only=True)
 
@@ -101,10 +102,11 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
         )
         read_only_fields = fields
 
-class TicketDetailSerializer(serializers.ModelSerializer):
+class TicketDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer pour afficher les détails d'un ticket, y compris l'URL absolue du QR code."""
     qr_url = serializers.SerializerMethodField()
-    reservation_id = serializers.IntegerField(source="reservation.id", read_only=True)
+    # Lu directement sur la clé étrangère : pas de chargement de la réservation.
+    reservation_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Ticket
@@ -0,0 +1,65 @@
+"""
+Fichier : test_admin.py
+Description : Teste les listes de l'admin des commandes sur de gros volumes :
+              nombre de requêtes constant, recherche indexée et décompte borné.
+"""
+import secrets
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jo_backend.pagination import EstimatedCountPaginator
+from orders.models import Reservation, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def _tickets(n, prefix="u"):
+    for i in range(n):
+        user = User.objects.create_user(username=f"{prefix}{i}", password="x")
+        res = Reservation.objects.create(
+            user=user, client_nom="Doe", client_prenom="Jane", client_email=f"{prefix}{i}@example.com",
+            total=Decimal("10.00"), places=1,
+        )
+        Ticket.objects.create(user=user, reservation=res, ticket_key=secrets.token_hex(32), qr_image="tickets/x.png")
+
+
+def _changelist_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url).status_code == 200
+    return len(ctx)
+
+
+@pytest.mark.parametrize("model", ["reservation", "ticket"])
+def test_changelist_queries_do_not_grow_with_rows(admin_client, model):
+    """Teste que les objets liés de la liste sont joints, pas chargés ligne par ligne."""
+    url = reverse(f"admin:orders_{model}_changelist")
+    _tickets(2, "a")
+    few = _changelist_queries(admin_client, url)
+    _tickets(8, "b")
+    assert _changelist_queries(admin_client, url) == few
+
+
+def test_search_uses_lookup_and_tolerates_text(admin_client):
+    """Teste la recherche par e-mail, début de clé de billet et saisie quelconque."""
+    _tickets(3)
+    r = admin_client.get(reverse("admin:orders_reservation_changelist"), {"q": "U1@example.com"})
+    assert list(r.context["cl"].result_list.values_list("client_email", flat=True)) == ["u1@example.com"]
+    key = Ticket.objects.order_by("id")[2].ticket_key
+    r = admin_client.get(reverse("admin:orders_ticket_changelist"), {"q": key[:10]})
+    assert r.context["cl"].result_count == 1
+    assert admin_client.get(reverse("admin:orders_ticket_changelist"), {"q": "pas-un-nombre"}).status_code == 200
+
+
+def test_filtered_count_is_bounded(settings):
+    """Teste que le décompte d'une liste filtrée s'arrête à ADMIN_EXACT_COUNT_LIMIT."""
+    settings.ADMIN_EXACT_COUNT_LIMIT = 3
+    _tickets(5)
+    assert EstimatedCountPaginator(Reservation.objects.filter(places=1), 2).count == 3
+    # SQLite ne fournit pas d'estimation : décompte exact borné sur la liste complète aussi.
+    assert EstimatedCountPaginator(Reservation.objects.all(), 2).count == 3
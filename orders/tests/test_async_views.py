@@ -0,0 +1,62 @@
+"""
+Fichier : test_async_views.py (application 'orders')
+Description : Contient les tests des vues asynchrones servies en mode ASGI
+              (vérification de billet et liste des billets de l'utilisateur).
+"""
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.signing import dumps
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from orders.async_views import my_tickets, verify_ticket
+from orders.models import Reservation, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def make_ticket(username="hugo"):
+    user = User.objects.create_user(username=username, password="x")
+    res = Reservation.objects.create(user=user, client_nom="Doe", client_prenom="Hugo",
+                                     client_email="h@e.com", total="10.00", places=1)
+    ticket = Ticket.objects.create(user=user, reservation=res, ticket_key=username * 8,
+                                   qr_image=f"tickets/ticket_{username}.png")
+    return user, ticket
+
+
+def post_verify(payload):
+    request = RequestFactory().post("/api/verify", json.dumps(payload), content_type="application/json")
+    response = async_to_sync(verify_ticket)(request)
+    return response.status_code, json.loads(response.content)
+
+
+# Teste la vérification asynchrone d'un billet valide.
+def test_async_verify_ok():
+    _, ticket = make_ticket()
+    signed = dumps({"tid": ticket.id, "rid": ticket.reservation_id, "uid": ticket.user_id}, salt="ticket")
+    status, body = post_verify({"qr": f"jo://ticket/{signed}"})
+    assert status == 200 and body["valid"] is True
+    assert body["meta"]["ticket_id"] == ticket.id
+
+
+# Teste les mêmes raisons de rejet que la vue synchrone.
+def test_async_verify_rejections():
+    assert post_verify({}) == (400, {"valid": False, "reason": "missing_token"})
+    assert post_verify({"token": "nope"})[1]["reason"] == "bad_signature"
+    signed = dumps({"tid": 999, "rid": 1, "uid": 1}, salt="ticket")
+    assert post_verify({"token": signed})[1]["reason"] == "ticket_not_found"
+
+
+# Teste que la liste asynchrone exige un JWT puis retourne les billets.
+def test_async_my_tickets_requires_jwt():
+    user, ticket = make_ticket()
+    anonymous = async_to_sync(my_tickets)(RequestFactory().get("/api/my-tickets/"))
+    assert anonymous.status_code == 401
+
+    access = str(RefreshToken.for_user(user).access_token)
+    request = RequestFactory().get("/api/my-tickets/", HTTP_AUTHORIZATION=f"Bearer {access}")
+    body = json.loads(async_to_sync(my_tickets)(request).content)
+    assert body["count"] == 1
+    assert body["results"][0]["id"] == ticket.id and body["results"][0]["qr_url"]
@@ -0,0 +1,64 @@
+"""
+Fichier : test_lookup.py
+Description : Teste la recherche du support : colonnes normalisées tenues à
+              jour, recherche par e-mail, nom, prénom, numéro ou début de clé,
+              et API réservée au staff.
+"""
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from jo_backend.text import normalize_text
+from orders.lookup import lookup_ids
+from orders.models import Reservation, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def _reservation(nom, prenom, email):
+    user = User.objects.create_user(username=email, password="x")
+    return Reservation.objects.create(user=user, client_nom=nom, client_prenom=prenom, client_email=email,
+                                      total=Decimal("10.00"), places=1)
+
+
+def test_normalized_columns_follow_saves():
+    """Teste que les colonnes normalisées suivent les modifications, y compris avec update_fields."""
+    assert normalize_text("  Élodie D'Arc-Müller ") == "elodie d arc muller"
+    r = _reservation("Dupont-Aïdi", "Jérôme", "Jerome.D@Example.com")
+    assert (r.client_nom_norm, r.client_prenom_norm, r.client_email_norm) == ("dupont aidi", "jerome", "jerome.d@example.com")
+    r.client_nom = "Martin"
+    r.save(update_fields=["client_nom"])
+    r.refresh_from_db()
+    assert r.client_nom_norm == "martin"
+
+
+def test_lookup_strategies():
+    """Teste la recherche par e-mail, nom, prénom + nom, numéro et début de clé de billet."""
+    a = _reservation("Dupont", "Jérôme", "jerome@example.com")
+    b = _reservation("Durand", "Jeanne", "jeanne@example.com")
+    Ticket.objects.create(user=b.user, reservation=b, ticket_key="abcdef0123" + "0" * 54, qr_image="tickets/x.png")
+
+    assert lookup_ids("JEROME@ex") == [a.id]
+    assert lookup_ids("du") == [b.id, a.id]
+    assert lookup_ids("jerome dup") == [a.id]
+    assert lookup_ids("durand jeanne") == [b.id]
+    assert lookup_ids(str(a.id)) == [a.id]
+    assert lookup_ids("ABCDEF01") == [b.id]
+    assert lookup_ids("personne") == []
+
+
+def test_support_api_is_staff_only(api_client):
+    """Teste l'API de recherche : staff uniquement, résultats avec la clé du billet."""
+    r = _reservation("Dupont", "Jérôme", "jerome@example.com")
+    url = reverse("orders:support_lookup")
+    api_client.force_authenticate(user=r.user)
+    assert api_client.get(url, {"q": "dupont"}).status_code == 403
+
+    api_client.force_authenticate(user=User.objects.create_user(username="desk", password="x", is_staff=True))
+    body = api_client.get(url, {"q": "Dupont"}).json()
+    assert body["count"] == 1
+    assert body["results"][0]["id"] == r.id and body["results"][0]["ticket_key"] is None
+    assert api_client.get(url, {"q": "d"}).status_code == 400
@@ -0,0 +1,84 @@
+"""
+Fichier : test_pdf.py (application 'orders')
+Description : Contient les tests du rendu des e-billets PDF générés en flux
+              (structure du document, table xref, endpoints de téléchargement).
+"""
+import re
+import zlib
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from orders.models import Reservation, ReservationItem, Ticket
+from orders.pdf import iter_tickets_pdf
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def make_tickets(user, n):
+    tickets = []
+    for i in range(n):
+        res = Reservation.objects.create(user=user, client_nom="Dupré", client_prenom="Léa",
+                                         client_email="lea@example.com", total="30.00", places=2)
+        ReservationItem.objects.create(reservation=res, offre_id="offer_2", titre="Duo", prix="30.00", qty=1)
+        tickets.append(Ticket.objects.create(user=user, reservation=res, ticket_key=f"{i:064d}", qr_image=""))
+    return tickets
+
+
+def assert_valid_pdf(pdf: bytes, pages: int):
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert int(re.search(rb"/Count (\d+)", pdf).group(1)) == pages
+    # Chaque entrée de la table xref doit pointer sur la déclaration de son objet.
+    startxref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    rows = pdf[startxref:].split(b"\n")[3:]
+    for num, row in enumerate(rows, start=1):
+        if not row.endswith(b" n "):
+            break
+        offset = int(row[:10])
+        assert pdf[offset:].startswith(b"%d 0 obj" % num)
+
+
+# Teste qu'un PDF multi-pages est produit en plusieurs morceaux et reste valide.
+def test_iter_tickets_pdf_streams_one_page_per_ticket():
+    user = User.objects.create_user(username="lea", password="x")
+    tickets = make_tickets(user, 3)
+    chunks = list(iter_tickets_pdf(Ticket.objects.filter(user=user).select_related("reservation")))
+    assert len(chunks) > 3
+    pdf = b"".join(chunks)
+    assert_valid_pdf(pdf, pages=3)
+
+    first_page = re.search(rb"6 0 obj\n<< /Length \d+ /Filter /FlateDecode >>\nstream\n(.*?)\nendstream", pdf, re.S)
+    content = zlib.decompress(first_page.group(1))
+    assert b"/Tpl Do" in content and "Léa Dupré".encode("cp1252") in content
+
+
+# Teste les téléchargements PDF (billet unique, portefeuille) et l'isolation par utilisateur.
+def test_ticket_pdf_endpoints(api_client):
+    user = User.objects.create_user(username="lea", password="x")
+    other = User.objects.create_user(username="max", password="x")
+    tickets = make_tickets(user, 2)
+    api_client.force_authenticate(user=user)
+
+    r = api_client.get(reverse("orders:ticket_pdf", kwargs={"pk": tickets[0].id}))
+    assert r.status_code == 200 and r["Content-Type"] == "application/pdf"
+    assert_valid_pdf(b"".join(r.streaming_content), pages=1)
+
+    r = api_client.get(reverse("orders:wallet_bundle_pdf"))
+    assert_valid_pdf(b"".join(r.streaming_content), pages=2)
+
+    api_client.force_authenticate(user=other)
+    assert api_client.get(reverse("orders:ticket_pdf", kwargs={"pk": tickets[0].id})).status_code == 404
+
+
+# Teste le parcours par lots (keyset) : ordre respecté, une requête courte par lot et prefetch par lot.
+def test_iter_by_pk_walks_tickets_in_bounded_batches(django_assert_num_queries):
+    from orders.views import iter_by_pk
+
+    user = User.objects.create_user(username="ines", password="x")
+    ids = [t.id for t in make_tickets(user, 5)]
+    qs = Ticket.objects.filter(user=user).prefetch_related("reservation__items")
+    # 3 lots (2 + 2 + 1), chacun avec sa requête de billets et son prefetch (réservations, lignes).
+    with django_assert_num_queries(9):
+        tickets = list(iter_by_pk(qs, batch_size=2))
+    assert [t.id for t in tickets] == ids
+    assert [t.id for t in iter_by_pk(qs, batch_size=2, newest_first=True)] == ids[::-1]
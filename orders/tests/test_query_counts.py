@@ -0,0 +1,75 @@
+"""
+Fichier : test_query_counts.py (application 'orders')
+Description : Tests de non-régression du nombre de requêtes SQL par endpoint.
+              Le nombre de requêtes doit rester constant quel que soit le
+              nombre de billets de l'utilisateur (pas de N+1).
+"""
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.signing import dumps
+from orders.models import Reservation, ReservationItem, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture
+def owner(api_client):
+    """Utilisateur authentifié possédant 5 billets (2 lignes de commande chacun)."""
+    user = User.objects.create_user(username="quinn", password="x")
+    for i in range(5):
+        res = Reservation.objects.create(user=user, client_nom="Q", client_prenom="Q",
+                                         client_email="q@e.com", total="30.00", places=2)
+        ReservationItem.objects.bulk_create([
+            ReservationItem(reservation=res, offre_id="offer_1", titre="Solo", prix="10.00", qty=1),
+            ReservationItem(reservation=res, offre_id="offer_2", titre="Duo", prix="20.00", qty=1),
+        ])
+        Ticket.objects.create(user=user, reservation=res, ticket_key=f"{i:064d}",
+                              qr_image=f"tickets/ticket_{i}.png")
+    api_client.force_authenticate(user=user)
+    return user
+
+
+@pytest.mark.parametrize("route, queries", [
+    ("my_tickets", 1),
+    ("wallet", 1),
+])
+def test_ticket_lists_use_constant_queries(api_client, owner, django_assert_num_queries, route, queries):
+    with django_assert_num_queries(queries):
+        r = api_client.get(reverse(f"orders:{route}"))
+    assert r.status_code == 200 and r.json()["count"] == 5
+
+
+def test_ticket_detail_queries(api_client, owner, django_assert_num_queries):
+    ticket = Ticket.objects.filter(user=owner).first()
+    with django_assert_num_queries(1):
+        r = api_client.get(reverse("orders:ticket_detail", kwargs={"pk": ticket.id}))
+    assert r.json()["reservation_id"] == ticket.reservation_id
+
+
+def test_reservation_detail_queries(api_client, owner, django_assert_num_queries):
+    res = Reservation.objects.filter(user=owner).first()
+    with django_assert_num_queries(2):
+        r = api_client.get(reverse("orders:reservation_detail", kwargs={"pk": res.id}))
+    assert len(r.json()["items"]) == 2
+
+
+def test_verify_queries(api_client, owner, django_assert_num_queries):
+    ticket = Ticket.objects.filter(user=owner).first()
+    signed = dumps({"tid": ticket.id, "rid": ticket.reservation_id, "uid": ticket.user_id}, salt="ticket")
+    with django_assert_num_queries(1):
+        r = api_client.post(reverse("orders:verify_ticket"), {"token": signed}, format="json")
+    assert r.json()["valid"] is True
+
+
+def test_pdf_bundle_queries(api_client, owner, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        r = api_client.get(reverse("orders:wallet_bundle_pdf"))
+        b"".join(r.streaming_content)
+
+
+def test_offer_list_queries(api_client, owner, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        r = api_client.get(reverse("offers:offer-list"))
+    assert r.status_code == 200
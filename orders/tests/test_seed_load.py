@@ -0,0 +1,39 @@
+"""
+Fichier : test_seed_load.py (application 'orders')
+Description : Teste la commande de génération de données synthétiques
+              `seed_load` (volumes, clés de compte, absence d'écriture QR).
+"""
+import io
+import os
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from orders.models import Reservation, ReservationItem, Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+def test_seed_load_generates_requested_volumes(_tmp_media):
+    call_command("seed_load", users=20, tickets=60, paid_ratio=0.75, chunk_size=100,
+                 seed=7, start="2024-07-26", days=2, stdout=io.StringIO())
+
+    assert User.objects.count() == 20
+    assert Ticket.objects.count() == 60
+    assert Reservation.objects.count() == 80
+    assert ReservationItem.objects.count() >= 80
+    # Les clés de compte sont fournies sans passer par le signal post_save.
+    assert not User.objects.filter(account_key__isnull=True).exists()
+    # Les billets référencent un QR sans que l'image soit écrite.
+    assert not os.listdir(_tmp_media)
+    first = Reservation.objects.order_by("created_at").first()
+    assert first.created_at.date().isoformat() >= "2024-07-25"
+
+
+def test_seed_load_is_deterministic():
+    call_command("seed_load", users=5, tickets=10, seed=3, prefix="a", stdout=io.StringIO())
+    first = list(Reservation.objects.order_by("id").values_list("client_nom", "places", "total"))
+    Reservation.objects.all().delete()
+    call_command("seed_load", users=5, tickets=10, seed=3, prefix="b", stdout=io.StringIO())
+    second = list(Reservation.objects.order_by("id").values_list("client_nom", "places", "total"))
+    assert first == second
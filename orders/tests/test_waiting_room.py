@@ -0,0 +1,135 @@
+"""
+Fichier : test_waiting_room.py
+Description : Teste la salle d'attente des ouvertures de ventes : position en
+              file, admission au débit réglé, statut et jeton sans requête SQL,
+              réservation protégée par le jeton d'admission.
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from orders import waiting_room
+from orders.tests.test_reservations import valid_payload
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def room(settings):
+    cache.clear()
+    settings.WAITING_ROOM = {**settings.WAITING_ROOM, "ENABLED": True, "ADMIT_PER_SECOND": 2}
+    yield
+    cache.clear()
+
+
+def _freeze(monkeypatch, now):
+    monkeypatch.setattr(waiting_room, "_now", lambda: now)
+
+
+def test_positions_are_stable_and_admitted_at_the_configured_rate(monkeypatch):
+    """Teste qu'une position est attribuée une fois par utilisateur et que la frontière avance de `rate`/s."""
+    _freeze(monkeypatch, 1000)
+    bodies = [waiting_room.join(uid) for uid in range(1, 6)]
+    assert [b["position"] for b in bodies] == [1, 2, 3, 4, 5]
+    assert [b["admitted"] for b in bodies] == [True, True, False, False, False]
+    assert waiting_room.join(3)["position"] == 3
+
+    _freeze(monkeypatch, 1001)
+    assert waiting_room.status_for(4, 4)["admitted"] is True
+    status = waiting_room.status_for(5, 5)
+    assert status["admitted"] is False and status["ahead"] == 1 and "admission_token" not in status
+
+
+def test_room_opened_before_the_sale_does_not_bank_admissions(monkeypatch):
+    """Teste qu'une salle ouverte et interrogée longtemps avant la vente n'admet pas tout le monde d'un coup."""
+    for now in range(1000, 1600):
+        _freeze(monkeypatch, now)
+        waiting_room.stats()
+    assert waiting_room.frontier() <= 2
+    bodies = [waiting_room.join(uid) for uid in range(1, 11)]
+    assert sum(b["admitted"] for b in bodies) == 2
+
+    _freeze(monkeypatch, 1600)
+    assert waiting_room.frontier() == 4
+
+
+def test_status_endpoint_needs_no_database(api_client, django_assert_num_queries):
+    """Teste que le statut ne lit que le cache et renvoie un jeton une fois admis."""
+    ticket = waiting_room.join(7)["queue_ticket"]
+    with django_assert_num_queries(0):
+        r = api_client.get(reverse("orders:waiting_room_status"), HTTP_X_QUEUE_TICKET=ticket)
+    assert r.status_code == 200
+    assert r.json()["admitted"] is True and r.json()["admission_token"]
+
+    bad = api_client.get(reverse("orders:waiting_room_status"), {"ticket": ticket + "x"})
+    assert bad.status_code == 400
+
+
+def test_join_uses_jwt_without_user_lookup(api_client, django_assert_num_queries):
+    """Teste que l'entrée en file authentifie le JWT sans lire l'utilisateur en base."""
+    user = User.objects.create_user(username="fan", password="S3cure!Pass")
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    with django_assert_num_queries(0):
+        r = api_client.post(reverse("orders:waiting_room_join"))
+    assert r.status_code == 200
+    assert r.json()["position"] == 1 and r.json()["queue_ticket"]
+
+
+def test_reservation_requires_a_valid_single_use_admission(api_client):
+    """Teste que la réservation exige le jeton de son titulaire, utilisable une seule fois."""
+    user = User.objects.create_user(username="ada", password="S3cure!Pass")
+    other = User.objects.create_user(username="bob", password="S3cure!Pass")
+    api_client.force_authenticate(user=user)
+    url = reverse("orders:reservation_create")
+
+    r = api_client.post(url, valid_payload(), format="json")
+    assert r.status_code == 403 and r.json()["reason"] == "missing"
+
+    token = waiting_room.join(user.id)["admission_token"]
+    api_client.force_authenticate(user=other)
+    r = api_client.post(url, valid_payload(), format="json", HTTP_X_ADMISSION_TOKEN=token)
+    assert r.json()["reason"] == "invalid"
+
+    api_client.force_authenticate(user=user)
+    invalid = {**valid_payload(), "total": "999.00"}
+    assert api_client.post(url, invalid, format="json", HTTP_X_ADMISSION_TOKEN=token).status_code == 400
+    # Panier refusé : le jeton a été rendu et reste utilisable.
+    assert api_client.post(url, valid_payload(), format="json", HTTP_X_ADMISSION_TOKEN=token).status_code == 201
+    r = api_client.post(url, valid_payload(), format="json", HTTP_X_ADMISSION_TOKEN=token)
+    assert r.status_code == 403 and r.json()["reason"] == "used"
+
+
+def test_admission_token_is_claimed_atomically():
+    """Teste que deux requêtes simultanées avec le même jeton ne passent pas toutes les deux."""
+    token = waiting_room.join(42)["admission_token"]
+    assert waiting_room.claim_admission(token, 42) == 1
+    with pytest.raises(waiting_room.AdmissionError, match="used"):
+        waiting_room.claim_admission(token, 42)
+    waiting_room.release_admission(1)
+    assert waiting_room.claim_admission(token, 42) == 1
+
+
+def test_room_cannot_be_opened_on_a_local_cache(api_client, settings):
+    """Teste le refus d'ouvrir la salle quand le cache n'est pas partagé entre workers."""
+    settings.WAITING_ROOM = {**settings.WAITING_ROOM, "ENABLED": False, "ALLOW_LOCAL_CACHE": False}
+    api_client.force_authenticate(user=User.objects.create_user(username="ops", password="x", is_staff=True))
+    r = api_client.post(reverse("orders:waiting_room_admin"), {"enabled": True}, format="json")
+    assert r.status_code == 409 and "REDIS_URL" in r.json()["detail"]
+    assert not waiting_room.is_enabled()
+
+
+def test_staff_can_open_and_tune_the_room(api_client, settings):
+    """Teste le réglage à chaud de l'ouverture et du débit par le staff."""
+    settings.WAITING_ROOM = {**settings.WAITING_ROOM, "ENABLED": False}
+    api_client.force_authenticate(user=User.objects.create_user(username="fan", password="x"))
+    url = reverse("orders:waiting_room_admin")
+    assert api_client.get(url).status_code == 403
+
+    api_client.force_authenticate(user=User.objects.create_user(username="ops", password="x", is_staff=True))
+    r = api_client.post(url, {"enabled": True, "rate": 50}, format="json")
+    assert r.status_code == 200
+    assert r.json()["enabled"] is True and r.json()["rate"] == 50
+    assert waiting_room.is_enabled()
@@ -0,0 +1,61 @@
+"""
+Fichier : test_wallet.py (application 'orders')
+Description : Contient les tests du portefeuille de billets (QR codes en ligne)
+              et de l'archive ZIP des QR codes générée en flux.
+"""
+import io
+import zipfile
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from orders.models import Ticket
+
+pytestmark = pytest.mark.django_db
+User = get_user_model()
+
+def u(name): return reverse(f"orders:{name}")
+
+# Fonction utilitaire : crée et paie `n` réservations pour un même utilisateur.
+def buy_tickets(api_client, n=2):
+    user = User.objects.create_user(username="iris", email="i@e.com", password="x")
+    api_client.force_authenticate(user=user)
+    payload = {
+        "client": {"nom": "Doe", "prenom": "Iris", "email": "iris@example.com"},
+        "panier": [{"id": "offer_1", "titre": "Solo", "prix": "10.00", "qty": 1}],
+        "total": "10.00",
+        "places": 1,
+    }
+    for _ in range(n):
+        rid = api_client.post(u("reservation_create"), payload, format="json").json()["reservation_id"]
+        api_client.post(u("checkout"), {"reservation_id": rid}, format="json")
+    return user
+
+# Teste que le portefeuille retourne tous les QR codes en une seule réponse.
+def test_wallet_inlines_qr_codes(api_client):
+    buy_tickets(api_client, n=2)
+    r = api_client.get(u("wallet"))
+    assert r.status_code == 200
+    data = r.json()
+    assert data["count"] == 2
+    first = data["results"][0]
+    assert first["qr"].startswith("jo://ticket/")
+    assert first["qr_svg"].startswith("<svg")
+    assert first["summary"]["client"] == "Iris Doe"
+
+    light = api_client.get(u("wallet"), {"svg": "0"}).json()
+    assert light["results"][0]["qr_svg"] is None
+
+# Teste que le portefeuille exige une authentification.
+def test_wallet_requires_auth(api_client):
+    assert api_client.get(u("wallet")).status_code in (401, 403)
+
+# Teste l'archive ZIP générée en flux avec un PNG par billet.
+def test_wallet_bundle_zip_streams_all_tickets(api_client):
+    user = buy_tickets(api_client, n=3)
+    r = api_client.get(u("wallet_bundle_zip"))
+    assert r.status_code == 200 and r.streaming
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(r.streaming_content)))
+    names = sorted(archive.namelist())
+    ids = sorted(Ticket.objects.filter(user=user).values_list("id", flat=True))
+    assert names == sorted(f"ticket_{i}.png" for i in ids)
+    assert archive.read(names[0]).startswith(b"\x89PNG")
@@ -5,6 +5,7 @@ Description : Définit toutes les routes (endpoints) de l'API liées au processu
               consultation des billets.
 """
 app_name = "orders"
+from django.conf import settings
 from django.urls import path
 from .views import (
     ReservationCreateAPIView,
@@ -15,8 +16,25 @@ from .views import (
     TicketOpaqueDebugAPIView,
     MyTicketsView, 
     TicketOpaqueDebugAPIView, 
+    WalletAPIView,
+    WalletBundleAPIView,
+    TicketPdfAPIView,
+    WalletBundlePdfAPIView,
+    WaitingRoomJoinAPIView,
+    WaitingRoomStatusAPIView,
+    WaitingRoomAdminAPIView,
+    SupportLookupAPIView,
 )
 
+# En mode ASGI, les lectures les plus fréquentes sont servies par des vues asynchrones.
+if settings.ASYNC_API_VIEWS:
+    from . import async_views
+    verify_view = async_views.verify_ticket
+    my_tickets_view = async_views.my_tickets
+else:
+    verify_view = VerifyTicketAPIView.as_view()
+    my_tickets_view = MyTicketsView.as_view()
+
 # La liste de toutes les routes pour l'application 'orders'.
 urlpatterns = [
     # --- Processus de commande ---
@@ -24,9 +42,21 @@ urlpatterns = [
     path("reservations/<int:pk>", ReservationDetailAPIView.as_view(), name="reservation_detail"),
     path("checkout", CheckoutAPIView.as_view(), name="checkout"),
 
+    # --- Salle d'attente (ouverture des ventes) ---
+    path("waiting-room/join", WaitingRoomJoinAPIView.as_view(), name="waiting_room_join"),
+    path("waiting-room/status", WaitingRoomStatusAPIView.as_view(), name="waiting_room_status"),
+    path("waiting-room", WaitingRoomAdminAPIView.as_view(), name="waiting_room_admin"),
+
     # --- Gestion des Billets ---
     path("tickets/<int:pk>", TicketDetailAPIView.as_view(), name="ticket_detail"),
-    path("verify", VerifyTicketAPIView.as_view(), name="verify_ticket"),
+    path("verify", verify_view, name="verify_ticket"),
+    path("tickets/<int:pk>/pdf", TicketPdfAPIView.as_view(), name="ticket_pdf"),
     path("tickets/<int:pk>/opaque", TicketOpaqueDebugAPIView.as_view(), name="ticket_opaque_debug"),
-    path("my-tickets/", MyTicketsView.as_view(), name="my_tickets"),
+    path("my-tickets/", my_tickets_view, name="my_tickets"),
+    path("wallet", WalletAPIView.as_view(), name="wallet"),
+    path("wallet/bundle.zip", WalletBundleAPIView.as_view(), name="wallet_bundle_zip"),
+    path("wallet/bundle.pdf", WalletBundlePdfAPIView.as_view(), name="wallet_bundle_pdf"),
+
+    # --- Support ---
+    path("support/lookup", SupportLookupAPIView.as_view(), name="support_lookup"),
 ]
\ No newline at end of file
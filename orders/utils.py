@@ -3,41 +3,85 @@ Fichier : utils.py (application 'orders')
 Description : Contient les fonctions utilitaires pour l'application 'orders'.
               Ces fonctions gèrent des logiques comme la génération de QR codes.
 """
-from pathlib import Path
-from django.conf import settings
+import hashlib
+import io
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.signing import dumps 
-import qrcode
+from django.utils.encoding import filepath_to_uri
+
+from monitoring.metrics import QR_RENDER_DURATION
+
+
+def ticket_qr_payload(ticket) -> str:
+    """
+    Construit le contenu encodé dans le QR code d'un billet : un URI personnalisé
+    portant un token signé (`jo://ticket/<token>`), vérifiable sans la base.
+    """
+    # Contenu minimal pour la vérification, sans exposer de données sensibles.
+    payload = {"tid": ticket.id, "rid": ticket.reservation_id, "uid": ticket.user_id}
+
+    # Utilise le système de signature de Django pour créer un token sécurisé et infalsifiable.
+    return f"jo://ticket/{dumps(payload, salt='ticket')}"
+
+
+def render_qr_png(qr_payload: str) -> bytes:
+    """Rend un contenu de QR code en image PNG."""
+    # Import différé : qrcode (et Pillow) ne sont chargés que par les processus qui rendent des QR.
+    import qrcode
+
+    buffer = io.BytesIO()
+    with QR_RENDER_DURATION.labels("png").time():
+        qrcode.make(qr_payload).save(buffer)
+    return buffer.getvalue()
+
+
+def render_qr_svg(qr_payload: str) -> str:
+    """Rend un contenu de QR code en SVG (chemin vectoriel unique, sans en-tête XML)."""
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    with QR_RENDER_DURATION.labels("svg").time():
+        img = qrcode.make(qr_payload, image_factory=SvgPathImage)
+        return img.to_string(encoding="unicode")
 
 
 def generate_ticket_qr_image(ticket) -> str:
     """
     Génère un QR code pour un billet et le sauvegarde en tant qu'image.
 
+    L'image est écrite via le stockage par défaut (disque local ou S3) sous un
+    nom adressé par contenu, ce qui permet de la servir avec un cache `immutable`.
+
     Args:
         ticket (Ticket): L'instance du modèle Ticket pour laquelle générer le QR code.
 
     Returns:
-        str: Le chemin relatif de l'image PNG générée (ex: "tickets/ticket_123.png").
+        str: Le chemin relatif de l'image PNG générée (ex: "tickets/ticket_123_3fa9c1d2e4b5.png").
     """
-    # Contenu minimal pour la vérification, sans exposer de données sensibles.
-    payload = {"tid": ticket.id, "rid": ticket.reservation_id, "uid": ticket.user_id}
-    
-    # Utilise le système de signature de Django pour créer un token sécurisé et infalsifiable.
-    signed_token = dumps(payload, salt="ticket")
+    # Génération de l'image PNG avec la bibliothèque qrcode.
+    png = render_qr_png(ticket_qr_payload(ticket))
 
-    # Contenu qui sera encodé dans le QR code (un URI personnalisé).
-    qr_payload = f"jo://ticket/{signed_token}"
+    # Le nom inclut une empreinte du contenu : un nom publié ne change jamais de contenu.
+    digest = hashlib.sha256(png).hexdigest()[:12]
+    name = default_storage.save(f"tickets/ticket_{ticket.id}_{digest}.png", ContentFile(png))
 
-     # S'assure que le dossier de destination existe.
-    out_dir = Path(settings.MEDIA_ROOT) / "tickets"
-    out_dir.mkdir(parents=True, exist_ok=True)
+    # Retourne le chemin relatif qui sera stocké en base de données.
+    return name
 
-    filename = f"ticket_{ticket.id}.png"
-    full_path = out_dir / filename
 
-    # Génération de l'image PNG avec la bibliothèque qrcode.
-    img = qrcode.make(qr_payload)
-    img.save(full_path)
+def media_url_prefix(request=None) -> str:
+    """
+    URL de base (absolue si une requête est fournie) des fichiers du stockage par défaut.
+    Calculée une fois par réponse puis jointe aux noms de fichiers, au lieu d'un
+    `build_absolute_uri` par ligne.
+    """
+    base = default_storage.url("")
+    return request.build_absolute_uri(base) if request is not None else base
 
-    # Retourne le chemin relatif qui sera stocké en base de données.
-    return f"tickets/{filename}"
+
+def join_media_url(prefix: str, name: str | None) -> str | None:
+    """Joint un nom de fichier stocké (ex: "tickets/ticket_1.png") à l'URL de base."""
+    if not name:
+        return None
+    return prefix.rstrip("/") + "/" + filepath_to_uri(name).lstrip("/")
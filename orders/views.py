@@ -13,10 +13,18 @@ import hashlib
 import secrets
 from django.shortcuts import get_object_or_404
 from .models import Reservation, Ticket
-from .utils import generate_ticket_qr_image
+from .utils import generate_ticket_qr_image, join_media_url, media_url_prefix
+from .wallet import iter_qr_zip, wallet_entry
+from .pdf import iter_tickets_pdf
+from django.http import StreamingHttpResponse
+from monitoring.timing import span
+from monitoring.metrics import record_verify_outcome, record_waiting_room_event
 from django.conf import settings
 from django.core.signing import loads, dumps, BadSignature
 from rest_framework import permissions, status
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from . import waiting_room
+from .lookup import search_reservations
 
 # --- Vues du processus de commande ---
 
@@ -26,12 +34,117 @@ class ReservationCreateAPIView(APIView):
 
     def post(self, request):
         """Gère la requête POST pour créer une réservation."""
+        admitted = None
+        if waiting_room.is_enabled():
+            # Pendant une ouverture des ventes : jeton d'admission de la salle d'attente obligatoire.
+            try:
+                admitted = waiting_room.claim_admission(request.headers.get("X-Admission-Token", ""), request.user.id)
+            except waiting_room.AdmissionError as e:
+                record_waiting_room_event("rejected")
+                return Response(
+                    {"detail": "Admission requise : passez par la salle d'attente.", "reason": str(e)},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
         serializer = ReservationCreateSerializer(data=request.data, context={"request": request})
-        serializer.is_valid(raise_exception=True)
-        reservation = serializer.save()
+        try:
+            serializer.is_valid(raise_exception=True)
+            reservation = serializer.save()
+        except Exception:
+            # Réservation non créée : le jeton reste utilisable pour une nouvelle tentative.
+            if admitted is not None:
+                waiting_room.release_admission(admitted)
+            raise
         return Response({"reservation_id": reservation.id}, status=status.HTTP_201_CREATED)
 
 
+class SupportLookupAPIView(APIView):
+    """
+    Recherche de réservations pour le support (staff) : e-mail, nom, prénom,
+    numéro ou début de clé de billet, par préfixe sur colonnes indexées.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if len(query) < 2:
+            return Response({"detail": "Saisissez au moins 2 caractères."}, status=status.HTTP_400_BAD_REQUEST)
+        results = []
+        for r in search_reservations(query):
+            ticket = getattr(r, "ticket", None)
+            results.append({
+                "id": r.id,
+                "client_nom": r.client_nom,
+                "client_prenom": r.client_prenom,
+                "client_email": r.client_email,
+                "places": r.places,
+                "total": str(r.total),
+                "created_at": r.created_at,
+                "ticket_key": ticket.ticket_key if ticket else None,
+            })
+        return Response({"count": len(results), "results": results})
+
+
+# --- Salle d'attente (ouverture des ventes) ---
+
+class WaitingRoomJoinAPIView(APIView):
+    """
+    Entrée dans la file : position et ticket de file signé.
+    Authentification JWT sans lecture de l'utilisateur en base.
+    """
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if not waiting_room.is_enabled():
+            return Response({"enabled": False, "admitted": True})
+        body = waiting_room.join(request.user.id)
+        record_waiting_room_event("joined")
+        if body["admitted"]:
+            record_waiting_room_event("admitted")
+        return Response({"enabled": True, **body})
+
+
+class WaitingRoomStatusAPIView(APIView):
+    """
+    Interrogée périodiquement par le client : lecture du cache uniquement,
+    le ticket de file signé tient lieu d'authentification.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        ticket = request.headers.get("X-Queue-Ticket") or request.query_params.get("ticket", "")
+        try:
+            user_id, position = waiting_room.read_ticket(ticket)
+        except BadSignature:
+            return Response({"detail": "Ticket de file invalide ou expiré."}, status=status.HTTP_400_BAD_REQUEST)
+        body = waiting_room.status_for(user_id, position)
+        if body["admitted"]:
+            record_waiting_room_event("admitted")
+        return Response(body)
+
+
+class WaitingRoomAdminAPIView(APIView):
+    """État de la salle d'attente ; ouverture et débit d'admission réglables à chaud (staff)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(waiting_room.stats())
+
+    def post(self, request):
+        rate = request.data.get("rate")
+        if rate is not None:
+            try:
+                rate = int(rate)
+            except (TypeError, ValueError):
+                return Response({"detail": "rate doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            waiting_room.update_config(enabled=request.data.get("enabled"), rate=rate)
+        except waiting_room.WaitingRoomUnavailable as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(waiting_room.stats())
+
+
 class ReservationDetailAPIView(generics.RetrieveAPIView):
     """Affiche les détails d'une réservation spécifique pour l'utilisateur connecté."""
     serializer_class = ReservationDetailSerializer
@@ -125,7 +238,7 @@ class TicketDetailAPIView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         """S'assure qu'un utilisateur ne peut voir que ses propres billets."""
-        return Ticket.objects.filter(user=self.request.user)
+        return Ticket.objects.filter(user=self.request.user).only("id", "reservation_id", "qr_image", "created_at")
     
 
 def _extract_signed_token(raw: str) -> str:
@@ -135,54 +248,74 @@ def _extract_signed_token(raw: str) -> str:
     return raw[len(prefix):] if raw.startswith(prefix) else raw
 
 
+def _decode_ticket_token(raw) -> tuple[dict | None, str | None]:
+    """
+    Décode et contrôle le token signé d'un billet, sans accès à la base.
+    Retourne `(payload, None)` si le token est exploitable, sinon `(None, raison)`.
+    Partagé entre la vue synchrone et la vue asynchrone (mode ASGI).
+    """
+    token = _extract_signed_token(raw or "")
+    if not token:
+        return None, "missing_token"
+
+    try:
+        data = loads(token, salt="ticket")  # {'tid': ..., 'rid': ..., 'uid': ...}
+    except BadSignature:
+        return None, "bad_signature"
+
+    if not all([data.get("tid"), data.get("rid"), data.get("uid")]):
+        return None, "malformed_payload"
+    return data, None
+
+
+# Colonnes lues par la vérification (billet + réservation jointe).
+VERIFY_FIELDS = (
+    "id", "user_id", "reservation_id", "created_at",
+    "reservation__client_prenom", "reservation__client_nom", "reservation__client_email",
+    "reservation__places", "reservation__total",
+)
+
+
+def _verify_ticket_body(ticket, data: dict) -> dict:
+    """Construit la réponse de vérification pour un billet chargé avec sa réservation."""
+    if ticket.user_id != data.get("uid") or ticket.reservation_id != data.get("rid"):
+        return {"valid": False, "reason": "mismatch"}
+
+    res = ticket.reservation
+    return {
+        "valid": True,
+        "meta": {
+            "ticket_id": ticket.id,
+            "reservation_id": ticket.reservation_id,
+            "user_id": ticket.user_id,
+            "client": f"{res.client_prenom} {res.client_nom}",
+            "email": res.client_email,
+            "places": res.places,
+            "total": str(res.total),
+            "created_at": ticket.created_at,
+        },
+    }
+
+
 class VerifyTicketAPIView(APIView):
     """Endpoint public pour l'application de scan afin de vérifier un billet."""
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
         """Valide un token de billet en vérifiant sa signature et sa cohérence en base."""
-        token = request.data.get("token") or request.data.get("qr")
-        token = _extract_signed_token(token or "")
-        if not token:
-            return Response({"valid": False, "reason": "missing_token"}, status=status.HTTP_400_BAD_REQUEST)
-
-        try:
-            data = loads(token, salt="ticket")  # {'tid': ..., 'rid': ..., 'uid': ...}
-        except BadSignature:
-            return Response({"valid": False, "reason": "bad_signature"}, status=status.HTTP_200_OK)
+        data, reason = _decode_ticket_token(request.data.get("token") or request.data.get("qr"))
+        if reason:
+            body = {"valid": False, "reason": reason}
+        else:
+            try:
+                ticket = Ticket.objects.select_related("reservation").only(*VERIFY_FIELDS).get(id=data["tid"])
+                body = _verify_ticket_body(ticket, data)
+            except Ticket.DoesNotExist:
+                body = {"valid": False, "reason": "ticket_not_found"}
 
-        tid = data.get("tid")
-        rid = data.get("rid")
-        uid = data.get("uid")
-        if not all([tid, rid, uid]):
-            return Response({"valid": False, "reason": "malformed_payload"}, status=status.HTTP_200_OK)
-
-        from .models import Ticket  
-        try:
-            ticket = Ticket.objects.select_related("reservation", "user").get(id=tid)
-        except Ticket.DoesNotExist:
-            return Response({"valid": False, "reason": "ticket_not_found"}, status=status.HTTP_200_OK)
-
-        if ticket.user_id != uid or ticket.reservation_id != rid:
-            return Response({"valid": False, "reason": "mismatch"}, status=status.HTTP_200_OK)
-
-        res = ticket.reservation
-        return Response(
-            {
-                "valid": True,
-                "meta": {
-                    "ticket_id": ticket.id,
-                    "reservation_id": ticket.reservation_id,
-                    "user_id": ticket.user_id,
-                    "client": f"{res.client_prenom} {res.client_nom}",
-                    "email": res.client_email,
-                    "places": res.places,
-                    "total": str(res.total),
-                    "created_at": ticket.created_at,
-                },
-            },
-            status=status.HTTP_200_OK,
-        )
+        record_verify_outcome(body)
+        code = status.HTTP_400_BAD_REQUEST if reason == "missing_token" else status.HTTP_200_OK
+        return Response(body, status=code)
 
 
 class TicketOpaqueDebugAPIView(APIView):
@@ -209,44 +342,105 @@ class MyTicketsView(APIView):
     """Liste tous les billets de l'utilisateur actuellement authentifié."""
     permission_classes = [permissions.IsAuthenticated]
 
-    def _build_absolute(self, request, url_or_path: str | None) -> str | None:
-        if not url_or_path:
-            return None
-        if isinstance(url_or_path, str) and (url_or_path.startswith("http://") or url_or_path.startswith("https://")):
-            return url_or_path
-        return request.build_absolute_uri(url_or_path)
-
-    def _extract_qr_url(self, request, ticket) -> str | None:
-        val = getattr(ticket, "qr_url", None)
-        if val:
-            return self._build_absolute(request, val if isinstance(val, str) else str(val))
-
-        for fname in ("qr_image", "qr_png", "qrcode", "qr"):
-            f = getattr(ticket, fname, None)
-            if f:
-                url = None
-                try:
-                    url = f.url  
-                except Exception:
-                    try:
-                        url = str(f)
-                    except Exception:
-                        url = None
-                if url:
-                    if isinstance(url, str) and url.startswith("/"):
-                        return self._build_absolute(request, url)
-                    media_url = getattr(settings, "MEDIA_URL", "") or ""
-                    return self._build_absolute(request, media_url.rstrip("/") + "/" + str(url).lstrip("/"))
-        return None
+    # Colonnes réellement utilisées : aucune instance de modèle n'est construite.
+    FIELDS = ("id", "qr_image", "created_at")
+
+    @staticmethod
+    def _results(request, rows) -> list[dict]:
+        """Construit les entrées de la liste à partir de tuples (id, qr_image, created_at)."""
+        prefix = media_url_prefix(request)
+        return [
+            {"id": pk, "qr_url": join_media_url(prefix, qr_name), "created": created}
+            for pk, qr_name, created in rows
+        ]
 
     def get(self, request):
         """Retourne une liste simplifiée des billets de l'utilisateur."""
-        qs = Ticket.objects.filter(user=request.user).order_by("-id")
-        results = []
-        for t in qs:
-            results.append({
-                "id": t.pk,
-                "qr_url": self._extract_qr_url(request, t),
-                "created": getattr(t, "created_at", None) or getattr(t, "created", None),
-            })
-        return Response({"count": len(results), "results": results})
\ No newline at end of file
+        rows = list(Ticket.objects.filter(user=request.user).order_by("-id").values_list(*self.FIELDS))
+        with span("ser"):
+            results = self._results(request, rows)
+        return Response({"count": len(results), "results": results})
+
+
+class WalletAPIView(APIView):
+    """
+    Portefeuille de l'utilisateur : tous ses billets avec le QR code en ligne
+    (URI signé et SVG), pour afficher l'écran des billets en une seule requête.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """Retourne les billets de l'utilisateur ; `?svg=0` omet le rendu SVG."""
+        with_svg = request.query_params.get("svg", "1") not in ("0", "false", "no")
+        qs = Ticket.objects.filter(user=request.user).select_related("reservation").order_by("-id")
+        prefix = media_url_prefix(request)
+        tickets = list(qs)
+        with span("ser"):
+            results = [wallet_entry(t, join_media_url(prefix, t.qr_image.name), with_svg) for t in tickets]
+        return Response({"count": len(results), "results": results})
+
+
+class WalletBundleAPIView(APIView):
+    """Télécharge tous les QR codes de l'utilisateur dans une archive ZIP générée en flux."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        tickets = iter_by_pk(Ticket.objects.filter(user=request.user), newest_first=True)
+        response = StreamingHttpResponse(iter_qr_zip(tickets), content_type="application/zip")
+        response["Content-Disposition"] = 'attachment; filename="billets.zip"'
+        return response
+
+
+def iter_by_pk(queryset, batch_size: int = 200, newest_first: bool = False):
+    """
+    Instances du queryset par lots de `batch_size`, par clé primaire (keyset :
+    `pk > dernier ORDER BY pk LIMIT n`). Contrairement à `iterator()`, que le
+    pilote MySQL met entièrement en mémoire côté client, chaque lot est une
+    requête courte : la mémoire reste bornée. Les `prefetch_related` sont
+    appliqués lot par lot.
+    """
+    order, after = ("-pk", "pk__lt") if newest_first else ("pk", "pk__gt")
+    queryset = queryset.order_by(order)
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(**{after: last_pk})
+        batch = list(page[:batch_size])
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        last_pk = batch[-1].pk
+
+
+def tickets_pdf_response(queryset, filename: str, newest_first: bool = False) -> StreamingHttpResponse:
+    """
+    Réponse PDF en flux pour un ensemble de billets. Les billets, leurs
+    réservations et leurs lignes sont chargés par lots (`iter_by_pk` +
+    `prefetch_related`) : la mémoire reste bornée quel que soit le nombre de
+    billets, y compris sur MySQL.
+    """
+    tickets = iter_by_pk(
+        queryset.select_related("reservation").prefetch_related("reservation__items"),
+        newest_first=newest_first,
+    )
+    response = StreamingHttpResponse(iter_tickets_pdf(tickets), content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+class TicketPdfAPIView(APIView):
+    """Télécharge l'e-billet PDF d'un billet de l'utilisateur connecté."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk: int):
+        qs = Ticket.objects.filter(id=pk, user=request.user)
+        if not qs.exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return tickets_pdf_response(qs, f"billet_{pk}.pdf")
+
+
+class WalletBundlePdfAPIView(APIView):
+    """Télécharge tous les e-billets de l'utilisateur dans un PDF multi-pages généré en flux."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return tickets_pdf_response(Ticket.objects.filter(user=request.user), "billets.pdf", newest_first=True)
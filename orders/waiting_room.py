@@ -0,0 +1,170 @@
+"""
+Fichier : waiting_room.py (application 'orders')
+Description : Salle d'attente virtuelle devant la création des réservations.
+
+              Pendant une ouverture des ventes, chaque client obtient un ticket
+              de file signé portant sa position. Une « frontière » d'admission
+              avance de `ADMIT_PER_SECOND` positions par seconde (à régler sur
+              la capacité mesurée par `bench_onsale`, étape "reserve") ; les
+              clients dont la position est passée reçoivent un jeton
+              d'admission signé, exigé par `POST /api/reservations`.
+
+              Tout l'état est dans le cache Django, qui doit être partagé entre
+              workers et machines (REDIS_URL) : compteurs atomiques, sans
+              aucune requête SQL. Les jetons sont vérifiés par signature, puis
+              réservés atomiquement (`cache.add`) pour un seul usage.
+"""
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache, caches
+
+PREFIX = "wr:"
+TICKET_SALT = "waiting-room"
+ADMISSION_SALT = "waiting-room-admission"
+
+
+# Caches partagés entre processus, avec `incr` et `add` atomiques.
+SHARED_CACHE_BACKENDS = ("RedisCache", "PyMemcacheCache", "PyLibMCCache")
+
+
+class AdmissionError(Exception):
+    """Jeton d'admission absent, invalide, expiré ou déjà utilisé."""
+
+
+class WaitingRoomUnavailable(Exception):
+    """La salle d'attente ne peut pas être ouverte avec le cache configuré."""
+
+
+def _cfg() -> dict:
+    return settings.WAITING_ROOM
+
+
+def config() -> dict:
+    """Réglages effectifs : ceux de settings, surchargés à chaud par le staff (cache)."""
+    return {
+        "enabled": cache.get(PREFIX + "enabled", _cfg()["ENABLED"]),
+        "rate": cache.get(PREFIX + "rate", _cfg()["ADMIT_PER_SECOND"]),
+    }
+
+
+def shared_cache() -> bool:
+    """Vrai si le cache par défaut est commun à tous les workers (ou si un cache local est explicitement admis)."""
+    return _cfg().get("ALLOW_LOCAL_CACHE", False) or type(caches["default"]).__name__ in SHARED_CACHE_BACKENDS
+
+
+def update_config(enabled: bool | None = None, rate: int | None = None) -> dict:
+    """
+    Réglage à chaud. Refuse d'ouvrir la salle sur un cache local : chaque
+    worker aurait sa propre file, sa propre frontière et son propre réglage.
+    """
+    if enabled and not shared_cache():
+        raise WaitingRoomUnavailable("Cache non partagé entre workers : définir REDIS_URL.")
+    if enabled is not None:
+        cache.set(PREFIX + "enabled", bool(enabled), None)
+    if rate is not None:
+        cache.set(PREFIX + "rate", max(1, int(rate)), None)
+    return config()
+
+
+def is_enabled() -> bool:
+    return bool(config()["enabled"])
+
+
+def _counter(name: str, initial: int = 0) -> int:
+    key = PREFIX + name
+    cache.add(key, initial, None)
+    return cache.get(key, initial)
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+def frontier() -> int:
+    """
+    Dernière position admise. Au plus un processus la fait avancer par seconde
+    (verrou `add` par seconde) ; les secondes sans appel sont rattrapées.
+    La frontière ne dépasse jamais de plus de `rate` le nombre d'entrées en
+    file : une salle ouverte longtemps avant la vente n'accumule pas
+    d'admissions d'avance.
+    """
+    rate = int(config()["rate"])
+    current = _counter("frontier", rate)
+    now = _now()
+    if cache.add(f"{PREFIX}tick:{now}", 1, 5):
+        last = cache.get(PREFIX + "last_tick") or now
+        cache.set(PREFIX + "last_tick", now, None)
+        steps = min(max(now - last, 0), _cfg()["MAX_CATCH_UP_S"])
+        room = _counter("seq") + rate - current
+        if steps and room > 0:
+            current = cache.incr(PREFIX + "frontier", min(rate * steps, room))
+    return current
+
+
+def join(user_id: int) -> dict:
+    """Attribue (une seule fois par utilisateur) une position et un ticket de file signé."""
+    _counter("seq")
+    position = cache.get(f"{PREFIX}user:{user_id}")
+    if position is None:
+        position = cache.incr(PREFIX + "seq")
+        if not cache.add(f"{PREFIX}user:{user_id}", position, _cfg()["TICKET_MAX_AGE"]):
+            # Deux appels simultanés du même utilisateur : la première position gagne.
+            position = cache.get(f"{PREFIX}user:{user_id}", position)
+    ticket = signing.dumps({"u": user_id, "p": position}, salt=TICKET_SALT, compress=True)
+    return {"queue_ticket": ticket, **status_for(user_id, position)}
+
+
+def read_ticket(ticket: str) -> tuple[int, int]:
+    """(utilisateur, position) d'un ticket de file ; BadSignature si invalide ou expiré."""
+    data = signing.loads(ticket, salt=TICKET_SALT, max_age=_cfg()["TICKET_MAX_AGE"])
+    return int(data["u"]), int(data["p"])
+
+
+def status_for(user_id: int, position: int) -> dict:
+    """Position, attente estimée et, si la frontière est passée, jeton d'admission."""
+    front = frontier()
+    rate = max(1, int(config()["rate"]))
+    ahead = max(0, position - front)
+    body = {
+        "position": position,
+        "ahead": ahead,
+        "estimated_wait_s": round(ahead / rate, 1),
+        "admitted": ahead == 0,
+        "poll_after_s": _cfg()["POLL_INTERVAL_S"],
+    }
+    if ahead == 0:
+        body["admission_token"] = signing.dumps({"u": user_id, "p": position}, salt=ADMISSION_SALT)
+    return body
+
+
+def claim_admission(token: str, user_id: int) -> int:
+    """
+    Vérifie un jeton d'admission pour cet utilisateur, sans requête SQL, et le
+    réserve atomiquement : deux requêtes simultanées avec le même jeton ne
+    peuvent pas passer toutes les deux. Retourne la position admise ; lève
+    AdmissionError sinon.
+    """
+    if not token:
+        raise AdmissionError("missing")
+    try:
+        data = signing.loads(token, salt=ADMISSION_SALT, max_age=_cfg()["ADMISSION_TTL"])
+    except signing.SignatureExpired:
+        raise AdmissionError("expired")
+    except signing.BadSignature:
+        raise AdmissionError("invalid")
+    if int(data["u"]) != int(user_id):
+        raise AdmissionError("invalid")
+    if not cache.add(f"{PREFIX}used:{data['p']}", 1, _cfg()["ADMISSION_TTL"]):
+        raise AdmissionError("used")
+    return int(data["p"])
+
+
+def release_admission(position: int):
+    """Rend le jeton réutilisable quand la réservation n'a pas été créée (panier invalide...)."""
+    cache.delete(f"{PREFIX}used:{position}")
+
+
+def stats() -> dict:
+    return {**config(), "joined": _counter("seq"), "frontier": frontier()}
@@ -0,0 +1,86 @@
+"""
+Fichier : wallet.py (application 'orders')
+Description : Construction du "portefeuille" de billets d'un utilisateur :
+              une entrée par billet avec le contenu du QR code en ligne, et
+              l'archive ZIP de tous les QR codes générée en flux (chaque
+              fichier est envoyé dès qu'il est compressé, sans construire
+              l'archive complète en mémoire).
+"""
+import zipfile
+
+from django.core.files.storage import default_storage
+
+from .utils import render_qr_png, render_qr_svg, ticket_qr_payload
+
+
+def wallet_entry(ticket, qr_url: str | None, with_svg: bool = True) -> dict:
+    """
+    Entrée de portefeuille pour un billet chargé avec sa réservation.
+    `qr` contient l'URI signé (le client peut dessiner le code lui-même),
+    `qr_svg` le rendu vectoriel prêt à afficher.
+    """
+    res = ticket.reservation
+    qr = ticket_qr_payload(ticket)
+    return {
+        "id": ticket.id,
+        "reservation_id": ticket.reservation_id,
+        "created": ticket.created_at,
+        "qr": qr,
+        "qr_svg": render_qr_svg(qr) if with_svg else None,
+        "qr_url": qr_url,
+        "summary": {
+            "client": f"{res.client_prenom} {res.client_nom}",
+            "email": res.client_email,
+            "total": str(res.total),
+            "places": res.places,
+        },
+    }
+
+
+def _ticket_png(ticket) -> bytes:
+    """PNG du billet : fichier déjà stocké si disponible, sinon rendu à la volée."""
+    if ticket.qr_image:
+        try:
+            with default_storage.open(ticket.qr_image.name, "rb") as f:
+                return f.read()
+        except (FileNotFoundError, OSError):
+            pass
+    return render_qr_png(ticket_qr_payload(ticket))
+
+
+class _ChunkBuffer:
+    """Flux en écriture seule (non positionnable) dont on vide le contenu au fil de l'eau."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_qr_zip(tickets):
+    """
+    Génère l'archive ZIP des QR codes morceau par morceau.
+    `zipfile` accepte un flux non positionnable : les tailles sont alors écrites
+    dans un descripteur après chaque fichier, ce qui permet l'envoi immédiat.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for ticket in tickets:
+            # Les PNG sont déjà compressés : ZIP_STORED évite un travail inutile.
+            archive.writestr(f"ticket_{ticket.id}.png", _ticket_png(ticket))
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    tail = buffer.drain()
+    if tail:
+        yield tail
@@ -0,0 +1,115 @@
+"""
+Fichier : compare_serving_modes.py
+Description : Comparaison de charge entre les deux modes de service
+              (SERVER_MODE=wsgi et SERVER_MODE=asgi) sur les routes de lecture.
+              Le script n'importe ni Django ni l'application (seulement
+              `benchmarks.stats`) : il envoie les mêmes requêtes, avec la même
+              concurrence, à deux instances déjà démarrées et affiche
+              latences et débit côte à côte.
+
+Exemple :
+    SERVER_MODE=wsgi gunicorn -c gunicorn.conf.py -b 127.0.0.1:8001 &
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py -b 127.0.0.1:8002 &
+    python scripts/compare_serving_modes.py \\
+        --mode wsgi=http://127.0.0.1:8001 --mode asgi=http://127.0.0.1:8002 \\
+        --verify-token "jo://ticket/..." --bearer "<access JWT>" \\
+        --requests 2000 --concurrency 64
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Lancé comme script depuis scripts/ : la racine du dépôt donne accès à `benchmarks`.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stats import summarize  # noqa: E402
+
+
+def _request(base: str, scenario: dict, timeout: float) -> tuple[float, bool]:
+    """Exécute une requête et retourne (latence en s, succès)."""
+    body = json.dumps(scenario["json"]).encode("utf-8") if scenario.get("json") else None
+    req = urllib.request.Request(base.rstrip("/") + scenario["path"], data=body, method=scenario["method"])
+    req.add_header("Content-Type", "application/json")
+    for name, value in scenario.get("headers", {}).items():
+        req.add_header(name, value)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            ok = resp.status < 500
+    except urllib.error.HTTPError as e:
+        ok = e.code < 500
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_scenario(base: str, scenario: dict, requests: int, concurrency: int, timeout: float) -> dict:
+    """Lance `requests` requêtes avec `concurrency` clients simultanés."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: _request(base, scenario, timeout), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize([lat * 1000 for lat, _ in results])
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, ok in results if not ok),
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        **{key: round(value, 2) for key, value in summary.items() if key.endswith("_ms")},
+    }
+
+
+def build_scenarios(args) -> dict[str, dict]:
+    scenarios = {"offers": {"method": "GET", "path": "/api/offers/"}}
+    if args.verify_token:
+        scenarios["verify"] = {"method": "POST", "path": "/api/verify", "json": {"qr": args.verify_token}}
+    if args.bearer:
+        scenarios["my-tickets"] = {
+            "method": "GET",
+            "path": "/api/my-tickets/",
+            "headers": {"Authorization": f"Bearer {args.bearer}"},
+        }
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les modes de service WSGI et ASGI.")
+    parser.add_argument("--mode", action="append", required=True,
+                        help="nom=URL de base, ex: wsgi=http://127.0.0.1:8001 (répétable)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--verify-token", default="", help="QR/token signé d'un billet existant")
+    parser.add_argument("--bearer", default="", help="access token JWT pour /api/my-tickets/")
+    parser.add_argument("--json", dest="json_out", default="", help="fichier de sortie JSON")
+    args = parser.parse_args()
+
+    modes = dict(item.split("=", 1) for item in args.mode)
+    scenarios = build_scenarios(args)
+    report: dict[str, dict] = {}
+
+    header = f"{'scénario':<12} {'mode':<6} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'erreurs':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, scenario in scenarios.items():
+        for mode, base in modes.items():
+            # Tour de chauffe pour ne pas mesurer l'initialisation des workers.
+            run_scenario(base, scenario, min(50, args.requests), args.concurrency, args.timeout)
+            stats = run_scenario(base, scenario, args.requests, args.concurrency, args.timeout)
+            report.setdefault(name, {})[mode] = stats
+            print(f"{name:<12} {mode:<6} {stats['rps']:>9} {stats['p50_ms']:>8} "
+                  f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['errors']:>8}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"concurrency": args.concurrency, "results": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,30 @@
 #!/bin/sh
 set -e
 
+# Horodatage du lancement (ms) : les durées de chaque phase sont journalisées,
+# gunicorn.conf.py (when_ready) ajoute la durée totale jusqu'à l'écoute.
+now_ms() { echo $(( $(date +%s%N) / 1000000 )); }
+STARTUP_T0=$(now_ms)
+export STARTUP_T0
+phase_done() { echo "⏱ boot phase=$1 ms=$(( $(now_ms) - $2 ))"; }
+
+# --- Mode de démarrage ---
+#  fast   : image de production (Fly). Statiques collectés au build, migrations
+#           appliquées par la release_command ; gunicorn vérifie le schéma.
+#  legacy : développement (docker-compose). Attente de la base, migrate et
+#           collectstatic à chaque démarrage.
+STARTUP_MODE=${STARTUP_MODE:-legacy}
+export STARTUP_MODE
+
+if [ "$STARTUP_MODE" = "fast" ]; then
+  echo "🦄 Starting Gunicorn (fast startup)..."
+  exec gunicorn -c gunicorn.conf.py
+fi
+
 # --- Wait for DB if host/port provided ---
 if [ -n "$DB_HOST" ] && [ -n "$DB_PORT" ]; then
   echo "⏳ Waiting for database at $DB_HOST:$DB_PORT..."
+  t=$(now_ms)
   ok=0
   for i in $(seq 1 120); do
     if nc -z "$DB_HOST" "$DB_PORT" >/dev/null 2>&1; then
@@ -17,13 +38,18 @@ if [ -n "$DB_HOST" ] && [ -n "$DB_PORT" ]; then
     echo "❌ Database not reachable after 120s. Exiting."
     exit 1
   fi
+  phase_done db_wait "$t"
 fi
 
 echo "🚀 Running migrations..."
+t=$(now_ms)
 python manage.py migrate --noinput
+phase_done migrate "$t"
 
 echo "🧱 Collecting static files..."
+t=$(now_ms)
 python manage.py collectstatic --noinput
+phase_done collectstatic "$t"
 
 echo "🦄 Starting Gunicorn..."
 exec gunicorn -c gunicorn.conf.py
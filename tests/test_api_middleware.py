@@ -0,0 +1,82 @@
+"""
+Fichier : test_api_middleware.py
+Description : Teste la pile de middlewares sensible au chemin : sessions, CSRF,
+              messages et X-Frame-Options ignorés sur l'API, conservés pour
+              l'administration ; pile entièrement asynchrone en ASGI.
+"""
+import pytest
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.test import AsyncClient, Client
+from django.utils.module_loading import import_string
+
+from jo_backend.pools import VERIFY_MIDDLEWARE
+
+
+@pytest.mark.django_db
+def test_api_requests_skip_session_csrf_and_messages():
+    """Teste qu'une requête d'API ne charge ni session, ni utilisateur de session, ni messages."""
+    r = Client().get("/api/health")
+    assert r.status_code == 200
+    assert not hasattr(r.wsgi_request, "session")
+    assert not hasattr(r.wsgi_request, "_messages")
+    assert "X-Frame-Options" not in r
+
+
+@pytest.mark.django_db
+def test_api_post_is_not_subject_to_django_csrf():
+    """Teste qu'un POST d'API sans jeton CSRF n'est pas rejeté par CsrfViewMiddleware."""
+    c = Client(enforce_csrf_checks=True)
+    r = c.post("/api/verify", {"token": "x"}, content_type="application/json")
+    assert r.status_code == 200
+
+
+@pytest.mark.django_db
+def test_admin_keeps_full_stack():
+    """Teste que l'admin conserve sessions, CSRF et X-Frame-Options."""
+    c = Client(enforce_csrf_checks=True)
+    r = c.get("/admin/login/")
+    assert r.status_code == 200
+    assert hasattr(r.wsgi_request, "session")
+    assert r["X-Frame-Options"] == "DENY"
+    assert c.post("/admin/login/", {"username": "x", "password": "y"}).status_code == 403
+    call_command("check")
+
+
+def test_asgi_middleware_chain_is_not_serialized(settings):
+    """Teste qu'en ASGI aucun middleware ne fait passer la requête par le thread unique de sync_to_async."""
+    for path in [*settings.MIDDLEWARE, *VERIFY_MIDDLEWARE]:
+        assert getattr(import_string(path), "async_capable", False), path
+    assert not isinstance(ASGIHandler()._middleware_chain, SyncToAsync)
+
+
+@pytest.mark.django_db
+def test_asgi_stack_measures_and_sheds(settings):
+    """Teste la pile asynchrone : requêtes SQL comptées (exécutées hors de la boucle) et délestage."""
+    settings.SERVER_TIMING = {**settings.SERVER_TIMING, "HEADER_SAMPLE_RATE": 1.0}
+
+    async def get(path, **extra):
+        return await AsyncClient().get(path, **extra)
+
+    r = async_to_sync(get)("/api/offers/")
+    assert r.status_code == 200
+    assert 'desc="1 queries"' in r["Server-Timing"]
+    assert async_to_sync(get)("/api/offers/", headers={"X-Request-Start": "t=1"}).status_code == 503
+    assert async_to_sync(get)("/static/absent.css").status_code == 404
+
+
+def test_deploy_check_accepts_the_api_skip_middlewares():
+    """
+    Teste que `check --deploy` ne signale pas l'absence de CsrfViewMiddleware
+    ni de XFrameOptionsMiddleware : les sous-classes ApiSkip* en tiennent lieu.
+    """
+    import io
+
+    from django.conf import settings
+
+    assert {"security.W002", "security.W003"} <= set(settings.SILENCED_SYSTEM_CHECKS)
+    out, err = io.StringIO(), io.StringIO()
+    call_command("check", deploy=True, stdout=out, stderr=err)
+    assert "security.W002" not in out.getvalue() + err.getvalue()
+    assert "security.W003" not in out.getvalue() + err.getvalue()
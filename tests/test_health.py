@@ -17,3 +17,59 @@ def test_health_check_ok():
     r2 = c.get("/api/health/")
     assert r1.status_code == 200 and r2.status_code == 200
     assert r1.json().get("status") == "ok"
+
+
+@pytest.mark.django_db
+def test_readiness_reports_dependency_timings(settings):
+    """
+    Teste la sonde de disponibilité : chaque dépendance est contrôlée et
+    chronométrée, et le résultat est mis en cache pendant HEALTH_CACHE_TTL.
+    """
+    from monitoring import health
+    health.reset()
+    settings.HEALTH_CACHE_TTL = 60
+    c = Client()
+    assert c.get("/api/health/live").status_code == 200
+
+    r = c.get("/api/health/ready")
+    data = r.json()
+    assert r.status_code == 200 and data["status"] == "ok"
+    assert set(data["checks"]) == {"database", "media", "cache", "signing"}
+    assert all(check["ok"] and check["ms"] >= 0 for check in data["checks"].values())
+    assert data["cached"] is False
+    assert c.get("/api/health/ready").json()["cached"] is True
+    health.reset()
+
+
+@pytest.mark.django_db
+def test_readiness_fails_when_a_dependency_is_down(monkeypatch, settings, caplog):
+    """
+    Teste qu'une dépendance en échec rend la sonde indisponible (HTTP 503),
+    que le message d'erreur est journalisé et n'est renvoyé qu'au staff ou
+    en DEBUG.
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import AccessToken
+    from monitoring import health
+
+    def broken():
+        raise ConnectionError("base injoignable")
+
+    monkeypatch.setitem(health.CHECKS, "database", broken)
+    settings.DEBUG = False
+    health.reset()
+    r = Client().get("/api/health/ready")
+    assert r.status_code == 503
+    assert r.json()["checks"]["database"] == {"ok": False, "ms": r.json()["checks"]["database"]["ms"]}
+    assert "base injoignable" not in r.content.decode()
+    assert "base injoignable" in caplog.text
+
+    staff = get_user_model().objects.create_user(username="ops", password="x", is_staff=True)
+    token = AccessToken.for_user(staff)
+    r = Client().get("/api/health/ready", HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert r.json()["checks"]["database"]["error"] == "ConnectionError: base injoignable"
+
+    settings.DEBUG = True
+    r = Client().get("/api/health/ready")
+    assert r.json()["checks"]["database"]["error"] == "ConnectionError: base injoignable"
+    health.reset()
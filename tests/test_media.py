@@ -0,0 +1,87 @@
+"""
+Fichier : test_media.py
+Description : Contient les tests de la diffusion des fichiers media
+              (en-têtes de cache, délégation X-Accel-Redirect / X-Sendfile,
+              protection contre la traversée de répertoires) et de l'écriture
+              des QR codes via un stockage de substitution (en mémoire).
+"""
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import Client, RequestFactory
+from django.http import Http404
+from django.urls import reverse
+from jo_backend.media import serve_media
+from orders.models import Reservation, Ticket
+from orders.utils import generate_ticket_qr_image
+
+
+@pytest.fixture
+def qr_file(settings):
+    path = Path(settings.MEDIA_ROOT) / "tickets" / "ticket_1_3fa9c1d2e4b5.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    return "tickets/ticket_1_3fa9c1d2e4b5.png"
+
+
+# Teste qu'un nom adressé par contenu est servi avec un cache long et immutable.
+def test_content_addressed_media_is_immutable(qr_file):
+    r = Client().get(f"/media/{qr_file}")
+    assert r.status_code == 200
+    assert "immutable" in r["Cache-Control"] and "max-age=31536000" in r["Cache-Control"]
+
+
+# Teste qu'un nom non adressé par contenu reçoit un cache court.
+def test_plain_media_gets_short_cache(settings):
+    path = Path(settings.MEDIA_ROOT) / "offres" / "solo.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"img")
+    r = Client().get("/media/offres/solo.png")
+    assert r.status_code == 200
+    assert "immutable" not in r["Cache-Control"] and "max-age=3600" in r["Cache-Control"]
+
+
+# Teste la délégation de l'envoi au serveur frontal (aucun contenu envoyé par Django).
+def test_x_accel_and_sendfile_offload(settings, qr_file):
+    settings.MEDIA_DELIVERY = "x-accel"
+    r = serve_media(RequestFactory().get(f"/media/{qr_file}"), qr_file)
+    assert r["X-Accel-Redirect"] == f"/protected-media/{qr_file}"
+    assert r["Content-Type"] == "image/png" and r.content == b""
+
+    settings.MEDIA_DELIVERY = "sendfile"
+    r = serve_media(RequestFactory().get(f"/media/{qr_file}"), qr_file)
+    assert r["X-Sendfile"].endswith(qr_file)
+
+
+# Teste le rejet des chemins sortant de MEDIA_ROOT.
+def test_media_rejects_path_traversal(settings):
+    settings.MEDIA_DELIVERY = "x-accel"
+    with pytest.raises(Http404):
+        serve_media(RequestFactory().get("/media/../settings.py"), "../settings.py")
+
+
+# Teste l'écriture des QR codes et leurs URLs avec un stockage objet simulé (InMemoryStorage via STORAGES).
+@pytest.mark.django_db
+def test_qr_codes_go_through_configured_storage(settings, api_client):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "django.core.files.storage.InMemoryStorage",
+            "OPTIONS": {"base_url": "https://cdn.example.com/media/"},
+        },
+    }
+    user = get_user_model().objects.create_user(username="ada", password="x")
+    res = Reservation.objects.create(user=user, client_nom="Doe", client_prenom="Ada", client_email="a@x.fr",
+                                     total=25, places=1)
+    ticket = Ticket.objects.create(user=user, reservation=res, ticket_key="k" * 64, qr_image="")
+
+    name = generate_ticket_qr_image(ticket)
+    assert default_storage.exists(name) and default_storage.open(name).read().startswith(b"\x89PNG")
+    assert not (Path(settings.MEDIA_ROOT) / name).exists()
+
+    Ticket.objects.filter(pk=ticket.pk).update(qr_image=name)
+    api_client.force_authenticate(user=user)
+    r = api_client.get(reverse("orders:my_tickets"))
+    assert r.json()["results"][0]["qr_url"] == f"https://cdn.example.com/media/{name}"
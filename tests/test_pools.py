@@ -0,0 +1,53 @@
+"""
+Fichier : test_pools.py
+Description : Teste les pools de workers par classe de trafic : configuration,
+              surcharges par variables d'environnement et routes servies par
+              l'URLconf de chaque pool.
+"""
+import pytest
+from django.test import Client
+from jo_backend.pools import POOLS, VERIFY_MIDDLEWARE, pool_config
+
+
+def test_pool_config_overrides(monkeypatch):
+    """Teste la sélection du pool et la surcharge de son dimensionnement."""
+    monkeypatch.setenv("JO_POOL", "verify")
+    monkeypatch.setenv("POOL_VERIFY_WORKERS", "6")
+    cfg = pool_config()
+    assert cfg["name"] == "verify" and cfg["workers"] == 6 and cfg["threads"] == POOLS["verify"]["threads"]
+    assert pool_config("web")["urlconf"] == "jo_backend.urls"
+    with pytest.raises(ValueError):
+        pool_config("inconnu")
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("jo_backend.urls_verify")
+def test_verify_pool_serves_only_verification(settings):
+    """Teste que le pool "verify" ne sert que la vérification, avec sa pile réduite."""
+    settings.MIDDLEWARE = VERIFY_MIDDLEWARE
+    c = Client()
+    r = c.post("/api/verify", {"token": "x"}, content_type="application/json")
+    assert r.status_code == 200 and r.json()["reason"] == "bad_signature"
+    assert r.wsgi_request.resolver_match.view_name == "orders:verify_ticket"
+    assert c.get("/api/health/ready").status_code == 200
+    assert c.get("/api/offers/").status_code == 404
+    assert c.get("/admin/").status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("jo_backend.urls_shop")
+def test_shop_pool_excludes_admin():
+    """Teste que le pool "shop" sert l'API publique mais pas l'administration."""
+    c = Client()
+    assert c.get("/api/offers/").status_code == 200
+    assert c.get("/admin/").status_code == 404
+    assert c.get("/api/monitoring/profiler").status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("jo_backend.urls_admin")
+def test_admin_pool_serves_back_office():
+    """Teste que le pool "admin" sert l'administration mais pas l'API publique."""
+    c = Client()
+    assert c.get("/admin/login/").status_code == 200
+    assert c.post("/api/verify", {}, content_type="application/json").status_code == 404
@@ -0,0 +1,36 @@
+"""
+Fichier : test_startup.py
+Description : Teste les étapes du démarrage rapide (STARTUP_MODE=fast) :
+              détection des migrations non appliquées et arrêt du démarrage.
+"""
+import pytest
+from jo_backend import startup
+
+
+@pytest.mark.django_db
+def test_no_pending_migrations_on_migrated_database():
+    """Teste qu'une base migrée ne signale aucune migration en attente."""
+    assert startup.pending_migrations() == []
+
+
+def test_fast_boot_stops_on_pending_migrations(monkeypatch, capsys):
+    """Teste qu'un schéma en retard arrête le démarrage, sauf en mode "warn"."""
+    monkeypatch.setattr(startup, "wait_for_database", lambda timeout: None)
+    monkeypatch.setattr(startup, "pending_migrations", lambda: ["orders.9999_future"])
+
+    with pytest.raises(SystemExit):
+        startup.fast_boot()
+    err = capsys.readouterr().err
+    assert "⏱ boot phase=migrations_check" in err and "orders.9999_future" in err
+
+    monkeypatch.setenv("STARTUP_PENDING_MIGRATIONS", "warn")
+    startup.fast_boot()
+
+
+def test_fast_boot_does_not_time_an_already_loaded_django(monkeypatch, capsys):
+    """Teste qu'avec l'application préchargée (preload_app), la phase django_setup n'est pas journalisée."""
+    monkeypatch.setattr(startup, "wait_for_database", lambda timeout: None)
+    monkeypatch.setattr(startup, "pending_migrations", lambda: [])
+    startup.fast_boot()
+    err = capsys.readouterr().err
+    assert "phase=django_setup" not in err and "phase=migrations_check" in err
@@ -0,0 +1,47 @@
+"""
+Fichier : test_warmup.py
+Description : Teste le préchauffage exécuté dans le master gunicorn (preload)
+              puis dans chaque worker : toutes les étapes réussissent sans
+              requête SQL (hormis l'index du catalogue) et leur durée est
+              journalisée.
+"""
+import pytest
+from jo_backend import warmup
+
+
+@pytest.mark.django_db
+def test_warm_up_runs_every_step_without_queries(django_assert_num_queries, capsys):
+    """Teste que chaque étape s'exécute sans erreur et sans accès à la base (hors catalogue)."""
+    names = [name for name in warmup.STEPS if name != "catalog"]
+    with django_assert_num_queries(0):
+        timings = warmup.warm_up(names, label="test")
+    assert set(timings) == set(names)
+    err = capsys.readouterr().err
+    assert "⏱ warmup test pid=" in err and "échec" not in err
+
+
+@pytest.mark.django_db
+def test_catalog_step_builds_the_search_index(django_assert_num_queries, capsys):
+    """Teste que l'étape catalog construit l'index : la recherche suivante ne touche plus la base."""
+    from offers import search
+    from offers.models import Offer
+
+    Offer.objects.create(name="Finale Athlétisme", price=100)
+    search.invalidate()
+    with django_assert_num_queries(1):
+        warmup.warm_up(["catalog"], label="test")
+    with django_assert_num_queries(0):
+        assert len(search.search("athletisme")) == 1
+    assert "échec" not in capsys.readouterr().err
+    search.invalidate()
+
+
+def test_warmup_steps_selection(monkeypatch, capsys):
+    """Teste la sélection des étapes (WARMUP_STEPS) et la tolérance aux échecs."""
+    monkeypatch.setenv("WARMUP_STEPS", "password_validators, broken")
+    monkeypatch.setitem(warmup.STEPS, "broken", lambda: 1 / 0)
+    assert warmup.selected_steps() == ["password_validators", "broken"]
+
+    timings = warmup.warm_up()
+    assert list(timings) == ["password_validators", "broken"]
+    assert "step=broken échec : ZeroDivisionError" in capsys.readouterr().err